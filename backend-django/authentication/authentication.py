@@ -2,7 +2,8 @@ from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 from django.contrib.auth import get_user_model
 import jwt
-from django.conf import settings
+from portfolio_backend.metrics import record_auth
+from .tokens import decode_token, remember_token_version, user_from_claims
 
 User = get_user_model()
 
@@ -20,15 +21,26 @@ class JWTAuthentication(BaseAuthentication):
         token = auth_header.split(' ')[1]
         
         try:
-            payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-            user = User.objects.get(id=payload['user_id'])
+            payload = decode_token(token)
+            user = user_from_claims(payload)
+            if user is None:
+                user = User.objects.get(id=payload['user_id'])
+                remember_token_version(user)
             return (user, token)
         except jwt.ExpiredSignatureError:
-            raise AuthenticationFailed('Token has expired')
+            self.fail(request, 'expired', 'Token has expired')
         except jwt.InvalidTokenError:
-            raise AuthenticationFailed('Invalid token')
+            self.fail(request, 'invalid', 'Invalid token')
         except User.DoesNotExist:
-            raise AuthenticationFailed('User not found')
+            self.fail(request, 'unknown_user', 'User not found')
+    
+    def fail(self, request, reason, message):
+        # A request may be authenticated more than once (e.g. by the response cache); count it once
+        django_request = getattr(request, '_request', request)
+        if not getattr(django_request, '_auth_failure_recorded', False):
+            django_request._auth_failure_recorded = True
+            record_auth('token', reason)
+        raise AuthenticationFailed(message)
     
     def authenticate_header(self, request):
         return 'Bearer'
\ No newline at end of file
@@ -0,0 +1,146 @@
+"""
+Asymmetric signing keys for JWTs (RS256, EdDSA).
+
+Private keys are PEM files in ``JWT_KEYS_DIR``, named ``<kid>.pem``
+(``python manage.py generate_jwt_key``). Every key in the directory
+verifies tokens and is published at ``/api/auth/jwks/``. New tokens are
+signed with ``JWT_SIGNING_KEY_ID``, or else the last key by name (generated
+ids start with a timestamp) of the ``JWT_ALGORITHM`` type. Rotating means
+adding a key: tokens signed with the previous one stay valid until they
+expire, and the old key can be removed after ``JWT_REFRESH_TOKEN_LIFETIME``.
+
+Loading an RSA private key takes tens of milliseconds, the time of
+hundreds of signature checks (``python manage.py benchmark_jwt``), so each
+process keeps the parsed keys and re-reads the directory only when it
+changes, checked at most every ``JWT_KEYS_RELOAD_INTERVAL`` seconds.
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+
+ASYMMETRIC_ALGORITHMS = ('RS256', 'EdDSA')
+
+
+def algorithm_for(private_key):
+    if isinstance(private_key, rsa.RSAPrivateKey):
+        return 'RS256'
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        return 'EdDSA'
+    raise ValueError(f'Unsupported key type {type(private_key).__name__}, expected RSA or Ed25519')
+
+
+def public_jwk(kid, algorithm, public_key):
+    jwk_class = RSAAlgorithm if algorithm == 'RS256' else OKPAlgorithm
+    jwk = json.loads(jwk_class.to_jwk(public_key))
+    jwk.pop('key_ops', None)  # Not to be combined with "use" (RFC 7517)
+    return {**jwk, 'kid': kid, 'alg': algorithm, 'use': 'sig'}
+
+
+class Key:
+    def __init__(self, kid, private_key):
+        self.kid = kid
+        self.algorithm = algorithm_for(private_key)
+        self.private_key = private_key
+        self.public_key = private_key.public_key()
+        self.jwk = public_jwk(kid, self.algorithm, self.public_key)
+
+
+class KeyRing:
+    """Parsed keys of ``JWT_KEYS_DIR``, shared by the threads of a process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = {}
+        self._version = None
+        self._checked = None
+
+    def _directory(self):
+        return Path(settings.JWT_KEYS_DIR)
+
+    def _refresh(self, force=False):
+        now = time.monotonic()
+        if not force and self._checked is not None and now - self._checked < settings.JWT_KEYS_RELOAD_INTERVAL:
+            return
+        with self._lock:
+            self._checked = now
+            directory = self._directory()
+            try:
+                # Adding, removing or renaming a key changes the directory's mtime
+                version = (str(directory), directory.stat().st_mtime_ns)
+            except FileNotFoundError:
+                version = (str(directory), None)
+            if version == self._version:
+                return
+            keys = {}
+            for path in sorted(directory.glob('*.pem')) if version[1] is not None else ():
+                if path.stem in self._keys:  # Key files are never rewritten in place
+                    keys[path.stem] = self._keys[path.stem]
+                    continue
+                private_key = serialization.load_pem_private_key(path.read_bytes(), password=None)
+                keys[path.stem] = Key(path.stem, private_key)
+            self._keys = keys
+            self._version = version
+
+    def get(self, kid):
+        """Verification key for ``kid``, re-reading the directory once for unknown ids (e.g. a key just added)"""
+        self._refresh()
+        key = self._keys.get(kid)
+        if key is None:
+            self._refresh(force=True)
+            key = self._keys.get(kid)
+        return key
+
+    def signing_key(self):
+        self._refresh()
+        kid = settings.JWT_SIGNING_KEY_ID
+        if kid:
+            key = self._keys.get(kid)
+            if key is None:
+                raise ImproperlyConfigured(f'JWT_SIGNING_KEY_ID {kid!r} is not in {self._directory()}')
+            return key
+        candidates = [key for kid, key in sorted(self._keys.items()) if key.algorithm == settings.JWT_ALGORITHM]
+        if not candidates:
+            raise ImproperlyConfigured(
+                f'No {settings.JWT_ALGORITHM} key in {self._directory()}; run `python manage.py generate_jwt_key`'
+            )
+        return candidates[-1]
+
+    def keys(self):
+        self._refresh()
+        return list(self._keys.values())
+
+    def jwks(self):
+        return [key.jwk for key in self.keys()]
+
+
+key_ring = KeyRing()
+
+
+def write_key(directory, kid, private_key):
+    """Store a private key as ``<kid>.pem``, readable by the owner only; returns the path"""
+    directory = Path(directory)
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    ignore = directory / '.gitignore'
+    if not ignore.exists():
+        ignore.write_text('*\n')
+    path = directory / f'{kid}.pem'
+    if path.exists():
+        raise FileExistsError(f'{path} already exists')
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    # Write then rename, so a reloading worker never reads half a key
+    temporary = directory / f'.{kid}.pem.tmp'
+    fd = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(pem)
+    os.replace(temporary, path)
+    return path
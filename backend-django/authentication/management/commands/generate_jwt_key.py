@@ -0,0 +1,83 @@
+import secrets
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from authentication.keys import ASYMMETRIC_ALGORITHMS, key_ring, write_key
+
+
+class Command(BaseCommand):
+    help = (
+        'Add a JWT signing key to JWT_KEYS_DIR (used for new tokens once JWT_ALGORITHM matches), '
+        'list the keys, or prune retired ones'
+    )
+
+    def add_arguments(self, parser):
+        default = settings.JWT_ALGORITHM if settings.JWT_ALGORITHM in ASYMMETRIC_ALGORITHMS else 'EdDSA'
+        parser.add_argument('--algorithm', choices=ASYMMETRIC_ALGORITHMS, default=default)
+        parser.add_argument('--bits', type=int, default=2048, help='RSA key size')
+        parser.add_argument('--kid', help='Key id (default: creation time plus a random suffix)')
+        parser.add_argument('--list', action='store_true', help='List keys instead of adding one')
+        parser.add_argument('--prune', action='store_true',
+                            help='Instead of adding a key, delete keys replaced more than JWT_REFRESH_TOKEN_LIFETIME '
+                                 'ago, which no unexpired token can still use')
+
+    def handle(self, *args, **options):
+        directory = Path(settings.JWT_KEYS_DIR)
+        if options['list']:
+            return self.list_keys(directory)
+        if options['prune']:
+            return self.prune(directory)
+
+        if options['algorithm'] == 'RS256':
+            if options['bits'] < 2048:
+                raise CommandError('RSA keys need at least 2048 bits')
+            private_key = rsa.generate_private_key(public_exponent=65537, key_size=options['bits'])
+        else:
+            private_key = ed25519.Ed25519PrivateKey.generate()
+        kid = options['kid'] or f'{datetime.now(timezone.utc):%Y%m%d%H%M%S}-{secrets.token_hex(3)}'
+        try:
+            path = write_key(directory, kid, private_key)
+        except (FileExistsError, OSError) as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(f'Created {options["algorithm"]} key {kid} ({path})'))
+        if settings.JWT_ALGORITHM != options['algorithm']:
+            self.stdout.write(f'  Set JWT_ALGORITHM={options["algorithm"]} to sign new tokens with it')
+        self.stdout.write(
+            f'  Workers pick it up within {settings.JWT_KEYS_RELOAD_INTERVAL}s; '
+            f'tokens signed with older keys stay valid while those keys remain in {directory}'
+        )
+
+    def list_keys(self, directory):
+        keys = key_ring.keys()
+        if not keys:
+            self.stdout.write(f'No keys in {directory}')
+            return
+        try:
+            signing = key_ring.signing_key().kid if settings.JWT_ALGORITHM in ASYMMETRIC_ALGORITHMS else None
+        except ImproperlyConfigured:
+            signing = None
+        for key in keys:
+            age_days = (time.time() - (directory / f'{key.kid}.pem').stat().st_mtime) / 86400
+            marker = ' (signing)' if key.kid == signing else ''
+            self.stdout.write(f'  {key.kid:<32} {key.algorithm:<6} {age_days:>6.1f} days{marker}')
+
+    def prune(self, directory):
+        if settings.JWT_ALGORITHM not in ASYMMETRIC_ALGORITHMS:
+            raise CommandError(f'JWT_ALGORITHM is {settings.JWT_ALGORITHM}; nothing signs with these keys')
+        signing = key_ring.signing_key().kid
+        cutoff = time.time() - settings.JWT_REFRESH_TOKEN_LIFETIME
+        paths = sorted(directory.glob('*.pem'), key=lambda path: path.stat().st_mtime)
+        removed = 0
+        # A key stopped signing when the next one was added; tokens it signed are gone a refresh lifetime later
+        for path, successor in zip(paths, paths[1:]):
+            if path.stem != signing and successor.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+                self.stdout.write(f'  removed {path.stem}')
+        self.stdout.write(self.style.SUCCESS(f'Pruned {removed} keys; signing with {signing}'))
@@ -1,6 +1,12 @@
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
+from django.core.cache import cache
 from django.db import models
 
+# Fields that access tokens carry as claims (see authentication/tokens.py) or that should end them
+TOKEN_CLAIM_FIELDS = {'email', 'display_name', 'role', 'email_verified', 'is_active', 'password'}
+TOKEN_VERSION_CACHE_KEY = 'user:token_version:{}'
+
 class User(AbstractUser):
     """Custom User model"""
     
@@ -18,6 +24,8 @@ class User(AbstractUser):
     last_login_ip = models.GenericIPAddressField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Bumped when a claim field changes, so claims in earlier access tokens are recognised as stale
+    token_version = models.PositiveIntegerField(default=0, editable=False)
     
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username', 'display_name']
@@ -29,6 +37,25 @@ class User(AbstractUser):
     
     def __str__(self):
         return f"{self.display_name} ({self.email})"
+    
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        bump = not self._state.adding and (update_fields is None or not TOKEN_CLAIM_FIELDS.isdisjoint(update_fields))
+        if bump:
+            self.token_version += 1
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'token_version'}
+        super().save(*args, **kwargs)
+        if bump:
+            # Tokens issued before the bump expire within the access token lifetime, and so does this entry
+            cache.set(TOKEN_VERSION_CACHE_KEY.format(self.pk), self.token_version, settings.JWT_ACCESS_TOKEN_LIFETIME)
+    
+    def refresh_from_db(self, using=None, fields=None):
+        # A user built from token claims loads everything else at once, the first time any of it is used
+        if fields is not None and getattr(self, 'from_token_claims', False):
+            fields = self.get_deferred_fields() | set(fields)
+            self.from_token_claims = False
+        super().refresh_from_db(using=using, fields=fields)
 
 class RefreshToken(models.Model):
     """JWT Refresh Token model"""
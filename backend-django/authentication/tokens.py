@@ -0,0 +1,97 @@
+"""
+JWT issuing and decoding.
+
+Tokens are signed with ``JWT_SECRET_KEY`` (HS256), or with the current key
+of the key ring (RS256 or EdDSA, see authentication/keys.py) and its
+``kid`` in the header, so that other services can verify them with the
+public keys from ``/api/auth/jwks/`` instead of holding the secret.
+
+With ``JWT_CLAIMS_FIRST`` on, access tokens also carry the user's role,
+display name, email, email verification and ``token_version``, and
+``JWTAuthentication`` builds ``request.user`` from them without a query
+(``user_from_claims``). Any other field is loaded on first use, all of
+them in one query. Saving a claim field bumps ``User.token_version`` and
+records it in the cache; tokens with another version, or whose user has
+no version in the cache, fall back to loading the user, which records its
+version again. Other workers only notice through a shared cache
+(``REDIS_URL``); with the per-process default, claims can be stale for up
+to ``JWT_ACCESS_TOKEN_LIFETIME``.
+"""
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import jwt
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router
+
+from .keys import key_ring
+from .models import TOKEN_VERSION_CACHE_KEY, User
+
+# Claim -> User field
+CLAIMS = {'role': 'role', 'name': 'display_name', 'email': 'email', 'email_verified': 'email_verified'}
+
+
+def _encode(payload):
+    if settings.JWT_ALGORITHM == 'HS256':
+        return jwt.encode(payload, settings.JWT_SECRET_KEY, algorithm='HS256')
+    key = key_ring.signing_key()
+    return jwt.encode(payload, key.private_key, algorithm=key.algorithm, headers={'kid': key.kid})
+
+
+def decode_token(token):
+    """Verified payload; raises ``jwt.InvalidTokenError`` (or its ``ExpiredSignatureError`` subclass)"""
+    kid = jwt.get_unverified_header(token).get('kid')
+    if kid is None:
+        # HS256 tokens carry no key id; still accepted after switching to asymmetric keys unless disabled
+        if settings.JWT_ALGORITHM != 'HS256' and not settings.JWT_HS256_FALLBACK:
+            raise jwt.InvalidTokenError('Token has no key id')
+        return jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=['HS256'])
+    key = key_ring.get(kid)
+    if key is None:
+        raise jwt.InvalidTokenError('Unknown key id')
+    # Only the key's own algorithm, so a token can't pick a weaker one
+    return jwt.decode(token, key.public_key, algorithms=[key.algorithm])
+
+
+def issue_access_token(user, now=None, lifetime=None):
+    now = now or datetime.now(timezone.utc)
+    payload = {
+        'user_id': user.id,
+        'exp': now + timedelta(seconds=lifetime or settings.JWT_ACCESS_TOKEN_LIFETIME),
+    }
+    if settings.JWT_CLAIMS_FIRST:
+        payload.update({claim: getattr(user, field) for claim, field in CLAIMS.items()}, ver=user.token_version)
+    return _encode(payload)
+
+
+def issue_refresh_token(user, now=None):
+    now = now or datetime.now(timezone.utc)
+    return _encode({
+        'user_id': user.id,
+        'exp': now + timedelta(seconds=settings.JWT_REFRESH_TOKEN_LIFETIME),
+        'jti': uuid.uuid4().hex,  # Two logins within the same second must not collide
+    })
+
+
+def user_from_claims(payload):
+    """User built from the token's claims, or None when it has none, they are stale or claims-first is off"""
+    if not settings.JWT_CLAIMS_FIRST or 'ver' not in payload:
+        return None
+    # A missing entry (never recorded, expired or evicted) can't vouch for the token
+    if cache.get(TOKEN_VERSION_CACHE_KEY.format(payload['user_id'])) != payload['ver']:
+        return None
+    known = {field: payload[claim] for claim, field in CLAIMS.items() if claim in payload}
+    known.update(id=payload['user_id'], token_version=payload['ver'], is_active=True)
+    # Fields left out are deferred, like a .only() queryset
+    names = [f.attname for f in User._meta.concrete_fields if f.attname in known]
+    user = User.from_db(router.db_for_read(User), names, [known[name] for name in names])
+    user.from_token_claims = True
+    return user
+
+
+def remember_token_version(user):
+    """Record the version of a user just loaded from the database, so its tokens can be trusted again"""
+    if settings.JWT_CLAIMS_FIRST:
+        # add(), not set(): a bump saved since the row was read must not be overwritten
+        cache.add(TOKEN_VERSION_CACHE_KEY.format(user.pk), user.token_version, settings.JWT_ACCESS_TOKEN_LIFETIME)
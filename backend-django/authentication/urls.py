@@ -7,4 +7,5 @@ urlpatterns = [
     path('logout/', views.LogoutView.as_view(), name='logout'),
     path('me/', views.UserProfileView.as_view(), name='user-profile'),
     path('refresh/', views.RefreshTokenView.as_view(), name='refresh-token'),
+    path('jwks/', views.JWKSView.as_view(), name='jwks'),
 ]
\ No newline at end of file
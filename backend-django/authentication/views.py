@@ -5,28 +5,42 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.contrib.auth import authenticate
 from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
 from .models import User, RefreshToken
+from .keys import key_ring
+from .tokens import decode_token, issue_access_token, issue_refresh_token
 import jwt
 from django.conf import settings
 from datetime import datetime, timedelta, timezone
+from portfolio_backend.throttling import RateLimit, RateLimitThrottle, KEY_EMAIL, KEY_IP, KEY_USER, TOKEN_BUCKET
 
 class RegisterView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [RateLimitThrottle]
+    rate_limits = [RateLimit('register-ip', key=KEY_IP)]
     
     def post(self, request):
         data = request.data
+        email = data.get('email')
+        password = data.get('password')
         
-        # Validation
-        if User.objects.filter(email=data.get('email')).exists():
-            return Response({'error': 'Email already exists'}, status=status.HTTP_400_BAD_REQUEST)
+        if not email or not password:
+            return Response({'error': 'Email and password are required'}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Create user
-        user = User.objects.create(
-            email=data.get('email'),
-            username=data.get('email'),  # Use email as username
-            display_name=data.get('displayName'),
-            password=make_password(data.get('password'))
-        )
+        # Hash first (deliberately slow), so the transaction only covers the insert
+        password_hash = make_password(password)
+        
+        # One INSERT; the unique email/username constraints reject duplicates, including concurrent signups
+        try:
+            with transaction.atomic():
+                user = User.objects.create(
+                    email=email,
+                    username=email,  # Use email as username
+                    display_name=data.get('displayName') or '',
+                    password=password_hash
+                )
+        except IntegrityError:
+            return Response({'error': 'Email already exists'}, status=status.HTTP_400_BAD_REQUEST)
         
         return Response({
             'message': 'User created successfully',
@@ -39,6 +53,12 @@ class RegisterView(APIView):
 
 class LoginView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [RateLimitThrottle]
+    # Per IP against credential stuffing, per email against guessing one account's password from many IPs
+    rate_limits = [
+        RateLimit('login-ip', key=KEY_IP),
+        RateLimit('login-email', key=KEY_EMAIL, algorithm=TOKEN_BUCKET),
+    ]
     
     def post(self, request):
         email = request.data.get('email')
@@ -50,15 +70,8 @@ class LoginView(APIView):
         
         # Generate JWT tokens
         now = datetime.now(timezone.utc)
-        access_token = jwt.encode({
-            'user_id': user.id,
-            'exp': now + timedelta(seconds=settings.JWT_ACCESS_TOKEN_LIFETIME)
-        }, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
-        
-        refresh_token = jwt.encode({
-            'user_id': user.id,
-            'exp': now + timedelta(seconds=settings.JWT_REFRESH_TOKEN_LIFETIME)
-        }, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+        access_token = issue_access_token(user, now)
+        refresh_token = issue_refresh_token(user, now)
         
         # Save refresh token
         RefreshToken.objects.create(
@@ -102,12 +115,17 @@ class UserProfileView(APIView):
 
 class RefreshTokenView(APIView):
     permission_classes = [AllowAny]
+    throttle_classes = [RateLimitThrottle]
+    rate_limits = [
+        RateLimit('refresh-ip', key=KEY_IP),
+        RateLimit('refresh-user', key=KEY_USER, algorithm=TOKEN_BUCKET),
+    ]
     
     def post(self, request):
         refresh_token = request.data.get('refresh_token')
         
         try:
-            payload = jwt.decode(refresh_token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+            payload = decode_token(refresh_token)
             user = User.objects.get(id=payload['user_id'])
             
             # Check if token exists and is not revoked
@@ -116,10 +134,7 @@ class RefreshTokenView(APIView):
                 return Response({'error': 'Invalid refresh token'}, status=status.HTTP_401_UNAUTHORIZED)
             
             # Generate new access token
-            access_token = jwt.encode({
-                'user_id': user.id,
-                'exp': datetime.now(timezone.utc) + timedelta(seconds=settings.JWT_ACCESS_TOKEN_LIFETIME)
-            }, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
+            access_token = issue_access_token(user)
             
             return Response({
                 'access_token': access_token,
@@ -129,4 +144,15 @@ class RefreshTokenView(APIView):
         except jwt.ExpiredSignatureError:
             return Response({'error': 'Refresh token expired'}, status=status.HTTP_401_UNAUTHORIZED)
         except (jwt.InvalidTokenError, User.DoesNotExist):
-            return Response({'error': 'Invalid refresh token'}, status=status.HTTP_401_UNAUTHORIZED)
\ No newline at end of file
+            return Response({'error': 'Invalid refresh token'}, status=status.HTTP_401_UNAUTHORIZED)
+
+class JWKSView(APIView):
+    """Public keys that verify RS256/EdDSA tokens, for services that check tokens themselves"""
+    permission_classes = [AllowAny]
+    authentication_classes = []
+    
+    def get(self, request):
+        response = Response({'keys': key_ring.jwks()})
+        # Verifiers should also refetch when they meet an unknown kid, e.g. right after a rotation
+        response['Cache-Control'] = f'public, max-age={settings.JWT_KEYS_RELOAD_INTERVAL}'
+        return response
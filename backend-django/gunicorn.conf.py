@@ -0,0 +1,80 @@
+"""
+Gunicorn configuration, tuned from the environment (see portfolio_backend/server.py).
+
+    gunicorn                        # WSGI, gthread workers
+    SERVER_ASGI=True gunicorn       # ASGI, uvicorn workers
+
+Gunicorn reads this file from the working directory; ``gunicorn --print-config``
+shows the resulting settings.
+"""
+import os
+
+import decouple  # Not "from decouple import config": gunicorn reads a module-level `config` as a setting
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio_backend.settings_production')
+
+from portfolio_backend.server import tune  # noqa: E402
+
+_tuned = tune()
+
+bind = decouple.config('SERVER_BIND', default=f"0.0.0.0:{decouple.config('PORT', default=8000, cast=int)}")
+wsgi_app = _tuned['wsgi_app']
+workers = _tuned['workers']
+worker_class = _tuned['worker_class']
+threads = _tuned['threads']
+max_requests = _tuned['max_requests']
+max_requests_jitter = _tuned['max_requests_jitter']
+preload_app = _tuned['preload_app']
+timeout = _tuned['timeout']
+graceful_timeout = _tuned['graceful_timeout']
+keepalive = _tuned['keepalive']
+
+# Worker heartbeats on tmpfs; a disk-backed /tmp can stall them in containers
+worker_tmp_dir = '/dev/shm' if os.path.isdir('/dev/shm') else None
+# Trust X-Forwarded-Proto from these addresses (nginx)
+forwarded_allow_ips = decouple.config('FORWARDED_ALLOW_IPS', default='127.0.0.1')
+
+# Django writes the JSON access log (portfolio_backend/request_log.py)
+accesslog = None
+errorlog = '-'
+loglevel = decouple.config('SERVER_LOG_LEVEL', default='info')
+
+
+def on_starting(server):
+    from portfolio_backend.metrics import clear_metrics_dir
+
+    clear_metrics_dir()  # Counters restart with the server
+    server.log.info(
+        "Autotuned for %s CPUs / %s MB: %s %s workers x %s threads",
+        _tuned['cpus'], _tuned['memory_mb'], workers, worker_class, threads,
+    )
+
+
+def pre_fork(server, worker):
+    # Connections opened while preloading must not be shared with workers
+    from django.core.cache import caches
+    from django.db import connections
+
+    connections.close_all()
+    for cache in caches.all(initialized_only=True):
+        cache.close()
+    if server.cfg.preload_app:
+        from django.conf import settings
+
+        if settings.JWT_ALGORITHM != 'HS256':
+            from authentication.keys import key_ring
+
+            key_ring.keys()  # Parse signing keys (slow for RSA) once; workers inherit them
+
+
+def worker_exit(server, worker):
+    from portfolio_backend.metrics import registry
+
+    registry.flush(force=True)
+
+
+def child_exit(server, worker):
+    # Runs in the master once the worker is gone, also after a timeout kill
+    from portfolio_backend.metrics import mark_process_dead
+
+    mark_process_dead(worker.pid)
@@ -0,0 +1,60 @@
+import logging
+
+from django.conf import settings
+from django.core.mail import send_mail
+
+from taskqueue.registry import task
+from .models import LearnInquiry
+
+logger = logging.getLogger(__name__)
+
+
+@task(max_attempts=5, retry_backoff=30)
+def send_inquiry_notification(inquiry_id):
+    """Email the admin about a new learning program inquiry"""
+    if not getattr(settings, 'EMAIL_HOST', None):
+        return
+
+    try:
+        inquiry = LearnInquiry.objects.get(id=inquiry_id)
+    except LearnInquiry.DoesNotExist:
+        logger.warning("Inquiry %s no longer exists, skipping notification", inquiry_id)
+        return
+
+    subject = f'New Learning Program Inquiry - {inquiry.get_course_type_display()}'
+    message = f"""
+New learning program inquiry received:
+
+Student Information:
+- Name: {inquiry.student_name}
+- Age Group: {inquiry.get_age_group_display()}
+- Experience Level: {inquiry.get_experience_level_display()}
+
+Contact Information:
+- Email: {inquiry.contact_email}
+- Phone: {inquiry.contact_phone or 'Not provided'}
+- Parent/Guardian: {inquiry.parent_guardian_name or 'Not applicable'}
+
+Course Preferences:
+- Course Type: {inquiry.get_course_type_display()}
+- Service Type: {inquiry.get_service_type_display()}
+- Preferred Schedule: {inquiry.preferred_schedule or 'Not specified'}
+
+Learning Goals: {inquiry.learning_goals or 'Not specified'}
+Has Computer: {'Yes' if inquiry.has_computer else 'No'}
+Additional Notes: {inquiry.additional_notes or 'None'}
+
+Inquiry ID: {inquiry.id}
+Submitted: {inquiry.created_at}
+
+Please follow up with this inquiry.
+    """
+
+    # Raising lets the worker retry with backoff when the mail server is down
+    send_mail(
+        subject,
+        message,
+        settings.DEFAULT_FROM_EMAIL,
+        [settings.DEFAULT_FROM_EMAIL],  # Send to admin
+        fail_silently=False,
+    )
@@ -3,13 +3,14 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from django.shortcuts import get_object_or_404
-from django.core.mail import send_mail
-from django.conf import settings
 from .models import Course, Lesson, Assignment, Submission, Enrollment, SubmissionComment, LearnInquiry
 from .serializers import (
     CourseSerializer, LessonSerializer, AssignmentSerializer, 
     SubmissionSerializer, EnrollmentSerializer, SubmissionCommentSerializer, LearnInquirySerializer
 )
+from .tasks import send_inquiry_notification
+from portfolio_backend.response_cache import CachePolicy, VARY_AUTHENTICATED
+from portfolio_backend.throttling import RateLimit, RateLimitThrottle, KEY_EMAIL, KEY_IP
 
 
 class CourseViewSet(viewsets.ReadOnlyModelViewSet):
@@ -19,6 +20,10 @@ class CourseViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Course.objects.all()
     serializer_class = CourseSerializer
     permission_classes = [IsAuthenticated]
+    # instructor_name comes from the instructor's user row
+    cache_policy = CachePolicy(
+        ttl=10 * 60, vary=VARY_AUTHENTICATED, tags=['learn.Course', 'learn.Lesson', 'authentication.User']
+    )
 
 
 class LessonViewSet(viewsets.ReadOnlyModelViewSet):
@@ -28,6 +33,10 @@ class LessonViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Lesson.objects.all()
     serializer_class = LessonSerializer
     permission_classes = [IsAuthenticated]
+    # course_title comes from the course row
+    cache_policy = CachePolicy(
+        ttl=10 * 60, vary=VARY_AUTHENTICATED, tags=['learn.Lesson', 'learn.Assignment', 'learn.Course']
+    )
     
     def get_queryset(self):
         course_id = self.request.query_params.get('course_id', None)
@@ -186,6 +195,12 @@ class LearnInquiryView(APIView):
     Handle learning program inquiries and registrations
     """
     permission_classes = [AllowAny]
+    throttle_classes = [RateLimitThrottle]
+    # Every inquiry emails the admin
+    rate_limits = [
+        RateLimit('inquiry-ip', key=KEY_IP),
+        RateLimit('inquiry-email', key=KEY_EMAIL, field='contact_email'),
+    ]
     
     def post(self, request):
         try:
@@ -194,49 +209,8 @@ class LearnInquiryView(APIView):
             if serializer.is_valid():
                 inquiry = serializer.save()
                 
-                # Prepare email content
-                subject = f'New Learning Program Inquiry - {inquiry.get_course_type_display()}'
-                message = f"""
-New learning program inquiry received:
-
-Student Information:
-- Name: {inquiry.student_name}
-- Age Group: {inquiry.get_age_group_display()}
-- Experience Level: {inquiry.get_experience_level_display()}
-
-Contact Information:
-- Email: {inquiry.contact_email}
-- Phone: {inquiry.contact_phone or 'Not provided'}
-- Parent/Guardian: {inquiry.parent_guardian_name or 'Not applicable'}
-
-Course Preferences:
-- Course Type: {inquiry.get_course_type_display()}
-- Service Type: {inquiry.get_service_type_display()}
-- Preferred Schedule: {inquiry.preferred_schedule or 'Not specified'}
-
-Learning Goals: {inquiry.learning_goals or 'Not specified'}
-Has Computer: {'Yes' if inquiry.has_computer else 'No'}
-Additional Notes: {inquiry.additional_notes or 'None'}
-
-Inquiry ID: {inquiry.id}
-Submitted: {inquiry.created_at}
-
-Please follow up with this inquiry.
-                """
-                
-                # Send email notification (if email is configured)
-                try:
-                    if hasattr(settings, 'EMAIL_HOST') and settings.EMAIL_HOST:
-                        send_mail(
-                            subject,
-                            message,
-                            settings.DEFAULT_FROM_EMAIL,
-                            [settings.DEFAULT_FROM_EMAIL],  # Send to admin
-                            fail_silently=False,
-                        )
-                except Exception as e:
-                    # Log email error but don't fail the request
-                    print(f"Email sending failed: {e}")
+                # Email the admin from the background worker so SMTP latency never blocks the request
+                send_inquiry_notification.delay(inquiry.id)
                 
                 return Response({
                     'message': 'Thank you for your interest! We will contact you soon to discuss your learning journey.',
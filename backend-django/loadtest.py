@@ -0,0 +1,405 @@
+#!/usr/bin/env python
+"""
+Concurrent load test against a running (or spawned) server.
+
+Virtual users replay a weighted mix of realistic journeys over keep-alive
+HTTP connections and the run reports requests/s, error rates and latency
+histograms per endpoint. Only the standard library is used, so it can be
+pointed at any deployment, including through nginx to exercise its rate
+limits (nginx answers 503 by default when limit_req rejects a request).
+
+Users come from `python manage.py generate_load_data`:
+
+    python manage.py generate_load_data --users 2000
+    python loadtest.py --spawn gunicorn --workers 4 --users 50 --duration 60
+    python loadtest.py --spawn uvicorn --workers 4 --users 50 --duration 60
+    python loadtest.py --url http://localhost:8000 --mix browse=80,login=20
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from urllib.parse import urlsplit
+
+BASE_DIR = Path(__file__).resolve().parent
+
+DEFAULT_MIX = {'browse': 60, 'cart_add': 15, 'lesson_complete': 12, 'checkout': 5, 'login': 8}
+BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+
+class HTTPError(Exception):
+    pass
+
+
+class Connection:
+    """Minimal HTTP/1.1 keep-alive client connection"""
+
+    def __init__(self, host, port, timeout):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.reader = self.writer = None
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+    async def request(self, method, path, headers=None, body=None):
+        try:
+            return await asyncio.wait_for(self._request(method, path, headers or {}, body), self.timeout)
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, HTTPError):
+            await self.close()
+            raise
+
+    async def _request(self, method, path, headers, body):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        payload = json.dumps(body).encode() if body is not None else b''
+        lines = [f'{method} {path} HTTP/1.1', f'Host: {self.host}:{self.port}', 'Accept: application/json',
+                 f'Content-Length: {len(payload)}']
+        if body is not None:
+            lines.append('Content-Type: application/json')
+        lines.extend(f'{name}: {value}' for name, value in headers.items())
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode() + payload)
+        await self.writer.drain()
+
+        head = await self.reader.readuntil(b'\r\n\r\n')
+        status_line, *header_lines = head.decode('latin-1').split('\r\n')
+        version, status = status_line.split(' ', 2)[:2]
+        response_headers = {}
+        for line in header_lines:
+            if line:
+                name, _, value = line.partition(':')
+                response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get('transfer-encoding', '').lower() == 'chunked':
+            content = bytearray()
+            while True:
+                size = int((await self.reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                if size == 0:
+                    await self.reader.readuntil(b'\r\n')
+                    break
+                content += await self.reader.readexactly(size + 2)
+                del content[-2:]
+            content = bytes(content)
+        elif 'content-length' in response_headers:
+            content = await self.reader.readexactly(int(response_headers['content-length']))
+        else:
+            content = await self.reader.read()
+            await self.close()
+
+        connection_header = response_headers.get('connection', '').lower()
+        if connection_header == 'close' or (version == 'HTTP/1.0' and connection_header != 'keep-alive'):
+            await self.close()
+        return int(status), content
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    def record(self, name, started, status):
+        self.latencies[name].append((time.perf_counter() - started) * 1000)
+        self.statuses[name][status] += 1
+
+
+class VirtualUser:
+    def __init__(self, index, args, stats, catalog):
+        host, port = args.target
+        self.email = f'user{index % args.accounts}@{args.email_domain}'
+        self.password = args.password
+        self.args = args
+        self.stats = stats
+        self.catalog = catalog
+        self.rng = random.Random(args.seed + index)
+        self.conn = Connection(host, port, args.timeout)
+        self.token = None
+
+    async def call(self, name, method, path, body=None, auth=True):
+        headers = {'Authorization': f'Bearer {self.token}'} if auth and self.token else {}
+        started = time.perf_counter()
+        try:
+            status, content = await self.conn.request(method, path, headers, body)
+        except Exception as e:
+            self.stats.record(name, started, type(e).__name__)
+            return None, None
+        self.stats.record(name, started, status)
+        if status == 401 and auth:
+            self.token = None
+        try:
+            return status, json.loads(content) if content else None
+        except ValueError:
+            return status, None
+
+    async def run(self, deadline, mix):
+        names, weights = zip(*mix.items())
+        try:
+            while time.monotonic() < deadline:
+                if self.token is None:
+                    await self.login()
+                    if self.token is None:
+                        await asyncio.sleep(1)
+                        continue
+                scenario = self.rng.choices(names, weights)[0]
+                await getattr(self, scenario)()
+                if self.args.think_time:
+                    await asyncio.sleep(self.rng.uniform(0, 2 * self.args.think_time))
+        finally:
+            await self.conn.close()
+
+    async def login(self):
+        status, data = await self.call('POST /auth/login/', 'POST', '/api/auth/login/',
+                                       {'email': self.email, 'password': self.password}, auth=False)
+        if status == 200 and data:
+            self.token = data['access_token']
+
+    async def browse(self):
+        page = self.rng.randint(1, 3)
+        await self.call('GET /home/', 'GET', '/api/home/', auth=False)
+        status, data = await self.call('GET /shop/products/', 'GET', f'/api/shop/products/?page={page}', auth=False)
+        ids = [product['id'] for product in (data or {}).get('results', [])] or self.catalog
+        if ids:
+            await self.call('GET /shop/products/{id}/', 'GET', f'/api/shop/products/{self.rng.choice(ids)}/', auth=False)
+
+    async def cart_add(self):
+        if self.catalog:
+            await self.call('POST /shop/cart/', 'POST', '/api/shop/cart/',
+                            {'product_id': self.rng.choice(self.catalog), 'quantity': self.rng.randint(1, 2)})
+
+    async def checkout(self):
+        status, cart = await self.call('GET /shop/cart/', 'GET', '/api/shop/cart/')
+        items = (cart or {}).get('items') or []
+        if not items:
+            return
+        subtotal = round(sum(item['product_price'] * item['quantity'] for item in items), 2)
+        status, order = await self.call('POST /shop/orders/', 'POST', '/api/shop/orders/', {
+            'items': items, 'subtotal': subtotal, 'shipping': 15, 'total': subtotal + 15,
+            'shipping_address': {'city': 'Accra', 'country': 'GH'},
+        })
+        if status == 201 and self.args.with_payment:
+            await self.call('POST /shop/payment/initialize/', 'POST', '/api/shop/payment/initialize/',
+                            {'order_id': order['id']})
+        for item in items:
+            await self.call('DELETE /shop/cart/', 'DELETE', '/api/shop/cart/', {'item_id': item['product_id']})
+
+    async def lesson_complete(self):
+        status, data = await self.call('GET /learn/enrollments/', 'GET', '/api/learn/enrollments/')
+        enrollments = (data or {}).get('results') or []
+        if not enrollments:
+            return
+        course = self.rng.choice(enrollments)['course']
+        status, data = await self.call('GET /learn/lessons/?course_id', 'GET', f'/api/learn/lessons/?course_id={course}')
+        lessons = data.get('results', []) if isinstance(data, dict) else (data or [])
+        if lessons:
+            lesson = self.rng.choice(lessons)['id']
+            await self.call('POST /learn/lessons/{id}/complete/', 'POST', f'/api/learn/lessons/{lesson}/complete/')
+
+
+async def load_catalog(args):
+    host, port = args.target
+    conn = Connection(host, port, args.timeout)
+    try:
+        status, content = await conn.request('GET', '/api/shop/products/')
+    finally:
+        await conn.close()
+    if status != 200:
+        return []
+    return [product['id'] for product in json.loads(content).get('results', [])]
+
+
+async def run_load(args):
+    stats = Stats()
+    catalog = await load_catalog(args)
+    if not catalog:
+        print('warning: no products found, cart and checkout journeys will be skipped')
+
+    started = time.monotonic()
+    deadline = started + args.duration
+    tasks = []
+    for index in range(args.users):
+        user = VirtualUser(index, args, stats, catalog)
+        tasks.append(asyncio.create_task(user.run(deadline, args.mix)))
+        if args.ramp_up:
+            await asyncio.sleep(args.ramp_up / args.users)
+    await asyncio.gather(*tasks)
+    return stats, time.monotonic() - started
+
+
+def percentile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def histogram(samples):
+    counts = [0] * (len(BUCKETS_MS) + 1)
+    for value in samples:
+        for index, bound in enumerate(BUCKETS_MS):
+            if value <= bound:
+                counts[index] += 1
+                break
+        else:
+            counts[-1] += 1
+    labels = [f'<={bound}ms' for bound in BUCKETS_MS] + [f'>{BUCKETS_MS[-1]}ms']
+    return dict(zip(labels, counts))
+
+
+def is_error(status):
+    return not isinstance(status, int) or status >= 400
+
+
+def report(stats, elapsed, args):
+    summary = {'duration_s': round(elapsed, 2), 'users': args.users, 'endpoints': {}}
+    total = errors = 0
+    print(f'\n{"endpoint":<36} {"reqs":>7} {"rps":>8} {"err%":>6} {"p50":>8} {"p90":>8} {"p99":>8} {"max":>8}  statuses')
+    for name in sorted(stats.latencies):
+        samples = sorted(stats.latencies[name])
+        statuses = stats.statuses[name]
+        failed = sum(count for status, count in statuses.items() if is_error(status))
+        total += len(samples)
+        errors += failed
+        row = {
+            'requests': len(samples),
+            'rps': round(len(samples) / elapsed, 2),
+            'error_rate': round(failed / len(samples), 4),
+            'p50_ms': round(percentile(samples, 0.50), 2),
+            'p90_ms': round(percentile(samples, 0.90), 2),
+            'p99_ms': round(percentile(samples, 0.99), 2),
+            'max_ms': round(samples[-1], 2),
+            'statuses': {str(status): count for status, count in statuses.items()},
+            'histogram': histogram(samples),
+        }
+        summary['endpoints'][name] = row
+        status_text = ' '.join(f'{status}:{count}' for status, count in sorted(row['statuses'].items()))
+        print(f'{name:<36} {row["requests"]:>7} {row["rps"]:>8.1f} {row["error_rate"] * 100:>5.1f}% '
+              f'{row["p50_ms"]:>8.1f} {row["p90_ms"]:>8.1f} {row["p99_ms"]:>8.1f} {row["max_ms"]:>8.1f}  {status_text}')
+
+    if args.histograms:
+        for name, row in summary['endpoints'].items():
+            print(f'\n{name}')
+            peak = max(row['histogram'].values()) or 1
+            for label, count in row['histogram'].items():
+                if count:
+                    print(f'  {label:>9} {count:>7} {"#" * max(1, round(40 * count / peak))}')
+
+    summary.update(requests=total, rps=round(total / elapsed, 2), error_rate=round(errors / total, 4) if total else None)
+    print(f'\n{total} requests in {elapsed:.1f}s: {summary["rps"]} req/s, '
+          f'{errors} errors ({(summary["error_rate"] or 0) * 100:.2f}%) with {args.users} virtual users')
+    if args.json:
+        Path(args.json).write_text(json.dumps(summary, indent=2) + '\n')
+    return summary
+
+
+def spawn_server(args):
+    """Start the app on args.target, waiting until the health check answers"""
+    host, port = args.target
+    env = dict(os.environ)
+    if args.database:
+        env['SQLITE_PATH'] = str(Path(args.database).resolve())
+    if not args.with_rate_limits:
+        # Every virtual user shares one IP, which the login and refresh limits would soon reject
+        env['RATE_LIMIT_ENABLED'] = 'False'
+    if args.spawn in ('gunicorn', 'uvicorn'):
+        # gunicorn.conf.py, with uvicorn workers serving the ASGI app for --spawn uvicorn
+        env.update(SERVER_BIND=f'{host}:{port}', WEB_CONCURRENCY=str(args.workers), SERVER_ASGI=str(args.spawn == 'uvicorn'))
+        command = [sys.executable, '-m', 'gunicorn']
+    else:
+        command = [sys.executable, 'manage.py', 'runserver', '--noreload', f'{host}:{port}']
+    process = subprocess.Popen(command, cwd=BASE_DIR, env=env, stdout=subprocess.DEVNULL,
+                               stderr=None if args.server_logs else subprocess.DEVNULL)
+
+    async def wait_ready():
+        conn = Connection(host, port, 2)
+        for _ in range(100):
+            if process.poll() is not None:
+                raise SystemExit(f'{args.spawn} exited with status {process.returncode}')
+            try:
+                status, _ = await conn.request('GET', '/api/health/')
+                if status == 200:
+                    return
+            except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                await asyncio.sleep(0.2)
+            finally:
+                await conn.close()
+        raise SystemExit(f'{args.spawn} did not become ready on {host}:{port}')
+
+    try:
+        asyncio.run(wait_ready())
+    except BaseException:
+        stop_server(process)
+        raise
+    return process
+
+
+def stop_server(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f'unknown scenario {name!r}, choose from {", ".join(DEFAULT_MIX)}')
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--url', default='http://127.0.0.1:8000', help='Server to load (http only)')
+    parser.add_argument('--spawn', choices=['runserver', 'gunicorn', 'uvicorn'], help='Start the app on --url for the run')
+    parser.add_argument('--workers', type=int, default=4, help='Worker processes for --spawn gunicorn/uvicorn')
+    parser.add_argument('--database', help='SQLite file the spawned server uses (sets SQLITE_PATH)')
+    parser.add_argument('--with-rate-limits', action='store_true', help='Keep rate limits on in the spawned server')
+    parser.add_argument('--server-logs', action='store_true', help="Show the spawned server's stderr")
+    parser.add_argument('--users', type=int, default=20, help='Concurrent virtual users')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds to run')
+    parser.add_argument('--ramp-up', type=float, default=5, help='Seconds over which users start')
+    parser.add_argument('--think-time', type=float, default=0.5, help='Mean pause between journeys, seconds')
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX,
+                        help='Journey weights, e.g. browse=60,cart_add=15,lesson_complete=12,checkout=5,login=8')
+    parser.add_argument('--accounts', type=int, default=1000, help='Generated accounts to spread users across')
+    parser.add_argument('--email-domain', default='load.example.test')
+    parser.add_argument('--password', default='loadtest123')
+    parser.add_argument('--with-payment', action='store_true',
+                        help='Initialize a payment after checkout (point PAYSTACK_BASE_URL at run_fake_paystack)')
+    parser.add_argument('--timeout', type=float, default=30, help='Per-request timeout, seconds')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--histograms', action='store_true', help='Print a latency histogram per endpoint')
+    parser.add_argument('--json', help='Write the summary to this file')
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    if url.scheme != 'http':
+        parser.error('only http:// URLs are supported')
+    args.target = (url.hostname, url.port or 80)
+
+    process = spawn_server(args) if args.spawn else None
+    try:
+        stats, elapsed = asyncio.run(run_load(args))
+    finally:
+        if process:
+            stop_server(process)
+    summary = report(stats, elapsed, args)
+    sys.exit(1 if summary['requests'] == 0 else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,241 @@
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import override_settings
+
+from authentication.tokens import issue_access_token
+from learn.models import Course, Enrollment, Lesson
+from portfolio.models import Project, Thought
+from shop.models import Cart, Order, Product
+
+User = get_user_model()
+
+BASELINE_PATH = Path(settings.BASE_DIR) / 'benchmarks' / 'baseline.json'
+BENCH_EMAIL = 'benchmark@bench.example.test'
+BENCH_PASSWORD = 'benchmark-password'
+
+DEFAULT_TOLERANCES = {
+    'latency': 0.5,  # p50 may grow by this fraction...
+    'latency_slack_ms': 2.0,  # ...plus this many milliseconds
+    'queries': 0,  # extra queries per request allowed
+    'memory': 0.25,  # peak allocation may grow by this fraction...
+    'memory_slack_kib': 64,  # ...plus this many KiB
+}
+
+# (name, method, path, authenticated, body); {placeholders} are sample object ids
+ENDPOINTS = [
+    ('health', 'GET', '/api/health/', False, None),
+    ('home', 'GET', '/api/home/', False, None),
+    ('projects', 'GET', '/api/portfolio/projects/', False, None),
+    ('projects-featured', 'GET', '/api/portfolio/projects/?featured=true&limit=8&page=1', False, None),
+    ('project-detail', 'GET', '/api/portfolio/projects/{project}/', False, None),
+    ('thoughts', 'GET', '/api/portfolio/thoughts/', False, None),
+    ('thought-detail', 'GET', '/api/portfolio/thoughts/{thought}/', False, None),
+    ('work', 'GET', '/api/portfolio/work/', False, None),
+    ('products', 'GET', '/api/shop/products/', False, None),
+    ('product-detail', 'GET', '/api/shop/products/{product}/', False, None),
+    ('cart', 'GET', '/api/shop/cart/', True, None),
+    ('orders', 'GET', '/api/shop/orders/', True, None),
+    ('courses', 'GET', '/api/learn/courses/', True, None),
+    ('course-detail', 'GET', '/api/learn/courses/{course}/', True, None),
+    ('lessons', 'GET', '/api/learn/lessons/?course_id={course}', True, None),
+    ('assignments', 'GET', '/api/learn/assignments/?lesson_id={lesson}', True, None),
+    ('enrollments', 'GET', '/api/learn/enrollments/', True, None),
+    ('me', 'GET', '/api/auth/me/', True, None),
+    ('batch-course-page', 'POST', '/api/batch/', True, {'requests': [
+        '/api/learn/courses/{course}/', '/api/learn/lessons/?course_id={course}',
+        '/api/learn/assignments/?lesson_id={lesson}', '/api/learn/enrollments/',
+    ]}),
+    ('login', 'POST', '/api/auth/login/', False, {'email': BENCH_EMAIL, 'password': BENCH_PASSWORD}),
+]
+
+# Password hashing makes login deliberately slow; fewer samples keep runs short
+MAX_ITERATIONS = {'login': 10}
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def fill(value, ids):
+    if isinstance(value, str):
+        return value.format(**ids)
+    if isinstance(value, list):
+        return [fill(item, ids) for item in value]
+    if isinstance(value, dict):
+        return {key: fill(item, ids) for key, item in value.items()}
+    return value
+
+
+class Command(BaseCommand):
+    help = 'Benchmark every API endpoint in-process and fail on regressions against benchmarks/baseline.json'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50, help='Timed requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument('--only', action='append', default=[], help='Endpoint name to run (repeatable)')
+        parser.add_argument('--baseline', default=str(BASELINE_PATH))
+        parser.add_argument('--update-baseline', action='store_true', help='Write this run as the new baseline')
+        parser.add_argument('--with-cache', action='store_true', help='Keep the response cache enabled')
+        parser.add_argument('--json', dest='json_output', default=None, help='Also write this run to a JSON file')
+
+    def handle(self, *args, **options):
+        endpoints = [e for e in ENDPOINTS if not options['only'] or e[0] in options['only']]
+        if not endpoints:
+            raise CommandError('No endpoints match --only')
+
+        # Rate limits would turn repeated logins into 429s and skew their timings
+        with transaction.atomic(), override_settings(RESPONSE_CACHE_ENABLED=options['with_cache'],
+                                                     RATE_LIMIT_ENABLED=False):
+            ids, token = self.prepare()
+            results = {}
+            for name, method, path, authenticated, body in endpoints:
+                missing = [key for key in ids if ids[key] is None and '{%s}' % key in json.dumps([path, body])]
+                if missing:
+                    self.stdout.write(self.style.WARNING(f'  {name:<20} skipped, no {", ".join(missing)} rows'))
+                    continue
+                iterations = min(options['iterations'], MAX_ITERATIONS.get(name, options['iterations']))
+                request = self.request_factory(method, fill(path, ids), fill(body, ids), token if authenticated else None)
+                results[name] = self.measure(name, request, iterations, options['warmup'])
+            dataset = self.dataset()
+            transaction.set_rollback(True)
+
+        run = {
+            'meta': {
+                'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'database': connection.vendor,
+                'iterations': options['iterations'],
+                'dataset': dataset,
+            },
+            'endpoints': results,
+        }
+        if options['json_output']:
+            Path(options['json_output']).write_text(json.dumps(run, indent=2) + '\n')
+
+        baseline_path = Path(options['baseline'])
+        if options['update_baseline']:
+            tolerances = DEFAULT_TOLERANCES
+            if baseline_path.exists():
+                tolerances = json.loads(baseline_path.read_text()).get('tolerances', DEFAULT_TOLERANCES)
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps({'tolerances': tolerances, **run}, indent=2) + '\n')
+            self.stdout.write(self.style.SUCCESS(f'Baseline written to {baseline_path}'))
+            return
+
+        if not baseline_path.exists():
+            self.stdout.write(self.style.WARNING(f'No baseline at {baseline_path}; run with --update-baseline to create one'))
+            return
+        self.compare(json.loads(baseline_path.read_text()), run)
+
+    def prepare(self):
+        """Sample object ids and an access token for a throwaway user (rolled back afterwards)"""
+        user = User.objects.create_user(
+            username='benchmark', email=BENCH_EMAIL, password=BENCH_PASSWORD, display_name='Benchmark User'
+        )
+        first = lambda model: model.objects.order_by('pk').values_list('pk', flat=True).first()
+        ids = {
+            'project': first(Project),
+            'thought': first(Thought),
+            'product': first(Product),
+            'course': first(Course),
+            'lesson': first(Lesson),
+        }
+        if ids['course']:
+            Enrollment.objects.create(user=user, course_id=ids['course'])
+        if ids['product']:
+            product = Product.objects.get(pk=ids['product'])
+            Cart.objects.create(user=user, items=[{
+                'product_id': product.pk, 'product_title': product.title,
+                'product_price': float(product.price), 'quantity': 1,
+            }])
+        token = issue_access_token(user, lifetime=60 * 60)
+        return ids, token
+
+    def request_factory(self, method, path, body, token):
+        client = Client(HTTP_HOST='localhost:8000')
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {token}'} if token else {}
+        if method == 'GET':
+            return lambda: client.get(path, **headers)
+        payload = json.dumps(body)
+        return lambda: client.post(path, payload, content_type='application/json', **headers)
+
+    def measure(self, name, request, iterations, warmup):
+        for _ in range(warmup):
+            response = request()
+        if response.status_code >= 400:
+            self.stdout.write(self.style.WARNING(f'  {name:<20} returned {response.status_code}'))
+
+        samples = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            request()
+            samples.append((time.perf_counter() - started) * 1000)
+
+        # connection.queries is reset by request_started, so count executions directly
+        queries = []
+        with connection.execute_wrapper(lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)):
+            request()
+
+        tracemalloc.start()
+        request()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        result = {
+            'status': response.status_code,
+            'p50_ms': round(statistics.median(samples), 3),
+            'p95_ms': round(percentile(samples, 0.95), 3),
+            'p99_ms': round(percentile(samples, 0.99), 3),
+            'queries': len(queries),
+            'peak_kib': round(peak / 1024, 1),
+        }
+        self.stdout.write(
+            f'  {name:<20} {result["status"]:>4}  p50 {result["p50_ms"]:>8.2f} ms  p95 {result["p95_ms"]:>8.2f} ms  '
+            f'p99 {result["p99_ms"]:>8.2f} ms  {result["queries"]:>3} queries  {result["peak_kib"]:>8.1f} KiB'
+        )
+        return result
+
+    def dataset(self):
+        models = [User, Project, Thought, Product, Order, Course, Lesson, Enrollment]
+        return {model._meta.label: model.objects.count() for model in models}
+
+    def compare(self, baseline, run):
+        tolerances = {**DEFAULT_TOLERANCES, **baseline.get('tolerances', {})}
+        if baseline.get('meta', {}).get('dataset') != run['meta']['dataset']:
+            self.stdout.write(self.style.WARNING(
+                'Dataset differs from the baseline run; latency and memory comparisons may not be meaningful'
+            ))
+
+        regressions = []
+        for name, current in run['endpoints'].items():
+            base = baseline.get('endpoints', {}).get(name)
+            if base is None:
+                self.stdout.write(f'  {name:<20} new endpoint, not in baseline')
+                continue
+            if current['status'] != base['status']:
+                regressions.append(f'{name}: status {base["status"]} -> {current["status"]}')
+            limit = base['p50_ms'] * (1 + tolerances['latency']) + tolerances['latency_slack_ms']
+            if current['p50_ms'] > limit:
+                regressions.append(f'{name}: p50 {base["p50_ms"]:.2f} -> {current["p50_ms"]:.2f} ms (limit {limit:.2f})')
+            if current['queries'] > base['queries'] + tolerances['queries']:
+                regressions.append(f'{name}: queries {base["queries"]} -> {current["queries"]}')
+            limit = base['peak_kib'] * (1 + tolerances['memory']) + tolerances['memory_slack_kib']
+            if current['peak_kib'] > limit:
+                regressions.append(f'{name}: peak {base["peak_kib"]:.0f} -> {current["peak_kib"]:.0f} KiB (limit {limit:.0f})')
+
+        if regressions:
+            raise CommandError('Performance regressions against baseline:\n  ' + '\n  '.join(regressions))
+        self.stdout.write(self.style.SUCCESS(f'No regressions against baseline ({len(run["endpoints"])} endpoints)'))
@@ -0,0 +1,58 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from portfolio_backend.testing import ENDPOINTS, create_sample_rows, render_list
+
+
+class Command(BaseCommand):
+    help = 'Check the fast list path renders byte-identical responses and benchmark it'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=50,
+                            help='Sample rows per model created for the run and rolled back afterwards (0 uses existing data)')
+        parser.add_argument('--iterations', type=int, default=200)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options['rows']:
+                create_sample_rows(options['rows'])
+            mismatches = self.check_parity()
+            self.benchmark(options['iterations'])
+            transaction.set_rollback(True)
+
+        if mismatches:
+            raise CommandError(f'{mismatches} response(s) differ between the fast and regular paths')
+        self.stdout.write(self.style.SUCCESS('Fast path output is byte-identical to the serializers'))
+
+    def check_parity(self):
+        mismatches = 0
+        for viewset, queries in ENDPOINTS:
+            for query in queries:
+                regular = render_list(viewset, query, fast=False)
+                fast = render_list(viewset, query, fast=True)
+                same = regular.status_code == fast.status_code and regular.content == fast.content
+                label = f'{viewset.__name__}?{query}'
+                if same:
+                    self.stdout.write(f'  ok       {label} ({len(fast.content)} bytes)')
+                else:
+                    mismatches += 1
+                    self.stderr.write(self.style.ERROR(f'  MISMATCH {label}'))
+        return mismatches
+
+    def benchmark(self, iterations):
+        self.stdout.write(f"\n{'endpoint':<24} {'regular rows/s':>15} {'fast rows/s':>12} {'speedup':>8}")
+        for viewset, _ in ENDPOINTS:
+            rows = len(render_list(viewset, '', fast=True).data['results'])
+            if not rows:
+                continue
+            timings = {}
+            for fast in (False, True):
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    render_list(viewset, '', fast=fast)
+                timings[fast] = rows * iterations / (time.perf_counter() - started)
+            self.stdout.write(
+                f'{viewset.__name__:<24} {timings[False]:>15.0f} {timings[True]:>12.0f} {timings[True] / timings[False]:>7.2f}x'
+            )
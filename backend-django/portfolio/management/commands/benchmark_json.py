@@ -0,0 +1,97 @@
+import random
+import time
+import tracemalloc
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from portfolio.models import Thought
+from portfolio.serializers import ThoughtSerializer
+from shop.models import Product, Order
+from shop.serializers import ProductSerializer, OrderSerializer
+from portfolio_backend.renderers import FastJSONRenderer, orjson
+
+
+class Command(BaseCommand):
+    help = 'Benchmark JSON rendering of real serializer output (DRF stdlib vs FastJSONRenderer)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=20, help='Rows per response (one page)')
+        parser.add_argument('--iterations', type=int, default=500)
+        parser.add_argument('--content-size', type=int, default=8000, help='Characters of Thought.content')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        request = APIRequestFactory().get('/')
+        context = {'request': request}
+        payloads = {
+            'thoughts': ThoughtSerializer(self.thoughts(rows, options['content_size']), many=True, context=context).data,
+            'products': ProductSerializer(self.products(rows), many=True, context=context).data,
+            'orders': OrderSerializer(self.orders(rows), many=True, context=context).data,
+        }
+
+        self.stdout.write(f"orjson: {'installed' if orjson else 'not installed (stdlib fallback)'}")
+        self.stdout.write(f"{rows} rows per response, {options['iterations']} iterations\n")
+        self.stdout.write(f"{'payload':<10} {'renderer':<10} {'bytes':>9} {'µs/resp':>10} {'peak alloc KiB':>15}")
+
+        for name, data in payloads.items():
+            baseline = JSONRenderer().render(data)
+            if FastJSONRenderer().render(data) != baseline:
+                self.stderr.write(self.style.WARNING(f'{name}: fast renderer output differs from DRF'))
+            for label, renderer in (('drf', JSONRenderer()), ('fast', FastJSONRenderer())):
+                micros = self.time_render(renderer, data, options['iterations'])
+                peak = self.peak_allocation(renderer, data)
+                self.stdout.write(
+                    f"{name:<10} {label:<10} {len(baseline):>9} {micros:>10.1f} {peak / 1024:>15.1f}"
+                )
+
+    def time_render(self, renderer, data, iterations):
+        renderer.render(data)
+        started = time.perf_counter()
+        for _ in range(iterations):
+            renderer.render(data)
+        return (time.perf_counter() - started) / iterations * 1_000_000
+
+    def peak_allocation(self, renderer, data):
+        """Peak bytes allocated while rendering one response"""
+        tracemalloc.start()
+        renderer.render(data)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak
+
+    def thoughts(self, rows, content_size):
+        rng = random.Random(0)
+        words = ['django', 'react', 'performance', 'ghana', 'learning', 'café', 'naïve', 'code']
+        content = ' '.join(rng.choice(words) for _ in range(content_size // 7))[:content_size]
+        now = timezone.now()
+        return [
+            Thought(id=i, title=f'Thought {i}', snippet=content[:200], content=content,
+                    date=date.today() - timedelta(days=i), tags=['python', 'web'],
+                    created_at=now, updated_at=now)
+            for i in range(1, rows + 1)
+        ]
+
+    def products(self, rows):
+        now = timezone.now()
+        return [
+            Product(id=i, title=f'Product {i}', description='A useful product. ' * 20,
+                    price=Decimal('199.99') + i, category='digital', stock=i,
+                    images=[f'https://example.com/{i}.jpg'], created_at=now, updated_at=now)
+            for i in range(1, rows + 1)
+        ]
+
+    def orders(self, rows):
+        now = timezone.now()
+        items = [{'product_id': n, 'product_title': f'Product {n}', 'product_price': 19.99, 'quantity': 2}
+                 for n in range(5)]
+        return [
+            Order(id=i, user_id=1, items=items, subtotal=Decimal('199.90'), tax=Decimal('0.00'),
+                  shipping=Decimal('15.00'), total=Decimal('214.90'), payment_reference=f'ORD-{i}',
+                  shipping_address={'city': 'Accra', 'country': 'GH'}, created_at=now, updated_at=now)
+            for i in range(1, rows + 1)
+        ]
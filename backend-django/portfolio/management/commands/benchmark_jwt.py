@@ -0,0 +1,104 @@
+import json
+import os
+import platform
+import secrets
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import cryptography
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+from django.core.management.base import BaseCommand
+
+# (label, algorithm, RSA key size)
+ALGORITHMS = [
+    ('HS256', 'HS256', None),
+    ('RS256-2048', 'RS256', 2048),
+    ('RS256-3072', 'RS256', 3072),
+    ('EdDSA', 'EdDSA', None),
+]
+
+
+def rate(fn, duration):
+    """Calls per second of ``fn`` over about ``duration`` seconds"""
+    fn()
+    calls, started = 0, time.perf_counter()
+    deadline = started + duration
+    while True:
+        for _ in range(20):
+            fn()
+        calls += 20
+        now = time.perf_counter()
+        if now >= deadline:
+            return calls / (now - started)
+
+
+def keys_for(algorithm, bits):
+    """(signing key, parsed verification key, verification key as PEM, private key as PEM)"""
+    if algorithm == 'HS256':
+        secret = secrets.token_urlsafe(32)
+        return secret, secret, secret, None
+    private_key = rsa.generate_private_key(65537, bits) if algorithm == 'RS256' else ed25519.Ed25519PrivateKey.generate()
+    public_key = private_key.public_key()
+    pem = public_key.public_bytes(serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    return private_key, public_key, pem, private_pem
+
+
+class Command(BaseCommand):
+    help = 'Measure JWT sign and verify operations per second for HS256, RS256 and EdDSA, with and without parsed keys'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=1.0, help='Seconds per measurement')
+        parser.add_argument('--only', nargs='+', choices=[label for label, _, _ in ALGORITHMS])
+        parser.add_argument('--json', dest='json_output', default=None, help='Also write the results to a JSON file')
+
+    def handle(self, *args, **options):
+        # Shaped like an access token with claims-first on
+        payload = {
+            'user_id': 12345, 'exp': datetime.now(timezone.utc) + timedelta(hours=1), 'role': 'student',
+            'name': 'Benchmark User', 'email': 'benchmark@bench.example.test', 'email_verified': True, 'ver': 3,
+        }
+        results = {}
+        self.stdout.write(
+            f'{"algorithm":<12} {"sign/s":>10} {"verify/s":>10} {"verify PEM/s":>13} {"load key/s":>11} {"token B":>8}'
+        )
+        for label, algorithm, bits in ALGORITHMS:
+            if options['only'] and label not in options['only']:
+                continue
+            signing_key, verify_key, verify_pem, private_pem = keys_for(algorithm, bits)
+            headers = None if algorithm == 'HS256' else {'kid': 'benchmark'}
+            token = jwt.encode(payload, signing_key, algorithm=algorithm, headers=headers)
+            result = {
+                'sign_per_s': rate(lambda: jwt.encode(payload, signing_key, algorithm=algorithm, headers=headers),
+                                   options['duration']),
+                'verify_per_s': rate(lambda: jwt.decode(token, verify_key, algorithms=[algorithm]), options['duration']),
+                # What verification costs when the key is parsed from PEM for every token
+                'verify_pem_per_s': rate(lambda: jwt.decode(token, verify_pem, algorithms=[algorithm]),
+                                         options['duration']),
+                # Loading a key file (what the key ring does once per process and key)
+                'load_key_per_s': rate(lambda: serialization.load_pem_private_key(private_pem, None), options['duration'])
+                if private_pem else None,
+                'token_bytes': len(token),
+            }
+            results[label] = {key: value if value is None else round(value) for key, value in result.items()}
+            self.stdout.write(
+                f'{label:<12} {result["sign_per_s"]:>10.0f} {result["verify_per_s"]:>10.0f} '
+                f'{result["verify_pem_per_s"]:>13.0f} {results[label]["load_key_per_s"] or "-":>11} {result["token_bytes"]:>8}'
+            )
+
+        if options['json_output']:
+            Path(options['json_output']).write_text(json.dumps({
+                'python': sys.version.split()[0],
+                'machine': platform.machine(),
+                'cpus': os.cpu_count(),
+                'pyjwt': jwt.__version__,
+                'cryptography': cryptography.__version__,
+                'duration_s': options['duration'],
+                'results': results,
+            }, indent=2) + '\n')
@@ -0,0 +1,65 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory
+
+from portfolio.models import Project
+from portfolio.serializers import ProjectSerializer
+
+
+class MediaURLSerializer(ProjectSerializer):
+    class Meta(ProjectSerializer.Meta):
+        fields = ['id', 'featured_image_url']
+
+
+class BuildAbsoluteURISerializer(MediaURLSerializer):
+    """The previous per-row implementation, kept for comparison"""
+    featured_image_url = serializers.SerializerMethodField()
+
+    def get_featured_image_url(self, obj):
+        if obj.featured_image:
+            request = self.context.get('request')
+            if request:
+                return request.build_absolute_uri(obj.featured_image.url)
+            return obj.featured_image.url
+        return None
+
+
+class Command(BaseCommand):
+    help = 'Benchmark media URL building while serializing projects (id + featured_image_url only)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        projects = [
+            Project(id=i, title=f'Project {i}', description='Description', featured_image=f'projects/{i}/cover image {i}.jpg',
+                    technologies=['React', 'Django'], created_at=now, updated_at=now)
+            for i in range(1, options['rows'] + 1)
+        ]
+
+        results = {}
+        for label, serializer_class in (('build_absolute_uri', BuildAbsoluteURISerializer),
+                                        ('MediaURLField', MediaURLSerializer)):
+            best = None
+            for _ in range(options['repeat']):
+                # A fresh request each run so per-request caching is included in the timing
+                run_request = APIRequestFactory().get('/api/portfolio/projects/', HTTP_HOST='localhost:8000')
+                started = time.perf_counter()
+                data = serializer_class(projects, many=True, context={'request': run_request}).data
+                elapsed = time.perf_counter() - started
+                best = elapsed if best is None else min(best, elapsed)
+            results[label] = (best, [row['featured_image_url'] for row in data])
+
+        old_time, old_urls = results['build_absolute_uri']
+        new_time, new_urls = results['MediaURLField']
+        if old_urls != new_urls:
+            self.stderr.write(self.style.ERROR('URL mismatch between implementations'))
+        self.stdout.write(f"{options['rows']} rows, e.g. {new_urls[0]}")
+        for label, (elapsed, _) in results.items():
+            self.stdout.write(f"{label:<20} {elapsed * 1000:>9.1f} ms  {options['rows'] / elapsed:>10.0f} rows/s")
+        self.stdout.write(f"speedup: {old_time / new_time:.2f}x")
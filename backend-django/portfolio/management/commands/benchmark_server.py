@@ -0,0 +1,165 @@
+import http.client
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Anonymous endpoints each worker serves before its memory is measured
+WARMUP_PATHS = [
+    '/api/health/', '/api/home/', '/api/portfolio/projects/', '/api/portfolio/thoughts/',
+    '/api/portfolio/work/', '/api/shop/products/', '/api/learn/courses/',
+]
+
+
+def memory(pid):
+    """RSS, PSS and USS (private memory) of one process in MB, from /proc"""
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            key, _, rest = line.partition(':')
+            if rest.strip().endswith('kB'):
+                values[key] = int(rest.split()[0])
+    mb = lambda kib: round(kib / 1024, 1)
+    return {
+        'rss_mb': mb(values['Rss']),
+        'pss_mb': mb(values['Pss']),
+        'uss_mb': mb(values['Private_Clean'] + values['Private_Dirty']),
+    }
+
+
+def children(pid):
+    pids = []
+    for entry in os.listdir('/proc'):
+        if entry.isdigit():
+            try:
+                stat = Path(f'/proc/{entry}/stat').read_text()
+            except OSError:
+                continue
+            # The command name may contain spaces; fields after it are fixed
+            if int(stat.rsplit(')', 1)[1].split()[1]) == pid:
+                pids.append(int(entry))
+    return pids
+
+
+def get(port, path):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    try:
+        conn.request('GET', path, headers={'Host': 'localhost'})
+        response = conn.getresponse()
+        response.read()
+        return response.status
+    finally:
+        conn.close()
+
+
+class Command(BaseCommand):
+    help = 'Measure gunicorn startup time and memory per worker, with and without preloading the app'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+        parser.add_argument('--modes', nargs='+', choices=['preload', 'no-preload'], default=['preload', 'no-preload'])
+        parser.add_argument('--asgi', action='store_true', help='Uvicorn workers instead of gthread')
+        parser.add_argument('--requests', type=int, default=100, help='Warm-up requests per worker before measuring')
+        parser.add_argument('--port', type=int, default=8799)
+        parser.add_argument('--json', dest='json_output', default=None, help='Also write the results to a JSON file')
+
+    def handle(self, *args, **options):
+        if not Path('/proc/self/smaps_rollup').exists():
+            raise CommandError('Needs Linux /proc/<pid>/smaps_rollup')
+
+        results = []
+        self.stdout.write(
+            f'{"mode":<11} {"workers":>7} {"first ms":>9} {"all ms":>8} {"master MB":>10} '
+            f'{"worker RSS":>11} {"PSS":>7} {"USS":>7} {"total PSS":>10}'
+        )
+        for mode in options['modes']:
+            for workers in options['workers']:
+                result = self.run(mode, workers, options)
+                results.append(result)
+                self.stdout.write(
+                    f'{mode:<11} {workers:>7} {result["first_response_ms"]:>9.0f} {result["all_workers_ready_ms"]:>8.0f} '
+                    f'{result["master"]["rss_mb"]:>10.1f} {result["worker_avg"]["rss_mb"]:>11.1f} '
+                    f'{result["worker_avg"]["pss_mb"]:>7.1f} {result["worker_avg"]["uss_mb"]:>7.1f} '
+                    f'{result["total_pss_mb"]:>10.1f}'
+                )
+
+        if options['json_output']:
+            Path(options['json_output']).write_text(json.dumps({
+                'python': sys.version.split()[0],
+                'cpus': os.cpu_count(),
+                'asgi': options['asgi'],
+                'requests_per_worker': options['requests'],
+                'results': results,
+            }, indent=2) + '\n')
+
+    def run(self, mode, workers, options):
+        port = options['port']
+        env = {
+            **os.environ,
+            'WEB_CONCURRENCY': str(workers),
+            'SERVER_PRELOAD': str(mode == 'preload'),
+            'SERVER_ASGI': str(options['asgi']),
+            'SERVER_BIND': f'127.0.0.1:{port}',
+            'SERVER_MAX_REQUESTS': '0',  # No recycling while measuring
+        }
+        log = tempfile.TemporaryFile()
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn'], cwd=settings.BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=log
+        )
+        try:
+            first = self.wait(process, port, started)
+            # Every worker is ready once each has served a request (access log lines carry the pid)
+            served = set()
+            while len(served) < workers:
+                if time.perf_counter() - started > 120:
+                    raise CommandError(f'Only {len(served)} of {workers} workers answered within 120s')
+                get(port, '/api/health/live/')
+                log.seek(0)
+                for line in log.read().decode(errors='replace').splitlines():
+                    if '"portfolio_backend.access"' in line:
+                        served.add(json.loads(line)['pid'])
+            all_ready = time.perf_counter() - started
+
+            for index in range(options['requests'] * workers):
+                get(port, WARMUP_PATHS[index % len(WARMUP_PATHS)])
+            worker_memory = [memory(pid) for pid in children(process.pid)]
+            average = {
+                key: round(sum(m[key] for m in worker_memory) / len(worker_memory), 1) for key in worker_memory[0]
+            }
+            master = memory(process.pid)
+            return {
+                'mode': mode,
+                'workers': workers,
+                'first_response_ms': round(first * 1000),
+                'all_workers_ready_ms': round(all_ready * 1000),
+                'master': master,
+                'worker_avg': average,
+                'total_pss_mb': round(master['pss_mb'] + sum(m['pss_mb'] for m in worker_memory), 1),
+            }
+        finally:
+            process.send_signal(signal.SIGTERM)
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            log.close()
+
+    def wait(self, process, port, started):
+        """Seconds until the first worker answers"""
+        while time.perf_counter() - started < 120:
+            if process.poll() is not None:
+                raise CommandError(f'gunicorn exited with status {process.returncode}')
+            try:
+                if get(port, '/api/health/live/') == 200:
+                    return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.02)
+        raise CommandError('gunicorn did not answer within 120s')
@@ -0,0 +1,258 @@
+import random
+import time
+from decimal import Decimal
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from learn.models import Assignment, Course, Enrollment, Lesson, Submission, SubmissionComment
+from portfolio_backend.home import invalidate_home
+from portfolio_backend.response_cache import invalidate_models
+from shop.models import Cart, Order, Product
+
+User = get_user_model()
+
+# Generated rows are recognisable by these markers, which is what --flush deletes
+EMAIL_DOMAIN = 'load.example.test'
+PRODUCT_CATEGORY = 'load-test'
+
+WORDS = (
+    'async cache query index shard replica worker queue render stream batch token '
+    'schema model view router signal layout widget button canvas module python react django'
+).split()
+ORDER_STATUSES = [choice for choice, _ in Order.STATUS_CHOICES]
+ASSIGNMENT_TYPES = [choice for choice, _ in Assignment.TYPE_CHOICES]
+GENERATED_MODELS = (User, Product, Course, Lesson, Assignment, Enrollment, Submission, SubmissionComment, Order, Cart)
+
+
+class Command(BaseCommand):
+    help = 'Generate large, reproducible datasets with bulk inserts for scale and load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--instructors', type=int, default=10, help='Of --users, how many teach courses')
+        parser.add_argument('--products', type=int, default=200)
+        parser.add_argument('--courses', type=int, default=20)
+        parser.add_argument('--lessons-per-course', type=int, default=10)
+        parser.add_argument('--assignments-per-lesson', type=int, default=2)
+        parser.add_argument('--enrollments-per-user', type=int, default=3)
+        parser.add_argument('--submissions-per-enrollment', type=int, default=2)
+        parser.add_argument('--comments-per-submission', type=int, default=1)
+        parser.add_argument('--orders-per-user', type=int, default=2)
+        parser.add_argument('--cart-ratio', type=float, default=0.3, help='Fraction of users with a non-empty cart')
+        parser.add_argument('--chunk-size', type=int, default=5000, help='Rows per bulk insert and transaction')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--password', default='loadtest123', help='Password of every generated user')
+        parser.add_argument('--flush', action='store_true', help='Delete previously generated data first')
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.chunk_size = options['chunk_size']
+        started = time.perf_counter()
+
+        if options['instructors'] > options['users']:
+            raise CommandError('--instructors cannot exceed --users')
+        if options['courses'] > 0 and options['instructors'] < 1:
+            raise CommandError('--courses needs at least one of --instructors')
+
+        if options['flush']:
+            self.flush()
+        elif User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').exists():
+            raise CommandError('Generated data already exists, rerun with --flush to replace it')
+
+        user_ids = self.create_users(options['users'], options['instructors'], options['password'])
+        instructor_ids = user_ids[:options['instructors']]
+        product_ids, prices = self.create_products(options['products'])
+        course_ids = self.create_courses(options['courses'], instructor_ids)
+        lessons = self.create_lessons(course_ids, options['lessons_per_course'])
+        assignments = self.create_assignments(lessons, options['assignments_per_lesson'])
+        enrollments = self.create_enrollments(user_ids, course_ids, lessons, options['enrollments_per_user'])
+        submission_ids = self.create_submissions(enrollments, assignments, options['submissions_per_enrollment'])
+        self.create_comments(submission_ids, user_ids, options['comments_per_submission'])
+        self.create_orders(user_ids, product_ids, prices, options['orders_per_user'])
+        self.create_carts(user_ids, product_ids, prices, options['cart_ratio'])
+        # Bulk inserts send no signals, so cached pages would keep serving the old rows
+        invalidate_home()
+        invalidate_models(*GENERATED_MODELS)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated load data in {time.perf_counter() - started:.1f}s (seed {options["seed"]}, '
+            f'password "{options["password"]}")'
+        ))
+
+    def flush(self):
+        started = time.perf_counter()
+        # Cascades to courses, lessons, enrollments, submissions, comments, orders and carts
+        deleted, _ = User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').delete()
+        products, _ = Product.objects.filter(category=PRODUCT_CATEGORY).delete()
+        self.stdout.write(f'  flushed {deleted + products} rows in {time.perf_counter() - started:.1f}s')
+
+    def insert(self, model, rows, total):
+        """bulk_create ``rows`` (a generator) in chunks, one transaction per chunk"""
+        started = time.perf_counter()
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                break
+            with transaction.atomic():
+                model.objects.bulk_create(chunk, batch_size=self.chunk_size)
+        elapsed = time.perf_counter() - started
+        rate = total / elapsed if elapsed else 0
+        self.stdout.write(f'  {model._meta.verbose_name_plural:<20} {total:>10} rows {elapsed:>7.1f}s {rate:>10.0f} rows/s')
+
+    def text(self, words):
+        return ' '.join(self.rng.choices(WORDS, k=words))
+
+    def create_users(self, count, instructors, password):
+        # Hashing is deliberately slow; one hash is shared by every generated user
+        password_hash = make_password(password)
+        self.insert(User, (
+            User(
+                username=f'load{i}',
+                email=f'user{i}@{EMAIL_DOMAIN}',
+                display_name=f'Load User {i}',
+                password=password_hash,
+                role='instructor' if i < instructors else 'student',
+                email_verified=self.rng.random() < 0.8,
+            )
+            for i in range(count)
+        ), count)
+        return list(User.objects.filter(email__endswith=f'@{EMAIL_DOMAIN}').order_by('id').values_list('id', flat=True))
+
+    def create_products(self, count):
+        self.insert(Product, (
+            Product(
+                title=f'Load Product {i}',
+                description=self.text(30),
+                price=Decimal(self.rng.randint(100, 50000)) / 100,
+                category=PRODUCT_CATEGORY,
+                stock=self.rng.randint(0, 500),
+                featured=self.rng.random() < 0.05,
+            )
+            for i in range(count)
+        ), count)
+        rows = Product.objects.filter(category=PRODUCT_CATEGORY).order_by('id').values_list('id', 'price')
+        return [pk for pk, _ in rows], {pk: price for pk, price in rows}
+
+    def create_courses(self, count, instructor_ids):
+        self.insert(Course, (
+            Course(title=f'Load Course {i}', description=self.text(40), instructor_id=self.rng.choice(instructor_ids))
+            for i in range(count)
+        ), count)
+        return list(Course.objects.filter(instructor__email__endswith=f'@{EMAIL_DOMAIN}').order_by('id').values_list('id', flat=True))
+
+    def create_lessons(self, course_ids, per_course):
+        """{course_id: [lesson_id, ...]}"""
+        self.insert(Lesson, (
+            Lesson(course_id=course_id, title=f'Lesson {index + 1}', content=self.text(200), order_index=index)
+            for course_id in course_ids for index in range(per_course)
+        ), len(course_ids) * per_course)
+        lessons = {course_id: [] for course_id in course_ids}
+        rows = Lesson.objects.filter(course_id__in=course_ids).order_by('id').values_list('course_id', 'id')
+        for course_id, lesson_id in rows.iterator(chunk_size=self.chunk_size):
+            lessons[course_id].append(lesson_id)
+        return lessons
+
+    def create_assignments(self, lessons, per_lesson):
+        """{course_id: [assignment_id, ...]}"""
+        lesson_ids = [lesson_id for ids in lessons.values() for lesson_id in ids]
+        self.insert(Assignment, (
+            Assignment(
+                lesson_id=lesson_id,
+                title=f'Assignment {index + 1}',
+                description=self.text(40),
+                type=self.rng.choice(ASSIGNMENT_TYPES),
+                required=self.rng.random() < 0.7,
+            )
+            for lesson_id in lesson_ids for index in range(per_lesson)
+        ), len(lesson_ids) * per_lesson)
+        assignments = {course_id: [] for course_id in lessons}
+        rows = Assignment.objects.filter(lesson__course_id__in=list(lessons)).order_by('id').values_list('lesson__course_id', 'id')
+        for course_id, assignment_id in rows.iterator(chunk_size=self.chunk_size):
+            assignments[course_id].append(assignment_id)
+        return assignments
+
+    def create_enrollments(self, user_ids, course_ids, lessons, per_user):
+        """[(user_id, course_id), ...] in insertion order"""
+        per_user = min(per_user, len(course_ids))
+        pairs = [(user_id, course_id) for user_id in user_ids for course_id in self.rng.sample(course_ids, per_user)]
+
+        def completed(course_id):
+            course_lessons = lessons[course_id]
+            return course_lessons[:self.rng.randint(0, len(course_lessons))]
+
+        self.insert(Enrollment, (
+            Enrollment(user_id=user_id, course_id=course_id, completed_lessons=completed(course_id))
+            for user_id, course_id in pairs
+        ), len(pairs))
+        return pairs
+
+    def create_submissions(self, enrollments, assignments, per_enrollment):
+        plan = []
+        for user_id, course_id in enrollments:
+            course_assignments = assignments[course_id]
+            for assignment_id in self.rng.sample(course_assignments, min(per_enrollment, len(course_assignments))):
+                plan.append((user_id, assignment_id))
+        self.insert(Submission, (
+            Submission(
+                assignment_id=assignment_id,
+                student_id=user_id,
+                github_repo_url=f'https://github.com/load{user_id}/assignment-{assignment_id}',
+                notes=self.text(15),
+                is_public=self.rng.random() < 0.6,
+            )
+            for user_id, assignment_id in plan
+        ), len(plan))
+        return list(
+            Submission.objects.filter(student__email__endswith=f'@{EMAIL_DOMAIN}').order_by('id').values_list('id', flat=True)
+        )
+
+    def create_comments(self, submission_ids, user_ids, per_submission):
+        total = len(submission_ids) * per_submission
+        self.insert(SubmissionComment, (
+            SubmissionComment(submission_id=submission_id, user_id=self.rng.choice(user_ids), content=self.text(20))
+            for submission_id in submission_ids for _ in range(per_submission)
+        ), total)
+
+    def line_items(self, product_ids, prices):
+        items = []
+        for product_id in self.rng.sample(product_ids, min(self.rng.randint(1, 4), len(product_ids))):
+            items.append({
+                'product_id': product_id,
+                'product_title': f'Load Product {product_id}',
+                'product_price': float(prices[product_id]),
+                'quantity': self.rng.randint(1, 3),
+            })
+        return items
+
+    def create_orders(self, user_ids, product_ids, prices, per_user):
+        if not product_ids:
+            return
+
+        def order(user_id):
+            items = self.line_items(product_ids, prices)
+            subtotal = sum(Decimal(str(item['product_price'])) * item['quantity'] for item in items)
+            shipping = Decimal('15.00')
+            return Order(
+                user_id=user_id,
+                items=items,
+                subtotal=subtotal,
+                shipping=shipping,
+                total=subtotal + shipping,
+                status=self.rng.choice(ORDER_STATUSES),
+                shipping_address={'city': 'Accra', 'country': 'GH'},
+            )
+
+        self.insert(Order, (order(user_id) for user_id in user_ids for _ in range(per_user)), len(user_ids) * per_user)
+
+    def create_carts(self, user_ids, product_ids, prices, ratio):
+        if not product_ids:
+            return
+        cart_users = [user_id for user_id in user_ids if self.rng.random() < ratio]
+        self.insert(Cart, (
+            Cart(user_id=user_id, items=self.line_items(product_ids, prices)) for user_id in cart_users
+        ), len(cart_users))
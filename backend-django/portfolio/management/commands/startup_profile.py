@@ -0,0 +1,131 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Run in a fresh interpreter: boot Django the way a worker does, then serve one request
+BOOT_SCRIPT = '''
+import json, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+setup = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+from django.urls import get_resolver
+application = get_wsgi_application()
+get_resolver().url_patterns
+loaded = time.perf_counter()
+environ = {
+    'REQUEST_METHOD': 'GET', 'PATH_INFO': sys.argv[1], 'QUERY_STRING': '', 'SERVER_NAME': 'localhost',
+    'SERVER_PORT': '80', 'HTTP_HOST': 'localhost', 'wsgi.url_scheme': 'http', 'wsgi.input': sys.stdin.buffer,
+    'wsgi.errors': sys.stderr,
+}
+statuses = []
+body = b''.join(application(environ, lambda status, headers, exc_info=None: statuses.append(status)))
+finished = time.perf_counter()
+print(json.dumps({
+    'status': statuses[0],
+    'setup_ms': (setup - started) * 1000,
+    'app_ms': (loaded - setup) * 1000,
+    'first_request_ms': (finished - loaded) * 1000,
+    'modules': len(sys.modules),
+}))
+'''
+
+
+def parse_importtime(text):
+    """[(module, self_us, cumulative_us, depth)] from ``-X importtime`` output"""
+    rows = []
+    for line in text.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((name.strip(), int(self_us), int(cumulative_us), (len(name) - len(name.lstrip())) // 2))
+    return rows
+
+
+class Command(BaseCommand):
+    help = 'Profile worker cold start: per-module import time (-X importtime) and time to the first request'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/health/live/', help='First request to serve')
+        parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters to start; medians are reported')
+        parser.add_argument('--top', type=int, default=25, help='Modules and packages to list')
+        parser.add_argument('--json', dest='json_output', default=None, help='Also write the report to a JSON file')
+
+    def handle(self, *args, **options):
+        runs = []
+        for _ in range(options['runs']):
+            runs.append(self.boot(options['path']))
+
+        timings = {
+            key: round(statistics.median(run[key] for run in runs), 1)
+            for key in ('total_ms', 'setup_ms', 'app_ms', 'first_request_ms', 'import_ms')
+        }
+        # Module times vary little between runs; list them from the run with the median total
+        median_run = sorted(runs, key=lambda run: run['total_ms'])[len(runs) // 2]
+        rows = median_run['imports']
+
+        packages = defaultdict(int)
+        for name, self_us, _, _ in rows:
+            packages[name.split('.')[0]] += self_us
+        top_packages = sorted(packages.items(), key=lambda item: -item[1])[:options['top']]
+        top_modules = sorted(rows, key=lambda row: -row[2])
+        # Only modules imported at top level of their package chain are informative; skip ones nested in a listed one
+        listed = []
+        for name, self_us, cumulative_us, depth in top_modules:
+            if any(name.startswith(f'{parent}.') for parent, *_ in listed):
+                continue
+            listed.append((name, self_us, cumulative_us, depth))
+            if len(listed) == options['top']:
+                break
+
+        self.stdout.write(f'Settings: {settings.SETTINGS_MODULE}, {len(runs)} runs, first request GET {options["path"]} '
+                          f'-> {median_run["status"]}')
+        self.stdout.write(
+            f'  time to first request {timings["total_ms"]:>8.1f} ms (process start to response, median)\n'
+            f'    django.setup()      {timings["setup_ms"]:>8.1f} ms\n'
+            f'    WSGI app + URLconf  {timings["app_ms"]:>8.1f} ms\n'
+            f'    first request       {timings["first_request_ms"]:>8.1f} ms\n'
+            f'  imports (cumulative)  {timings["import_ms"]:>8.1f} ms across {median_run["modules"]} modules'
+        )
+        self.stdout.write('\nPackages by own import time:')
+        for name, self_us in top_packages:
+            self.stdout.write(f'  {self_us / 1000:>8.1f} ms  {name}')
+        self.stdout.write('\nSlowest imports (cumulative, including what they import):')
+        for name, self_us, cumulative_us, _ in listed:
+            self.stdout.write(f'  {cumulative_us / 1000:>8.1f} ms  {name}')
+
+        if options['json_output']:
+            Path(options['json_output']).write_text(json.dumps({
+                'settings': settings.SETTINGS_MODULE,
+                'runs': len(runs),
+                'timings_ms': timings,
+                'packages_ms': {name: round(self_us / 1000, 2) for name, self_us in top_packages},
+                'modules_ms': {name: round(cumulative_us / 1000, 2) for name, _, cumulative_us, _ in listed},
+            }, indent=2) + '\n')
+
+    def boot(self, path):
+        started = time.perf_counter()
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', BOOT_SCRIPT, path],
+            cwd=settings.BASE_DIR, env=os.environ, stdin=subprocess.DEVNULL, capture_output=True, text=True,
+        )
+        total_ms = (time.perf_counter() - started) * 1000
+        if process.returncode:
+            raise CommandError(f'Boot failed:\n{process.stderr[-2000:]}')
+        result = json.loads(process.stdout.strip().splitlines()[-1])
+        imports = parse_importtime(process.stderr)
+        result.update(
+            total_ms=total_ms,
+            imports=imports,
+            import_ms=sum(self_us for _, self_us, _, _ in imports) / 1000,
+        )
+        return result
@@ -0,0 +1,41 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+
+class Command(BaseCommand):
+    help = 'Copy the SQLite primary database onto every SQLite replica, once or every --interval seconds'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=0, help='Keep copying with this delay (simulates replication lag)')
+
+    def handle(self, *args, **options):
+        databases = settings.DATABASES
+        if databases[DEFAULT_DB_ALIAS]['ENGINE'] != 'django.db.backends.sqlite3':
+            raise CommandError('The primary database is not SQLite; use the database\'s own replication')
+        replicas = [
+            alias for alias in settings.DATABASE_REPLICAS
+            if databases[alias]['ENGINE'] == 'django.db.backends.sqlite3'
+        ]
+        if not replicas:
+            raise CommandError('No SQLite replicas configured; set DATABASE_REPLICA_URLS')
+
+        while True:
+            started = time.perf_counter()
+            source = sqlite3.connect(databases[DEFAULT_DB_ALIAS]['NAME'])
+            try:
+                for alias in replicas:
+                    target = sqlite3.connect(databases[alias]['NAME'])
+                    try:
+                        source.backup(target)  # Consistent snapshot, even while the primary is written
+                    finally:
+                        target.close()
+            finally:
+                source.close()
+            self.stdout.write(f'Copied primary to {", ".join(replicas)} in {(time.perf_counter() - started) * 1000:.0f} ms')
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,126 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.urls import NoReverseMatch, reverse
+
+# Modules whose DefaultRouter (module attribute ``router``) is warmed
+ROUTER_MODULES = ['portfolio.urls', 'shop.urls', 'learn.urls']
+
+
+class Command(BaseCommand):
+    help = 'Render the common list/detail/featured pages of cached router routes in-process to fill the response cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default=None,
+                            help='Host the entries are cached for, e.g. localhost:8000 (default: first ALLOWED_HOSTS entry)')
+        parser.add_argument('--secure', action='store_true', help='Render as https requests')
+        parser.add_argument('--user', default=None,
+                            help='Email of the user to render as, for views cached per authentication scope')
+        parser.add_argument('--details', type=int, default=5, help='Most recent objects per route to render in detail')
+        parser.add_argument('--query', action='append', default=[],
+                            help='Extra query string rendered for every list route (repeatable), e.g. "limit=8&page=1&featured=true"')
+        parser.add_argument('--all', action='store_true',
+                            help='Also render routes without a cache policy (timing only)')
+        parser.add_argument('--workers', type=int, default=4)
+
+    def handle(self, *args, **options):
+        host = options['host'] or self.default_host()
+        cookies = self.login_cookies(options['user']) if options['user'] else None
+        pages = self.collect_pages(options['details'], options['query'], options['all'])
+
+        backend = settings.CACHES['default']['BACKEND']
+        if backend.endswith('LocMemCache'):
+            self.stdout.write(self.style.WARNING(
+                'The cache is in-process memory, so entries warmed here are not seen by the server; '
+                'set REDIS_URL to share them. Timings below are still valid.'
+            ))
+        elif not settings.RESPONSE_CACHE_ENABLED:
+            self.stdout.write(self.style.WARNING('RESPONSE_CACHE_ENABLED is off, only timing pages'))
+
+        def render(page):
+            route, path, cached = page
+            client = Client(HTTP_HOST=host)
+            if cookies:
+                client.cookies.update(cookies)
+            try:
+                started = time.perf_counter()
+                response = client.get(path, secure=options['secure'])
+                elapsed = (time.perf_counter() - started) * 1000
+            finally:
+                connection.close()
+            return route, path, cached, response.status_code, elapsed, len(response.content)
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+            results = list(pool.map(render, pages))
+        total = (time.perf_counter() - started) * 1000
+
+        self.stdout.write(f'{"route":<28} {"status":>6} {"ms":>9} {"bytes":>9}  cache  path')
+        failures = 0
+        for route, path, cached, status_code, elapsed, size in results:
+            failures += status_code != 200
+            line = f'{route:<28} {status_code:>6} {elapsed:>9.2f} {size:>9}  {"yes" if cached else "no ":<5}  {path}'
+            self.stdout.write(line if status_code == 200 else self.style.WARNING(line))
+
+        summary = f'Rendered {len(results)} pages for {host} in {total:.0f} ms ({options["workers"]} workers)'
+        if failures:
+            summary += f', {failures} not 200'
+        self.stdout.write(self.style.SUCCESS(summary))
+
+    def default_host(self):
+        for host in settings.ALLOWED_HOSTS:
+            if host != '*' and not host.startswith('.'):
+                return host
+        return 'localhost'
+
+    def login_cookies(self, email):
+        user = get_user_model().objects.filter(email=email).first()
+        if user is None:
+            raise CommandError(f'No user with email {email}')
+        client = Client()
+        client.force_login(user)
+        return client.cookies
+
+    def collect_pages(self, details, extra_queries, include_uncached):
+        """(route, path, has cache policy) for every page to render"""
+        pages = []
+        for module_name in ROUTER_MODULES:
+            router = import_module(module_name).router
+            for prefix, viewset, basename in router.registry:
+                cached = getattr(viewset, 'cache_policy', None) is not None
+                if not cached and not include_uncached:
+                    continue
+                try:
+                    list_path = reverse(f'{basename}-list')
+                except NoReverseMatch:
+                    continue
+
+                queries = ['']
+                if self.has_field(viewset.queryset.model, 'featured'):
+                    queries.append('featured=true')
+                queries.extend(extra_queries)
+                for query in queries:
+                    pages.append((basename, f'{list_path}?{query}' if query else list_path, cached))
+
+                if details and hasattr(viewset, 'retrieve'):
+                    lookup = viewset.lookup_url_kwarg or viewset.lookup_field
+                    values = viewset.queryset.model._default_manager.order_by('-pk').values_list(
+                        viewset.lookup_field, flat=True
+                    )[:details]
+                    for value in values:
+                        pages.append((basename, reverse(f'{basename}-detail', kwargs={lookup: value}), cached))
+        return pages
+
+    def has_field(self, model, name):
+        try:
+            model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return False
+        return True
@@ -1,47 +1,38 @@
 from rest_framework import serializers
+from portfolio_backend.fields import MediaURLField
+from portfolio_backend.fieldsets import SparseFieldsMixin
 from .models import Project, Thought, WorkExperience
 
-class ProjectSerializer(serializers.ModelSerializer):
-    featured_image_url = serializers.SerializerMethodField()
+class ProjectSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    featured_image_url = MediaURLField(source='featured_image')
     
     class Meta:
         model = Project
         fields = '__all__'
+
+class ProjectListSerializer(ProjectSerializer):
+    """Compact representation for project cards"""
     
-    def get_featured_image_url(self, obj):
-        if obj.featured_image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.featured_image.url)
-            return obj.featured_image.url
-        return None
+    class Meta(ProjectSerializer.Meta):
+        fields = ['id', 'title', 'description', 'featured_image_url', 'images', 'technologies',
+                  'github_url', 'live_url', 'featured', 'created_at']
 
-class ThoughtSerializer(serializers.ModelSerializer):
-    featured_image_url = serializers.SerializerMethodField()
+class ThoughtSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    featured_image_url = MediaURLField(source='featured_image')
     
     class Meta:
         model = Thought
         fields = '__all__'
+
+class ThoughtListSerializer(ThoughtSerializer):
+    """Compact representation for thought cards; full content comes from the detail endpoint"""
     
-    def get_featured_image_url(self, obj):
-        if obj.featured_image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.featured_image.url)
-            return obj.featured_image.url
-        return None
+    class Meta(ThoughtSerializer.Meta):
+        fields = ['id', 'title', 'snippet', 'featured_image_url', 'date', 'featured', 'tags', 'created_at']
 
-class WorkExperienceSerializer(serializers.ModelSerializer):
-    company_logo_url = serializers.SerializerMethodField()
+class WorkExperienceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    company_logo_url = MediaURLField(source='company_logo')
     
     class Meta:
         model = WorkExperience
         fields = '__all__'
-    
-    def get_company_logo_url(self, obj):
-        if obj.company_logo:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.company_logo.url)
-            return obj.company_logo.url
-        return None
\ No newline at end of file
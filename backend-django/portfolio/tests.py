@@ -0,0 +1,102 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from rest_framework import serializers
+
+from portfolio.models import Project, Thought
+from portfolio.serializers import ProjectListSerializer
+from portfolio.views import ProjectViewSet, ThoughtViewSet, WorkExperienceViewSet
+from portfolio_backend.fastpath import FieldPlan
+from portfolio_backend.testing import ENDPOINTS, create_sample_rows, render_detail, render_list
+from shop.views import ProductViewSet
+
+
+class ProjectWithMethodFieldSerializer(ProjectListSerializer):
+    title_length = serializers.SerializerMethodField()
+
+    class Meta(ProjectListSerializer.Meta):
+        fields = ProjectListSerializer.Meta.fields + ['title_length']
+
+    def get_title_length(self, project):
+        return len(project.title)
+
+
+class ProjectWithModelMethodSerializer(ProjectListSerializer):
+    label = serializers.CharField(source='__str__', read_only=True)
+
+    class Meta(ProjectListSerializer.Meta):
+        fields = ProjectListSerializer.Meta.fields + ['label']
+
+
+@override_settings(RESPONSE_CACHE_ENABLED=False)
+class FastListParityTests(TestCase):
+    """The ``.values()`` field plans must render exactly what the serializers do"""
+
+    @classmethod
+    def setUpTestData(cls):
+        create_sample_rows(50)
+
+    def render_both(self, render, *args):
+        """(regular response, fast response, whether a field plan rendered it)"""
+        regular = render(*args, fast=False)
+        with mock.patch.object(FieldPlan, 'render', autospec=True, side_effect=FieldPlan.render) as plan:
+            fast = render(*args, fast=True)
+        self.assertEqual(regular.status_code, fast.status_code)
+        self.assertEqual(regular.content, fast.content)
+        return regular, fast, plan.called
+
+    def test_lists_are_byte_identical(self):
+        for viewset, queries in ENDPOINTS:
+            for query in queries:
+                with self.subTest(endpoint=viewset.__name__, query=query):
+                    _, fast, planned = self.render_both(render_list, viewset, query)
+                    self.assertEqual(fast.status_code, 200)
+                    self.assertTrue(planned, 'fast path fell back to the serializer')
+
+    def test_filtered_and_paginated_lists(self):
+        featured = Project.objects.filter(featured=True).count()
+        featured_thoughts = Thought.objects.filter(featured=True).count()
+        cases = [
+            (ProjectViewSet, 'featured=true', featured, min(featured, 20)),
+            (ProjectViewSet, 'featured=false&page=2&fields=id,title', 50 - featured, 50 - featured - 20),
+            (ThoughtViewSet, 'featured=true&ordering=created_at', featured_thoughts, featured_thoughts),
+            (ProductViewSet, 'page=3', 50, 10),
+        ]
+        for viewset, query, count, rows in cases:
+            with self.subTest(endpoint=viewset.__name__, query=query):
+                _, fast, planned = self.render_both(render_list, viewset, query)
+                self.assertTrue(planned)
+                self.assertEqual(fast.data['count'], count)
+                self.assertEqual(len(fast.data['results']), rows)
+
+    def test_page_out_of_range(self):
+        regular, _, _ = self.render_both(render_list, ProductViewSet, 'page=99')
+        self.assertEqual(regular.status_code, 404)
+
+    def test_detail_uses_the_full_serializer(self):
+        for viewset in (ProjectViewSet, ThoughtViewSet, WorkExperienceViewSet, ProductViewSet):
+            pk = viewset.queryset.model.objects.order_by('id').values_list('id', flat=True)[1]
+            for query in ('', 'fields=id,title'):
+                with self.subTest(endpoint=viewset.__name__, query=query):
+                    _, fast, planned = self.render_both(render_detail, viewset, pk, query)
+                    self.assertEqual(fast.status_code, 200)
+                    self.assertFalse(planned)
+        thought = render_detail(ThoughtViewSet, Thought.objects.order_by('id')[0].pk)
+        self.assertEqual(thought.data['content'], Thought.objects.order_by('id')[0].content)
+
+    def test_unplannable_fields_fall_back_to_the_serializer(self):
+        for serializer_class in (ProjectWithMethodFieldSerializer, ProjectWithModelMethodSerializer):
+            with self.subTest(serializer=serializer_class.__name__):
+                self.assertIsNone(FieldPlan.compile(serializer_class()))
+                viewset = type('FallbackViewSet', (ProjectViewSet,), {'list_serializer_class': serializer_class})
+                _, fast, planned = self.render_both(render_list, viewset, '')
+                self.assertEqual(fast.status_code, 200)
+                self.assertFalse(planned)
+
+    def test_media_url_fields_are_planned(self):
+        plan = FieldPlan.compile(ProjectListSerializer())
+        self.assertIn(('featured_image_url', 'featured_image'), [(name, column) for name, column, _ in plan.entries])
+        _, fast, _ = self.render_both(render_list, ProjectViewSet, 'fields=id,featured_image_url')
+        urls = [row['featured_image_url'] for row in fast.data['results']]
+        self.assertIn(None, urls)
+        self.assertTrue(any(url and url.startswith('http://localhost:8000/') for url in urls))
@@ -2,12 +2,20 @@ from rest_framework import viewsets, filters
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
 from .models import Project, Thought, WorkExperience
-from .serializers import ProjectSerializer, ThoughtSerializer, WorkExperienceSerializer
+from portfolio_backend.fastpath import FastListMixin
+from portfolio_backend.fieldsets import SparseFieldsViewSetMixin
+from portfolio_backend.response_cache import CachePolicy
+from .serializers import (
+    ProjectSerializer, ProjectListSerializer, ThoughtSerializer, ThoughtListSerializer, WorkExperienceSerializer
+)
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(FastListMixin, SparseFieldsViewSetMixin, viewsets.ModelViewSet):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
+    list_serializer_class = ProjectListSerializer
+    fast_list = True
     permission_classes = [AllowAny]  # Allow anyone to read projects
+    cache_policy = CachePolicy(ttl=10 * 60, tags=['portfolio.Project'])
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['featured']
     search_fields = ['title', 'description']
@@ -19,10 +27,13 @@ class ProjectViewSet(viewsets.ModelViewSet):
         context['request'] = self.request
         return context
 
-class ThoughtViewSet(viewsets.ModelViewSet):
+class ThoughtViewSet(FastListMixin, SparseFieldsViewSetMixin, viewsets.ModelViewSet):
     queryset = Thought.objects.all()
     serializer_class = ThoughtSerializer
+    list_serializer_class = ThoughtListSerializer
+    fast_list = True
     permission_classes = [AllowAny]  # Allow anyone to read thoughts
+    cache_policy = CachePolicy(ttl=10 * 60, tags=['portfolio.Thought'])
     filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
     filterset_fields = ['featured']
     search_fields = ['title', 'snippet', 'content']
@@ -34,10 +45,12 @@ class ThoughtViewSet(viewsets.ModelViewSet):
         context['request'] = self.request
         return context
 
-class WorkExperienceViewSet(viewsets.ModelViewSet):
+class WorkExperienceViewSet(FastListMixin, SparseFieldsViewSetMixin, viewsets.ModelViewSet):
     queryset = WorkExperience.objects.all()
     serializer_class = WorkExperienceSerializer
+    fast_list = True
     permission_classes = [AllowAny]  # Allow anyone to read work experience
+    cache_policy = CachePolicy(ttl=10 * 60, tags=['portfolio.WorkExperience'])
     filter_backends = [filters.OrderingFilter]
     ordering_fields = ['display_order', 'start_date']
     ordering = ['display_order', '-start_date']
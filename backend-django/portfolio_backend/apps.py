@@ -0,0 +1,19 @@
+from django.apps import AppConfig
+
+
+class PortfolioBackendConfig(AppConfig):
+    """Project-level app for cross-app endpoints, signals and commands"""
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'portfolio_backend'
+    verbose_name = 'Portfolio Backend'
+
+    def ready(self):
+        from django.urls import get_resolver
+        from . import home, response_cache  # noqa: F401  (connect cache invalidation signals)
+        from .request_log import instrument_drf
+        
+        instrument_drf()
+        
+        # Import every view now so all cache policy tags are registered before
+        # the first model save, also in processes that never serve a request
+        get_resolver().url_patterns
@@ -0,0 +1,84 @@
+"""
+In-process dispatch of GET sub-requests for the batch endpoint.
+
+Sub-requests go straight to the resolved view; middleware is not run
+again, so only DRF views (which handle their own errors and auth) can be
+targets. The caller's already-authenticated user is forced onto every
+sub-request so the token is decoded and the user loaded only once.
+"""
+import json
+import logging
+import time
+from io import BytesIO
+from urllib.parse import urlsplit
+
+from django.core.handlers.wsgi import WSGIRequest
+from django.urls import Resolver404, resolve
+from rest_framework.views import APIView
+
+BATCH_URL_NAME = 'batch'
+
+logger = logging.getLogger(__name__)
+
+
+def build_subrequest(request, path, query_string):
+    """A fresh GET request that shares ``request``'s headers and identity"""
+    environ = dict(request.META)
+    environ.update({
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': path,
+        'QUERY_STRING': query_string,
+        'CONTENT_LENGTH': '0',
+        'wsgi.input': BytesIO(),
+    })
+    environ.pop('CONTENT_TYPE', None)
+    sub = WSGIRequest(environ)
+    sub._force_auth_user = request.user
+    sub._force_auth_token = request.auth
+    return sub
+
+
+def response_body(response):
+    """Response payload without a render/parse round trip for DRF responses"""
+    if hasattr(response, 'data'):
+        return response.data
+    if getattr(response, 'streaming', False):
+        return None
+    content = response.content
+    if response.get('Content-Type', '').startswith('application/json'):
+        return json.loads(content) if content else None
+    return content.decode(response.charset or 'utf-8')
+
+
+def dispatch(request, url):
+    """Run one GET sub-request; returns the result entry for the batch response"""
+    started = time.perf_counter()
+    parts = urlsplit(url)
+    try:
+        match = resolve(parts.path)
+    except Resolver404:
+        match = None
+    
+    if match is None:
+        status_code, body = 404, {'error': 'Not found'}
+    elif match.url_name == BATCH_URL_NAME:
+        status_code, body = 400, {'error': 'Batch requests cannot be nested'}
+    elif not issubclass(getattr(match.func, 'cls', type), APIView):
+        status_code, body = 400, {'error': 'Only API endpoints can be batched'}
+    else:
+        sub = build_subrequest(request, parts.path, parts.query)
+        sub.resolver_match = match
+        try:
+            response = match.func(sub, *match.args, **match.kwargs)
+            status_code, body = response.status_code, response_body(response)
+        except Exception:
+            # One failing sub-request must not fail the whole batch
+            logger.exception('Batch sub-request failed: GET %s', url)
+            status_code, body = 500, {'error': 'Internal server error'}
+    
+    return {
+        'path': url,
+        'status': status_code,
+        'body': body,
+        'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+    }
@@ -0,0 +1,177 @@
+"""
+Read replicas for safe requests.
+
+``ReplicaMiddleware`` lets GET/HEAD/OPTIONS requests read from the
+replicas in ``DATABASE_REPLICAS``; everything else (unsafe requests,
+management commands, the task worker) reads from ``default``.
+``ReplicaRouter`` hands each request a healthy replica, round-robin, and
+always writes to ``default``.
+
+Read-your-writes: once a request writes, it reads from ``default`` for the
+rest of the request, and the client is pinned to ``default`` for
+``REPLICA_PIN_SECONDS`` through a cookie and, for authenticated users, a
+cache marker (API clients rarely keep cookies).
+"""
+import contextvars
+import itertools
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.functional import empty
+
+logger = logging.getLogger(__name__)
+
+PIN_COOKIE = 'db_pin'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_state = contextvars.ContextVar('replica_state', default=None)
+
+
+def _pin_key(user_id):
+    return f'dbpin:user:{user_id}'
+
+
+class ReadState:
+    """Per-request routing decision"""
+
+    def __init__(self, request, use_primary):
+        self.request = request
+        self.use_primary = use_primary
+        self.wrote = False
+        self.user_checked = False
+        self.replica = None
+
+    def check_user_pin(self):
+        # The user is only known once DRF has authenticated the request
+        user = self.request.__dict__.get('user')
+        if user is None or getattr(user, '_wrapped', None) is empty:
+            return
+        self.user_checked = True
+        if user.is_authenticated and cache.get(_pin_key(user.pk)):
+            self.use_primary = True
+
+
+class ReplicaPool:
+    """Round-robin over replicas, skipping ones that failed a recent health check"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._aliases = None
+        self._cycle = None
+        self._status = {}  # alias -> (monotonic time of last check, healthy)
+
+    @property
+    def aliases(self):
+        if self._aliases is None:
+            self._aliases = list(settings.DATABASE_REPLICAS)
+            self._cycle = itertools.cycle(self._aliases)
+        return self._aliases
+
+    def choose(self):
+        for _ in range(len(self.aliases)):
+            with self._lock:
+                alias = next(self._cycle)
+            if self.is_healthy(alias):
+                return alias
+        return None
+
+    def is_healthy(self, alias):
+        checked_at, healthy = self._status.get(alias, (None, False))
+        if checked_at is not None and time.monotonic() - checked_at < settings.REPLICA_HEALTH_INTERVAL:
+            return healthy
+        healthy = self.check(alias)
+        self._status[alias] = (time.monotonic(), healthy)
+        return healthy
+
+    def check(self, alias):
+        connection = connections[alias]
+        try:
+            with connection.cursor() as cursor:
+                if connection.vendor == 'postgresql':
+                    cursor.execute(
+                        'SELECT COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)'
+                    )
+                    lag = cursor.fetchone()[0]
+                    if lag > settings.REPLICA_MAX_LAG:
+                        logger.warning("Replica %s is %.1fs behind, reading from primary", alias, lag)
+                        return False
+                else:
+                    cursor.execute('SELECT 1')
+            return True
+        except Exception:
+            logger.warning("Replica %s failed its health check", alias, exc_info=True)
+            connection.close()
+            return False
+
+
+pool = ReplicaPool()
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or state.use_primary:
+            return DEFAULT_DB_ALIAS
+        if not state.user_checked:
+            state.check_user_pin()
+            if state.use_primary:
+                return DEFAULT_DB_ALIAS
+        # Reads inside a transaction must see its writes
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        # One replica per request, so e.g. a page and its count agree
+        if state.replica is None:
+            state.replica = pool.choose() or DEFAULT_DB_ALIAS
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            # Also asked for get_or_create() and select_for_update() reads; only
+            # statements that really write pin the client (see record_writes)
+            state.use_primary = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # Every alias holds the same data
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS  # Replicas get their schema through replication
+
+
+class ReplicaMiddleware:
+    """Route safe requests' reads to replicas and pin clients to the primary after they write"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        use_primary = request.method not in SAFE_METHODS or PIN_COOKIE in request.COOKIES
+        state = ReadState(request, use_primary)
+
+        def record_writes(execute, sql, params, many, context):
+            if not sql.lstrip()[:6].upper() == 'SELECT':
+                state.wrote = True
+            return execute(sql, params, many, context)
+
+        token = _state.set(state)
+        try:
+            with connections[DEFAULT_DB_ALIAS].execute_wrapper(record_writes):
+                response = self.get_response(request)
+        finally:
+            _state.reset(token)
+
+        if state.wrote:
+            seconds = settings.REPLICA_PIN_SECONDS
+            response.set_cookie(PIN_COOKIE, '1', max_age=seconds, httponly=True, samesite='Lax')
+            user = request.__dict__.get('user')
+            if user is not None and getattr(user, '_wrapped', None) is not empty and user.is_authenticated:
+                cache.set(_pin_key(user.pk), 1, seconds)
+        return response
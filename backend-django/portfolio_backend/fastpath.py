@@ -0,0 +1,123 @@
+"""
+Fast serialization path for read-only list endpoints.
+
+Instead of instantiating model objects and walking a ``ModelSerializer``
+per row, rows are fetched with ``.values()`` and mapped to dicts by a
+field plan compiled once per serializer. Each plan entry reuses the
+serializer field's own ``to_representation`` so output is identical to the
+regular path; serializers with fields the plan can't express (method
+fields, nested serializers, dotted sources) transparently use the regular
+path instead.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.relations import PKOnlyObject, PrimaryKeyRelatedField
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from .fields import MediaURLField, media_url
+from .fieldsets import requested_fields
+
+
+class FieldPlan:
+    """Precompiled ``(field name, column, converter)`` entries for one serializer"""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.columns = [column for _, column, _ in entries]
+
+    @classmethod
+    def compile(cls, serializer):
+        """Build a plan for ``serializer``, or return None if it isn't supported"""
+        model = serializer.Meta.model
+        entries = []
+        for name, field in serializer.fields.items():
+            if len(field.source_attrs) != 1:
+                return None
+            try:
+                model_field = model._meta.get_field(field.source_attrs[0])
+            except FieldDoesNotExist:
+                return None
+            if not model_field.concrete or model_field.many_to_many:
+                return None
+
+            if isinstance(field, (MediaURLField, serializers.FileField)):
+                if isinstance(field, serializers.FileField) and not getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL):
+                    return None
+                converter = _file_url_converter(model_field.storage)
+            elif isinstance(field, PrimaryKeyRelatedField):
+                converter = _pk_converter(field)
+            elif isinstance(field, serializers.SerializerMethodField) or isinstance(field, serializers.BaseSerializer):
+                return None
+            elif model_field.is_relation:
+                return None
+            else:
+                converter = _plain_converter(field)
+            entries.append((name, model_field.attname, converter))
+
+        # Bound fields point back at the serializer's context; drop the request it holds
+        serializer._context = {}
+        return cls(entries)
+
+    def render(self, rows, request):
+        entries = self.entries
+        return [
+            {name: convert(row[column], request) for name, column, convert in entries}
+            for row in rows
+        ]
+
+
+def _plain_converter(field):
+    to_representation = field.to_representation
+
+    def convert(value, request):
+        return None if value is None else to_representation(value)
+    return convert
+
+
+def _pk_converter(field):
+    to_representation = field.to_representation
+
+    def convert(value, request):
+        return None if value is None else to_representation(PKOnlyObject(pk=value))
+    return convert
+
+
+def _file_url_converter(storage):
+    def convert(value, request):
+        return media_url(storage, value, request) if value else None
+    return convert
+
+
+# Keyed on client-supplied field names, so bounded to keep memory in check
+_plans = {}
+_PLAN_CACHE_SIZE = 256
+
+
+class FastListMixin:
+    """
+    Viewset mixin serving ``list`` through a compiled ``FieldPlan``.
+
+    Opt in per viewset with ``fast_list = True``; other actions are untouched.
+    """
+    fast_list = False
+
+    def get_fast_plan(self):
+        serializer_class = self.get_serializer_class()
+        key = (serializer_class, *requested_fields(self.request))
+        if key not in _plans:
+            if len(_plans) >= _PLAN_CACHE_SIZE:
+                _plans.clear()
+            _plans[key] = FieldPlan.compile(self.get_serializer())
+        return _plans[key]
+
+    def list(self, request, *args, **kwargs):
+        plan = self.get_fast_plan() if self.fast_list else None
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset()).values(*plan.columns)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(plan.render(page, request))
+        return Response(plan.render(queryset, request))
@@ -0,0 +1,70 @@
+"""
+Serializer fields shared across apps.
+"""
+from django.core.files.storage import FileSystemStorage
+from django.utils.encoding import filepath_to_uri
+from rest_framework import serializers
+
+# storage -> base URL, resolved once per process
+_storage_base_urls = {}
+
+
+def _storage_base_url(storage):
+    """
+    Base URL under which ``storage`` serves files, or None if its URLs
+    can't be built by concatenation (custom/remote storages).
+    """
+    try:
+        return _storage_base_urls[storage]
+    except KeyError:
+        pass
+    base_url = None
+    # __class__ also sees through default_storage's lazy wrapper
+    if isinstance(storage, FileSystemStorage) and storage.__class__.url is FileSystemStorage.url:
+        base_url = storage.base_url
+    _storage_base_urls[storage] = base_url
+    return base_url
+
+
+def _request_prefix(request):
+    """``scheme://host`` of the current request, computed once per request"""
+    prefix = getattr(request, '_media_url_prefix', None)
+    if prefix is None:
+        prefix = request.build_absolute_uri('/')[:-1]
+        request._media_url_prefix = prefix
+    return prefix
+
+
+def media_url(storage, name, request=None):
+    """
+    URL of the file ``name`` in ``storage``; absolute when a request is given.
+
+    Equivalent to ``request.build_absolute_uri(storage.url(name))`` but built
+    by string concatenation for local file storage.
+    """
+    base_url = _storage_base_url(storage)
+    if base_url is None or base_url.startswith('//'):
+        url = storage.url(name)
+        return request.build_absolute_uri(url) if request is not None else url
+
+    url = base_url + filepath_to_uri(name).lstrip('/')
+    if request is not None and url.startswith('/'):
+        return _request_prefix(request) + url
+    return url
+
+
+class MediaURLField(serializers.Field):
+    """
+    Read-only URL of a ``FileField``/``ImageField``, or None when empty.
+
+    Usage: ``featured_image_url = MediaURLField(source='featured_image')``
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        return media_url(value.storage, value.name, self.context.get('request'))
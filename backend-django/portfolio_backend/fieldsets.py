@@ -0,0 +1,104 @@
+"""
+Sparse fieldsets for read endpoints.
+
+``?fields=id,title`` returns only the listed fields and ``?omit=content``
+drops fields. Viewsets using ``SparseFieldsViewSetMixin`` also trim the SQL
+with ``.only()`` so unused columns (e.g. long text bodies) are never read,
+and can declare a compact ``list_serializer_class`` for list responses.
+"""
+from rest_framework.permissions import SAFE_METHODS
+
+
+def _param_set(request, name):
+    params = getattr(request, 'query_params', None)
+    if params is None or request.method not in SAFE_METHODS:
+        return frozenset()
+    value = params.get(name, '')
+    return frozenset(part.strip() for part in value.split(',') if part.strip())
+
+
+def requested_fields(request):
+    """Return ``(fields, omit)`` from the query string as frozensets"""
+    return _param_set(request, 'fields'), _param_set(request, 'omit')
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin honouring ``?fields=`` and ``?omit=`` on GET requests.
+
+    Fields computed from other columns (e.g. ``SerializerMethodField``) list
+    the model fields they read in ``Meta.field_sources`` so views can still
+    restrict the query with ``.only()``.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None:
+            return fields
+
+        only, omit = requested_fields(request)
+        if only:
+            fields = {name: field for name, field in fields.items() if name in only}
+        for name in omit:
+            fields.pop(name, None)
+        return fields
+
+
+def model_columns(serializer):
+    """
+    Model fields that ``serializer`` reads, or None when that can't be
+    determined safely (the query must then load every column).
+    """
+    model = serializer.Meta.model
+    concrete = {field.name for field in model._meta.concrete_fields}
+    field_sources = getattr(serializer.Meta, 'field_sources', {})
+    columns = {model._meta.pk.name}
+
+    for name, field in serializer.fields.items():
+        if name in field_sources:
+            columns.update(field_sources[name])
+        elif len(field.source_attrs) == 1 and field.source_attrs[0] in concrete:
+            columns.add(field.source_attrs[0])
+        else:
+            return None
+    return columns
+
+
+# Keyed on client-supplied field names, so bounded to keep memory in check
+_columns_cache = {}
+_COLUMNS_CACHE_SIZE = 256
+
+
+class SparseFieldsViewSetMixin:
+    """
+    Viewset mixin pairing with ``SparseFieldsMixin`` serializers.
+
+    ``list_serializer_class`` is used for list responses unless the client
+    asks for specific fields, in which case they are picked from the full
+    serializer.
+    """
+    list_serializer_class = None
+
+    def get_serializer_class(self):
+        if self.action == 'list' and self.list_serializer_class is not None:
+            only, _ = requested_fields(self.request)
+            if not only:
+                return self.list_serializer_class
+        return super().get_serializer_class()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method not in SAFE_METHODS:
+            return queryset
+
+        serializer_class = self.get_serializer_class()
+        key = (serializer_class, *requested_fields(self.request))
+        if key not in _columns_cache:
+            if len(_columns_cache) >= _COLUMNS_CACHE_SIZE:
+                _columns_cache.clear()
+            _columns_cache[key] = model_columns(self.get_serializer())
+        columns = _columns_cache[key]
+        if columns is None:
+            return queryset
+        return queryset.only(*columns)
@@ -0,0 +1,144 @@
+"""
+Readiness probes.
+
+``check_readiness`` runs every probe concurrently on a small thread pool.
+Each probe has ``HEALTH_PROBE_TIMEOUT`` seconds and the whole check
+``HEALTH_BUDGET`` seconds; a probe that has not answered by then is
+reported as timed out and left to finish in the background. Results are
+kept for ``HEALTH_CACHE_TTL`` seconds per process, so a load balancer
+polling every worker costs at most one round of probes per interval.
+
+Database and cache failures make the worker unavailable (503). Media and
+backlog problems only mark it degraded: taking every worker out of the
+load balancer would not drain a queue or free disk space.
+"""
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connection
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class ProbeWarning(Exception):
+    """The dependency answered, but not within its limits"""
+
+
+def check_database():
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+        cursor.fetchone()
+
+
+def check_cache():
+    key, token = f'health:{uuid.uuid4().hex}', uuid.uuid4().hex
+    cache.set(key, token, 10)
+    try:
+        if cache.get(key) != token:
+            raise RuntimeError('Value read back from the cache does not match')
+    finally:
+        cache.delete(key)
+
+
+def check_media():
+    os.makedirs(settings.MEDIA_ROOT, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=settings.MEDIA_ROOT, prefix='.health-') as f:
+        f.write(b'ok')
+        f.flush()
+
+
+def check_backlog():
+    """Tasks due to run and webhook events not yet applied to orders"""
+    from shop.models import PaymentEvent
+    from taskqueue.models import Task
+
+    now = timezone.now()
+    oldest_task = Task.objects.due(now).order_by('run_at').values_list('run_at', flat=True).first()
+    oldest_event = PaymentEvent.objects.filter(processed_at__isnull=True).order_by('id').values_list(
+        'received_at', flat=True
+    ).first()
+    details = {
+        'tasks_due': Task.objects.due(now).count(),
+        'oldest_task_age_s': round((now - oldest_task).total_seconds(), 1) if oldest_task else None,
+        'payment_events_pending': PaymentEvent.objects.filter(processed_at__isnull=True).count(),
+        'oldest_payment_event_age_s': round((now - oldest_event).total_seconds(), 1) if oldest_event else None,
+    }
+    ages = [age for age in (details['oldest_task_age_s'], details['oldest_payment_event_age_s']) if age is not None]
+    if ages and max(ages) > settings.HEALTH_BACKLOG_MAX_AGE:
+        raise ProbeWarning(details)
+    return details
+
+
+# name -> (probe, critical)
+PROBES = {
+    'database': (check_database, True),
+    'cache': (check_cache, True),
+    'media': (check_media, False),
+    'backlog': (check_backlog, False),
+}
+
+_executor = ThreadPoolExecutor(max_workers=len(PROBES) * 2, thread_name_prefix='health-probe')
+_lock = threading.Lock()
+_last = {'at': 0.0, 'result': None}
+
+
+def run_probe(probe):
+    started = time.perf_counter()
+    try:
+        details = probe() or {}
+        result = {'status': 'ok', **details}
+    except ProbeWarning as exc:
+        result = {'status': 'warning', **exc.args[0]}
+    except Exception as exc:
+        logger.warning("Readiness probe %s failed", probe.__name__, exc_info=True)
+        result = {'status': 'error', 'error': type(exc).__name__}  # No details on an unauthenticated endpoint
+    finally:
+        close_old_connections()  # Probe threads outlive requests, so nothing else closes them
+    result['duration_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    return result
+
+
+def run_probes():
+    started = time.perf_counter()
+    budget_deadline = started + settings.HEALTH_BUDGET
+    futures = {name: _executor.submit(run_probe, probe) for name, (probe, _) in PROBES.items()}
+
+    checks = {}
+    for name, future in futures.items():
+        deadline = min(started + settings.HEALTH_PROBE_TIMEOUT, budget_deadline)
+        try:
+            checks[name] = future.result(timeout=max(0, deadline - time.perf_counter()))
+        except TimeoutError:
+            checks[name] = {'status': 'timeout', 'duration_ms': round((time.perf_counter() - started) * 1000, 2)}
+
+    failed = [name for name, check in checks.items() if check['status'] not in ('ok', 'warning')]
+    if any(PROBES[name][1] for name in failed):
+        overall = 'unavailable'
+    elif failed or any(check['status'] == 'warning' for check in checks.values()):
+        overall = 'degraded'
+    else:
+        overall = 'ready'
+    return {
+        'status': overall,
+        'checked_at': timezone.now().isoformat(),
+        'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+        'checks': checks,
+    }
+
+
+def check_readiness():
+    """(result, cached); concurrent callers share one round of probes"""
+    with _lock:
+        if _last['result'] is not None and time.monotonic() - _last['at'] < settings.HEALTH_CACHE_TTL:
+            return _last['result'], True
+        result = run_probes()
+        _last.update(at=time.monotonic(), result=result)
+        return result, False
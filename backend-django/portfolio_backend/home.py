@@ -0,0 +1,84 @@
+"""
+Materialized homepage payload.
+
+The landing page needs featured projects, thoughts, work experience and
+products. The combined response is rendered once and kept in the cache;
+saving or deleting any contributing model drops it once the transaction
+commits, so the next request rebuilds it. Bulk operations (``update()``, ``bulk_create()``) send no
+signals, so call ``invalidate_home()`` after them.
+"""
+import uuid
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from portfolio.models import Project, Thought, WorkExperience
+from portfolio.serializers import ProjectListSerializer, ThoughtListSerializer, WorkExperienceSerializer
+from shop.models import Product
+from shop.serializers import ProductListSerializer
+from .fields import _request_prefix
+from .renderers import FastJSONRenderer
+
+HOME_CACHE_KEY = 'home:body'
+HOME_GENERATION_KEY = 'home:generation'
+HOME_CACHE_TIMEOUT = 24 * 60 * 60
+
+HOME_PROJECTS_LIMIT = 8
+HOME_THOUGHTS_LIMIT = 7
+HOME_PRODUCTS_LIMIT = 8
+
+HOME_MODELS = (Project, Thought, WorkExperience, Product)
+
+
+def build_home(request):
+    """Render the homepage payload for ``request`` to JSON bytes"""
+    context = {'request': request}
+    data = {
+        'projects': ProjectListSerializer(
+            Project.objects.filter(featured=True).order_by('-created_at')[:HOME_PROJECTS_LIMIT],
+            many=True, context=context).data,
+        'thoughts': ThoughtListSerializer(
+            Thought.objects.filter(featured=True).defer('content').order_by('-date')[:HOME_THOUGHTS_LIMIT],
+            many=True, context=context).data,
+        'work': WorkExperienceSerializer(WorkExperience.objects.all(), many=True, context=context).data,
+        'products': ProductListSerializer(
+            Product.objects.filter(featured=True).order_by('-created_at')[:HOME_PRODUCTS_LIMIT],
+            many=True, context=context).data,
+    }
+    return FastJSONRenderer().render(data)
+
+
+def get_home(request):
+    """
+    Cached homepage bytes for ``request``'s host; media URLs are absolute,
+    so one body is kept per scheme+host.
+    """
+    prefix = _request_prefix(request)
+    bodies = cache.get(HOME_CACHE_KEY) or {}
+    body = bodies.get(prefix)
+    if body is not None:
+        return body
+
+    generation = cache.get(HOME_GENERATION_KEY)
+    body = build_home(request)
+    # Skip storing if content changed while we were building; the next request rebuilds
+    if cache.get(HOME_GENERATION_KEY) == generation:
+        bodies = dict(cache.get(HOME_CACHE_KEY) or {}, **{prefix: body})
+        cache.set(HOME_CACHE_KEY, bodies, HOME_CACHE_TIMEOUT)
+    return body
+
+
+def _drop_home():
+    cache.set(HOME_GENERATION_KEY, uuid.uuid4().hex, None)
+    cache.delete(HOME_CACHE_KEY)
+
+
+def invalidate_home(using=None, **kwargs):
+    # A rebuild before the commit would read and store the old rows
+    transaction.on_commit(_drop_home, using=using)
+
+
+for model in HOME_MODELS:
+    post_save.connect(invalidate_home, sender=model, dispatch_uid=f'home-save-{model._meta.label}')
+    post_delete.connect(invalidate_home, sender=model, dispatch_uid=f'home-delete-{model._meta.label}')
@@ -0,0 +1,271 @@
+"""
+Prometheus metrics.
+
+Counters and histograms are kept in memory per process and flushed to
+``METRICS_DIR/<pid>-<start>.json`` at most every ``METRICS_FLUSH_INTERVAL``
+seconds, so ``/api/metrics/`` can sum every gunicorn worker's numbers no
+matter which worker answers the scrape. When a worker exits, the master
+folds its file into ``aggregate.json`` (``mark_process_dead``), so counters
+never go backwards and the directory doesn't grow with every restarted
+worker. Empty the directory when the server starts (the gunicorn config
+does both).
+
+Gauges (queue depths, response cache counters) are read at scrape time.
+"""
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count
+
+# Seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HELP = {
+    'http_requests_total': ('counter', 'Requests by resolved URL name, method and status'),
+    'http_request_duration_seconds': ('histogram', 'Request latency by resolved URL name, method and status'),
+    'db_queries_total': ('counter', 'Database queries executed while serving requests, by URL name'),
+    'auth_outcomes_total': ('counter', 'Authentication attempts by action and outcome'),
+}
+
+# Totals of exited workers, with the names of the files already folded in
+AGGREGATE_FILE = 'aggregate.json'
+
+# URL names whose responses count as authentication outcomes
+AUTH_URL_NAMES = {'login': 'login', 'register': 'register', 'refresh-token': 'refresh', 'logout': 'logout'}
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}  # (name, labels) -> value
+        self.histograms = {}  # (name, labels) -> [bucket counts..., +Inf count, sum]
+        self.path = None
+        self._last_flush = 0.0
+
+    def inc(self, name, labels, value=1):
+        key = (name, _label_key(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, labels, value):
+        key = (name, _label_key(labels))
+        with self._lock:
+            series = self.histograms.get(key)
+            if series is None:
+                series = self.histograms[key] = [0] * (len(LATENCY_BUCKETS) + 2)
+            series[bisect_left(LATENCY_BUCKETS, value)] += 1
+            series[-1] += value
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'counters': [[name, labels, value] for (name, labels), value in self.counters.items()],
+                'histograms': [[name, labels, list(series)] for (name, labels), series in self.histograms.items()],
+            }
+
+    def flush(self, force=False):
+        directory = settings.METRICS_DIR
+        now = time.monotonic()
+        if not directory or (not force and now - self._last_flush < settings.METRICS_FLUSH_INTERVAL):
+            return
+        self._last_flush = now
+        if self.path is None:
+            os.makedirs(directory, exist_ok=True)
+            self.path = os.path.join(directory, f'{os.getpid()}-{int(time.time() * 1000)}.json')
+        temp_path = f'{self.path}.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(temp_path, self.path)
+
+
+registry = Registry()
+atexit.register(registry.flush, force=True)
+
+
+def record_auth(action, outcome):
+    registry.inc('auth_outcomes_total', {'action': action, 'outcome': outcome})
+
+
+def clear_metrics_dir():
+    """Drop all workers' files; call once when the server (re)starts"""
+    for path in glob.glob(os.path.join(settings.METRICS_DIR, '*.json')):
+        os.remove(path)
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None  # Gone, or being replaced right now
+
+
+def _worker_paths(directory, pattern='*'):
+    return [path for path in glob.glob(os.path.join(directory, f'{pattern}.json'))
+            if os.path.basename(path) != AGGREGATE_FILE]
+
+
+def merge(snapshots):
+    """Sum snapshots into ({(name, labels): value}, {(name, labels): series})"""
+    counters, histograms = {}, {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot['counters']:
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, series in snapshot['histograms']:
+            key = (name, tuple(map(tuple, labels)))
+            total = histograms.setdefault(key, [0] * len(series))
+            for index, value in enumerate(series):
+                total[index] += value
+    return counters, histograms
+
+
+def mark_process_dead(pid):
+    """Fold an exited worker's file into the aggregate and delete it; call from the gunicorn master"""
+    directory = settings.METRICS_DIR
+    paths = _worker_paths(directory, f'{pid}-*') if directory else []
+    if not paths:
+        return
+    aggregate_path = os.path.join(directory, AGGREGATE_FILE)
+    aggregate = _read(aggregate_path) or {'counters': [], 'histograms': [], 'merged': []}
+    counters, histograms = merge([aggregate, *filter(None, map(_read, paths))])
+    remaining = {os.path.basename(path) for path in _worker_paths(directory)}
+    merged = [name for name in aggregate['merged'] if name in remaining] + [os.path.basename(path) for path in paths]
+    temp_path = f'{aggregate_path}.tmp'
+    with open(temp_path, 'w') as f:
+        json.dump({
+            'counters': [[name, labels, value] for (name, labels), value in counters.items()],
+            'histograms': [[name, labels, series] for (name, labels), series in histograms.items()],
+            'merged': merged,
+        }, f)
+    os.replace(temp_path, aggregate_path)
+    # A scrape between the replace and the removal skips these files by their name in "merged"
+    for path in paths:
+        os.remove(path)
+
+
+def collect():
+    """This process's live numbers merged with every other process's last flush"""
+    registry.flush(force=True)
+    if not settings.METRICS_DIR:
+        return merge([registry.snapshot()])
+    # Workers first: a file that disappears in between has been folded into the aggregate read after it
+    workers = {os.path.basename(path): _read(path) for path in _worker_paths(settings.METRICS_DIR)}
+    aggregate = _read(os.path.join(settings.METRICS_DIR, AGGREGATE_FILE))
+    merged = set(aggregate['merged']) if aggregate else set()
+    snapshots = [snapshot for name, snapshot in workers.items() if snapshot is not None and name not in merged]
+    return merge(snapshots + [aggregate] if aggregate else snapshots)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def gauges():
+    """(name, help, [(labels, value), ...]) read at scrape time"""
+    from shop.models import PaymentEvent
+    from taskqueue.models import Task
+    from .response_cache import get_stats
+
+    depth = Task.objects.filter(status__in=[Task.STATUS_QUEUED, Task.STATUS_RUNNING]).values('name', 'status')
+    cache_stats = get_stats()
+    return [
+        ('task_queue_depth', 'Queued and running background tasks by task name and status', [
+            ((('name', row['name']), ('status', row['status'])), row['count'])
+            for row in depth.annotate(count=Count('id')).order_by('name', 'status')
+        ]),
+        ('payment_events_pending', 'Paystack webhook events not yet applied to orders', [
+            ((), PaymentEvent.objects.filter(processed_at__isnull=True).count()),
+        ]),
+        ('response_cache_hits', 'Response cache hits since the counters were reset', [((), cache_stats['hits'])]),
+        ('response_cache_misses', 'Response cache misses since the counters were reset', [((), cache_stats['misses'])]),
+        ('response_cache_hit_ratio', 'Response cache hits / lookups', [((), cache_stats['hit_ratio'] or 0.0)]),
+        ('response_cache_bytes_saved', 'Response bytes served from the cache', [((), cache_stats['bytes_saved'])]),
+    ]
+
+
+def render():
+    """All metrics in the Prometheus text exposition format"""
+    counters, histograms = collect()
+    lines = []
+
+    for name, (kind, help_text) in HELP.items():
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+        if kind == 'counter':
+            for (series_name, labels), value in sorted(counters.items()):
+                if series_name == name:
+                    lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+            continue
+        for (series_name, labels), series in sorted(histograms.items()):
+            if series_name != name:
+                continue
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ('+Inf',), series[:-1]):
+                cumulative += count
+                lines.append(f'{name}_bucket{_format_labels(labels + (("le", str(bound)),))} {cumulative}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(series[-1])}')
+            lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+
+    for name, help_text, samples in gauges():
+        lines += [f'# HELP {name} {help_text}', f'# TYPE {name} gauge']
+        lines += [f'{name}{_format_labels(labels)} {_format_value(value)}' for labels, value in samples]
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsMiddleware:
+    """Count requests, latency and DB queries per resolved URL name"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = [0]
+
+        def count_query(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(count_query))
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unresolved'
+        labels = {'view': view, 'method': request.method, 'status': str(response.status_code)}
+        registry.inc('http_requests_total', labels)
+        registry.observe('http_request_duration_seconds', labels, duration)
+        if queries[0]:
+            registry.inc('db_queries_total', {'view': view}, queries[0])
+        if match and match.url_name in AUTH_URL_NAMES:
+            if response.status_code == 429:
+                outcome = 'throttled'
+            else:
+                outcome = 'success' if response.status_code < 400 else 'failure'
+            record_auth(AUTH_URL_NAMES[match.url_name], outcome)
+        registry.flush()
+        return response
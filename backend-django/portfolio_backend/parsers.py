@@ -0,0 +1,25 @@
+"""
+JSON parser backed by orjson when it is installed, falling back to DRF's
+stdlib ``JSONParser`` otherwise.
+"""
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+from .renderers import FastJSONRenderer, orjson
+
+
+class FastJSONParser(JSONParser):
+    """Drop-in replacement for ``rest_framework.parsers.JSONParser``"""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = (parser_context.get('encoding') or 'utf-8').lower()
+        # orjson rejects NaN/Infinity, so it is only a match for strict mode
+        if orjson is None or not self.strict or encoding not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
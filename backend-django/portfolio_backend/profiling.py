@@ -0,0 +1,193 @@
+"""
+Request profiling.
+
+``ProfilingMiddleware`` profiles a random ``PROFILING_SAMPLE_RATE`` fraction
+of requests: cProfile gives exact per-function totals and a stack sampler
+the call tree. The slowest ``PROFILING_BUFFER_SIZE`` profiles of this
+process are kept in memory, where admins can read them through
+``/api/profiling/``. Superusers can also add ``?profile=1`` to any request
+to get its profile back instead of the normal response.
+
+With sampling off, a request costs one random draw and a substring check
+on the query string.
+"""
+import cProfile
+import heapq
+import itertools
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.utils import timezone
+
+from .response_cache import authenticate
+
+# Call tree nodes seen in fewer than this share of samples are dropped
+MIN_NODE_FRACTION = 0.01
+
+
+def function_label(filename, line, name):
+    if filename == '~':  # built-in
+        return name
+    if filename.startswith(os.getcwd()):
+        filename = os.path.relpath(filename)
+    return f'{name} ({filename}:{line})'
+
+
+def top_functions(profiler):
+    """Functions by cumulative time from cProfile's exact per-function totals, times in ms"""
+    stats = pstats.Stats(profiler).stats
+    ranked = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:settings.PROFILING_TOP_FUNCTIONS]
+    return [{
+        'function': function_label(*func),
+        'calls': nc,
+        'own_ms': round(tt * 1000, 3),
+        'cumulative_ms': round(ct * 1000, 3),
+    } for func, (cc, nc, tt, ct, callers) in ranked]
+
+
+class StackSampler(threading.Thread):
+    """
+    Samples the stack of one thread every ``interval`` seconds into a call
+    tree. cProfile only records caller/callee pairs, which cannot be turned
+    back into a tree through Django's recursive middleware chain.
+    """
+
+    def __init__(self, thread_id, interval):
+        super().__init__(name='request-profiler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = 0
+        self.root = {}  # code -> [samples, children]
+        self._stop_event = threading.Event()
+        # Frames above (and including) the caller are not part of the request
+        frame, self.base_depth = sys._getframe(1), 0
+        while frame is not None:
+            self.base_depth += 1
+            frame = frame.f_back
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            codes = []
+            while frame is not None:
+                codes.append(frame.f_code)
+                frame = frame.f_back
+            codes.reverse()
+            if codes[self.base_depth:self.base_depth + 1] == [StackSampler.stop.__code__]:
+                continue  # Request already finished
+            children = self.root
+            for code in codes[self.base_depth:]:
+                node = children.setdefault(code, [0, {}])
+                node[0] += 1
+                children = node[1]
+            self.samples += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def tree(self, duration_ms):
+        """Nested nodes with sample counts and estimated time in ms"""
+        threshold = self.samples * MIN_NODE_FRACTION
+
+        def nodes(children):
+            return [{
+                'function': function_label(code.co_filename, code.co_firstlineno, code.co_name),
+                'samples': count,
+                'estimated_ms': round(duration_ms * count / self.samples, 3),
+                'children': nodes(grandchildren),
+            } for code, (count, grandchildren) in sorted(children.items(), key=lambda item: -item[1][0])
+                if count >= threshold]
+
+        return nodes(self.root) if self.samples else []
+
+
+class ProfileBuffer:
+    """The slowest N profiles seen by this process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._heap = []
+        self._ids = itertools.count(1)
+
+    def would_keep(self, duration_ms):
+        heap = self._heap
+        return len(heap) < settings.PROFILING_BUFFER_SIZE or duration_ms > heap[0][0]
+
+    def add(self, entry):
+        with self._lock:
+            entry['id'] = next(self._ids)
+            item = (entry['duration_ms'], entry['id'], entry)
+            if len(self._heap) < settings.PROFILING_BUFFER_SIZE:
+                heapq.heappush(self._heap, item)
+            elif item > self._heap[0]:
+                heapq.heapreplace(self._heap, item)
+
+    def entries(self):
+        with self._lock:
+            return [entry for _, _, entry in sorted(self._heap, reverse=True)]
+
+    def get(self, entry_id):
+        return next((entry for entry in self.entries() if entry['id'] == entry_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._heap = []
+
+
+buffer = ProfileBuffer()
+
+
+class ProfilingMiddleware:
+    """Profile sampled requests, or a superuser's ``?profile=1`` request"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        on_demand = 'profile=' in request.META.get('QUERY_STRING', '') and self.wants_profile(request)
+        sampled = not on_demand and settings.PROFILING_SAMPLE_RATE and random.random() < settings.PROFILING_SAMPLE_RATE
+        if not (on_demand or sampled):
+            return self.get_response(request)
+
+        sampler = StackSampler(threading.get_ident(), settings.PROFILING_INTERVAL_MS / 1000)
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        sampler.start()
+        profiler.enable()
+        try:
+            response = self.get_response(request)
+        finally:
+            profiler.disable()
+            sampler.stop()
+        duration_ms = round((time.perf_counter() - started) * 1000, 3)
+
+        entry = {
+            'method': request.method,
+            'path': request.get_full_path(),
+            'status': response.status_code,
+            'duration_ms': duration_ms,
+            'at': timezone.now().isoformat(),
+            'pid': os.getpid(),
+        }
+        if on_demand or buffer.would_keep(duration_ms):
+            entry.update(samples=sampler.samples, top=top_functions(profiler), tree=sampler.tree(duration_ms))
+        if on_demand:
+            return JsonResponse(entry)
+        if 'tree' in entry:
+            buffer.add(entry)
+        return response
+
+    def wants_profile(self, request):
+        if request.GET.get('profile') != '1':
+            return False
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_authenticated:
+            user = authenticate(request, None)
+        return bool(user and user.is_superuser)
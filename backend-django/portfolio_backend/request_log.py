@@ -0,0 +1,255 @@
+"""
+Structured JSON logging with request ids and per-request phase timings.
+
+``RequestLogMiddleware`` accepts the caller's ``X-Request-ID`` (e.g. set by
+nginx) or generates one, returns it on the response and writes one
+``portfolio_backend.access`` line per request with the route, user id,
+status and how long each phase took:
+
+- ``auth_ms``: DRF authenticators (token decoding, user lookup)
+- ``view_ms``: the view, including auth and serialization
+- ``serialization_ms``: serializer ``.data``, including the queries it triggers
+- ``sql_ms`` / ``sql_queries``: every query of the request
+- ``render_ms``: turning the response data into bytes
+
+Every other log line written while the request runs carries the same
+``request_id``. ``QueueLogHandler`` formats and writes records on a
+background thread, so logging never blocks a request on I/O.
+"""
+import contextvars
+import copy
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+import uuid
+from contextlib import ExitStack
+from datetime import datetime, timezone
+from functools import wraps
+from logging.handlers import QueueHandler, QueueListener
+
+from django.db import connections
+from django.utils.functional import empty
+
+access_logger = logging.getLogger('portfolio_backend.access')
+
+REQUEST_ID_HEADER = 'X-Request-ID'
+# Accepted as-is from upstream proxies; anything else is replaced
+REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._:-]{1,128}$')
+
+_request_id = contextvars.ContextVar('request_id', default=None)
+_timings = contextvars.ContextVar('request_timings', default=None)
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'request_id'}
+
+
+def get_request_id():
+    return _request_id.get()
+
+
+class Timings:
+    def __init__(self):
+        self.seconds = {}
+        self.sql_queries = 0
+        self.active = set()
+
+    def add(self, phase, seconds):
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+
+    def as_dict(self):
+        phases = {f'{phase}_ms': round(seconds * 1000, 3) for phase, seconds in self.seconds.items()}
+        phases['sql_queries'] = self.sql_queries
+        return phases
+
+
+def timed(phase):
+    """Add the wrapped call's duration to the current request's ``phase``; nested calls count once"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            timings = _timings.get()
+            if timings is None or phase in timings.active:
+                return func(*args, **kwargs)
+            timings.active.add(phase)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timings.add(phase, time.perf_counter() - started)
+                timings.active.discard(phase)
+        return wrapper
+    return decorator
+
+
+def instrument_drf():
+    """Time DRF authentication and serialization; called once from ``AppConfig.ready``"""
+    from rest_framework.request import Request
+    from rest_framework.serializers import ListSerializer, Serializer
+
+    Request._authenticate = timed('auth')(Request._authenticate)
+    for serializer_class in (Serializer, ListSerializer):
+        serializer_class.data = property(timed('serialization')(serializer_class.data.fget))
+
+
+def time_query(execute, sql, params, many, context):
+    timings = _timings.get()
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        if timings is not None:
+            timings.add('sql', time.perf_counter() - started)
+            timings.sql_queries += 1
+
+
+def authenticated_user_id(request):
+    # Never evaluate AuthenticationMiddleware's lazy user here: that would
+    # load the session just to log it. DRF replaces it once it authenticates.
+    user = request.__dict__.get('user')
+    if user is None or getattr(user, '_wrapped', None) is empty:
+        return None
+    return user.pk if user.is_authenticated else None
+
+
+class RequestLogMiddleware:
+    """Assign a request id and log one JSON line with phase timings per request"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_id = request.headers.get(REQUEST_ID_HEADER, '')
+        if not REQUEST_ID_PATTERN.match(request_id):
+            request_id = uuid.uuid4().hex
+        request.request_id = request_id
+        timings = Timings()
+        id_token, timings_token = _request_id.set(request_id), _timings.set(timings)
+
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(time_query))
+                response = self.get_response(request)
+            finished = time.perf_counter()
+
+            view_started = getattr(request, '_log_view_started', None)
+            view_finished = getattr(request, '_log_view_finished', None)
+            if view_started is not None:
+                timings.add('view', (view_finished or finished) - view_started)
+            if view_finished is not None:
+                timings.add('render', finished - view_finished)
+
+            response[REQUEST_ID_HEADER] = request_id
+            match = getattr(request, 'resolver_match', None)
+            access_logger.info('%s %s %s', request.method, request.path, response.status_code, extra={
+                'method': request.method,
+                'path': request.path,
+                'route': match.view_name if match else None,
+                'status': response.status_code,
+                'user_id': authenticated_user_id(request),
+                'duration_ms': round((finished - started) * 1000, 3),
+                'phases': timings.as_dict(),
+                'cache': response.get('X-Cache'),
+                'remote_addr': request.META.get('REMOTE_ADDR'),
+            })
+            return response
+        finally:
+            _request_id.reset(id_token)
+            _timings.reset(timings_token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        request._log_view_started = time.perf_counter()
+
+    def process_template_response(self, request, response):
+        # Called between the view returning and the response being rendered
+        request._log_view_finished = time.perf_counter()
+        return response
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the id of the request being served, if any"""
+
+    def filter(self, record):
+        if not hasattr(record, 'request_id'):
+            # django.request logs errors after the middleware has returned, but passes the request along
+            request_id = getattr(getattr(record, 'request', None), 'request_id', None)
+            record.request_id = request_id or _request_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; ``extra`` fields become top-level keys"""
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'request_id': getattr(record, 'request_id', None),
+            'pid': record.process,
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in RECORD_ATTRIBUTES)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class QueueLogHandler(QueueHandler):
+    """
+    Queue records for a listener thread that formats and writes them to
+    stderr. When the queue is full, records are dropped rather than making
+    the request wait. The listener is (re)started in each process, so the
+    handler survives gunicorn forking workers from a preloaded master.
+    """
+
+    def __init__(self, maxsize=10000):
+        super().__init__(queue.Queue(maxsize))
+        self.maxsize = maxsize
+        self.target = logging.StreamHandler()
+        self.dropped = 0
+        self._listener = None
+        self._listener_pid = None
+        self._start_lock = threading.Lock()
+
+    def setFormatter(self, fmt):
+        # Formatting happens on the listener thread
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Like QueueHandler.prepare, but the traceback is formatted later, off the request thread
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        return record
+
+    def enqueue(self, record):
+        if self._listener_pid != os.getpid():
+            self._start()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _start(self):
+        with self._start_lock:
+            if self._listener_pid == os.getpid():
+                return
+            # A queue inherited through fork may hold a parent's records or a held lock
+            self.queue = queue.Queue(self.maxsize)
+            self._listener = QueueListener(self.queue, self.target)
+            self._listener.start()
+            self._listener_pid = os.getpid()
+
+    def close(self):
+        # logging.shutdown() calls this at exit, after the queue has been drained
+        if self._listener is not None and self._listener_pid == os.getpid():
+            self._listener.stop()
+            self._listener_pid = None
+        super().close()
@@ -0,0 +1,227 @@
+"""
+Declarative response caching for GET endpoints.
+
+Views opt in with a ``cache_policy`` attribute (or the ``cache_response``
+decorator) and ``ResponseCacheMiddleware`` serves repeats from the cache.
+Entries are keyed on route, host, path, sorted query string, Accept header,
+the caller's scope and the current version of every tag. Saving or
+deleting a tagged model bumps its version once the transaction commits,
+which orphans older entries.
+
+A policy must only be used on views whose response (including the
+permission outcome) is the same for every caller within a scope:
+
+- ``anonymous``: one shared entry; credentials, when sent, are only checked
+  so that invalid ones still reach the view and get its 401
+- ``authenticated``: one entry for anonymous callers, one for everyone else
+- ``user``: one entry per user
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponse
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+VARY_ANONYMOUS = 'anonymous'
+VARY_AUTHENTICATED = 'authenticated'
+VARY_USER = 'user'
+
+KEY_PREFIX = 'respcache'
+STATS_KEYS = {
+    'hits': f'{KEY_PREFIX}:stats:hits',
+    'misses': f'{KEY_PREFIX}:stats:misses',
+    'bytes_saved': f'{KEY_PREFIX}:stats:bytes_saved',
+}
+
+# Model labels referenced by any policy; only these get save/delete receivers
+_tagged_labels = set()
+
+
+class CachePolicy:
+    """How long a view's GET responses are cached and what they depend on"""
+
+    def __init__(self, ttl, vary=VARY_ANONYMOUS, tags=()):
+        if vary not in (VARY_ANONYMOUS, VARY_AUTHENTICATED, VARY_USER):
+            raise ValueError(f'Unknown cache vary {vary!r}')
+        self.ttl = ttl
+        self.vary = vary
+        self.tags = tuple(label.lower() for label in tags)
+        for label in self.tags:
+            if label not in _tagged_labels:
+                _tagged_labels.add(label)
+                connect_tag(label)
+
+
+def cache_response(ttl, vary=VARY_ANONYMOUS, tags=()):
+    """Attach a ``CachePolicy`` to a view class or function"""
+    def decorator(view):
+        view.cache_policy = CachePolicy(ttl, vary=vary, tags=tags)
+        return view
+    return decorator
+
+
+def _tag_key(label):
+    return f'{KEY_PREFIX}:tag:{label}'
+
+
+def _now_version():
+    # Seeds a missing version so an evicted counter can't restart at an old value
+    return int(time.time() * 1000)
+
+
+def tag_versions(tags):
+    keys = [_tag_key(label) for label in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _now_version(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_tag(label):
+    key = _tag_key(label)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, _now_version(), None)
+
+
+def invalidate_models(*models):
+    """Bump the tags of ``models``; bulk operations (``update()``, ``bulk_create()``) send no signals"""
+    for model in models:
+        if model._meta.label_lower in _tagged_labels:
+            bump_tag(model._meta.label_lower)
+
+
+def _incr(key, delta=1):
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        cache.add(key, 0, None)
+        cache.incr(key, delta)
+
+
+def get_stats():
+    values = cache.get_many(STATS_KEYS.values())
+    stats = {name: values.get(key, 0) for name, key in STATS_KEYS.items()}
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else None
+    return stats
+
+
+def reset_stats():
+    cache.delete_many(STATS_KEYS.values())
+
+
+def get_policy(view_func):
+    view_cls = getattr(view_func, 'cls', None)
+    return getattr(view_cls, 'cache_policy', None) or getattr(view_func, 'cache_policy', None)
+
+
+def authenticate(request, view_func):
+    """
+    Authenticate with the view's own authenticators and force the result
+    onto the request, so the view does not decode the token a second time.
+    Returns None when the credentials are invalid; the view reports that.
+    """
+    view_cls = getattr(view_func, 'cls', None)
+    classes = getattr(view_cls, 'authentication_classes', api_settings.DEFAULT_AUTHENTICATION_CLASSES)
+    drf_request = Request(request, authenticators=[auth() for auth in classes])
+    try:
+        user, auth = drf_request.user, drf_request.auth
+    except APIException:
+        return None
+    request._force_auth_user = user
+    request._force_auth_token = auth
+    return user
+
+
+def cache_scope(policy, request, view_func):
+    if policy.vary == VARY_ANONYMOUS:
+        # The response doesn't depend on the caller, but invalid credentials still get the view's 401
+        has_credentials = 'HTTP_AUTHORIZATION' in request.META or settings.SESSION_COOKIE_NAME in request.COOKIES
+        if has_credentials and authenticate(request, view_func) is None:
+            return None
+        return 'all'
+    user = authenticate(request, view_func)
+    if user is None:
+        return None
+    if not user.is_authenticated:
+        return 'anon'
+    return 'auth' if policy.vary == VARY_AUTHENTICATED else f'user:{user.pk}'
+
+
+def cache_key(request, policy, scope):
+    query = urlencode(sorted((k, v) for k, values in request.GET.lists() for v in values))
+    parts = [
+        request.resolver_match.view_name,
+        request.get_host(),
+        request.path,
+        query,
+        request.META.get('HTTP_ACCEPT', ''),
+        scope,
+        *map(str, tag_versions(policy.tags)),
+    ]
+    digest = hashlib.md5('\n'.join(parts).encode()).hexdigest()
+    return f'{KEY_PREFIX}:{digest}'
+
+
+class ResponseCacheMiddleware:
+    """Serve GET responses of views with a cache policy from the cache"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        pending = getattr(request, '_response_cache_pending', None)
+        if (pending and response.status_code == 200
+                and not response.streaming and not response.cookies):
+            key, ttl = pending
+            cache.set(key, (response.content, response['Content-Type']), ttl)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if request.method != 'GET' or not settings.RESPONSE_CACHE_ENABLED:
+            return None
+        policy = get_policy(view_func)
+        if policy is None:
+            return None
+        
+        scope = cache_scope(policy, request, view_func)
+        if scope is None:
+            return None
+        
+        key = cache_key(request, policy, scope)
+        cached = cache.get(key)
+        if cached is None:
+            _incr(STATS_KEYS['misses'])
+            request._response_cache_pending = (key, policy.ttl)
+            return None
+        
+        content, content_type = cached
+        _incr(STATS_KEYS['hits'])
+        _incr(STATS_KEYS['bytes_saved'], len(content))
+        response = HttpResponse(content, content_type=content_type)
+        response['X-Cache'] = 'HIT'
+        return response
+
+
+def invalidate_tagged(sender, using=None, **kwargs):
+    label = sender._meta.label_lower
+    # After commit, so a request in between can't cache the old rows under the new version
+    transaction.on_commit(lambda: bump_tag(label), using=using)
+
+
+def connect_tag(label):
+    # A lazy 'app_label.model' sender, so policies can be declared before the app registry is ready
+    post_save.connect(invalidate_tagged, sender=label, dispatch_uid=f'response-cache-save-{label}')
+    post_delete.connect(invalidate_tagged, sender=label, dispatch_uid=f'response-cache-delete-{label}')
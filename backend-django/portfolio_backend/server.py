@@ -0,0 +1,92 @@
+"""
+Server process tuning for ``gunicorn.conf.py``, derived from the machine
+(or container limits) and overridable through the environment.
+
+Defaults come from ``python manage.py benchmark_server`` (results in
+``benchmarks/server.json``): a warmed-up worker forked from a preloaded
+master holds ~57 MB resident, but only ~17 MB of it is private (~43 MB
+without preloading), and four preloaded workers are all serving in under
+a second instead of ~2s. Memory is budgeted at ``SERVER_WORKER_MEMORY_MB``
+(80 MB: resident size plus headroom for request peaks across
+``SERVER_THREADS`` threads) per worker, on top of
+``SERVER_RESERVED_MEMORY_MB`` for the master and the rest of the
+container. Because forking a preloaded master is cheap, recycling workers
+every ``max_requests`` costs almost nothing.
+"""
+import math
+import os
+
+from decouple import config
+
+DEFAULT_WORKER_MEMORY_MB = 80
+DEFAULT_RESERVED_MEMORY_MB = 256
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def cpu_count():
+    """CPUs this process may use: affinity mask, capped by a cgroup CPU quota"""
+    cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+    quota, period = None, None
+    cpu_max = _read('/sys/fs/cgroup/cpu.max')  # cgroup v2: "<quota|max> <period>"
+    if cpu_max:
+        value, _, period_value = cpu_max.partition(' ')
+        if value != 'max':
+            quota, period = int(value), int(period_value)
+    else:  # cgroup v1
+        quota_value, period_value = _read('/sys/fs/cgroup/cpu/cpu.cfs_quota_us'), _read('/sys/fs/cgroup/cpu/cpu.cfs_period_us')
+        if quota_value and period_value and int(quota_value) > 0:
+            quota, period = int(quota_value), int(period_value)
+    if quota and period:
+        cpus = min(cpus, math.ceil(quota / period))
+    return max(1, cpus)
+
+
+def memory_bytes():
+    """Memory this process may use: physical memory, capped by a cgroup limit"""
+    memory = os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    for path in ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+        limit = _read(path)
+        if limit and limit.isdigit():
+            memory = min(memory, int(limit))  # v1 reports "unlimited" as a huge number
+            break
+    return memory
+
+
+def tune():
+    """Gunicorn settings as a dict; every value can be overridden by an environment variable"""
+    asgi = config('SERVER_ASGI', default=False, cast=bool)
+    cpus = cpu_count()
+    memory_mb = memory_bytes() // (1024 * 1024)
+    worker_memory_mb = config('SERVER_WORKER_MEMORY_MB', default=DEFAULT_WORKER_MEMORY_MB, cast=int)
+    reserved_mb = config('SERVER_RESERVED_MEMORY_MB', default=DEFAULT_RESERVED_MEMORY_MB, cast=int)
+
+    # The usual 2 x CPUs + 1, unless that many workers would not fit in memory
+    by_cpu = 2 * cpus + 1
+    by_memory = max(1, (memory_mb - reserved_mb) // worker_memory_mb)
+    workers = config('WEB_CONCURRENCY', default=min(by_cpu, by_memory), cast=int)
+
+    max_requests = config('SERVER_MAX_REQUESTS', default=2000, cast=int)
+    return {
+        'cpus': cpus,
+        'memory_mb': memory_mb,
+        'workers': workers,
+        # Threads let a worker keep serving while one request waits on Paystack or the database
+        'worker_class': 'uvicorn.workers.UvicornWorker' if asgi else 'gthread',
+        'threads': config('SERVER_THREADS', default=1 if asgi else 4, cast=int),
+        'wsgi_app': 'portfolio_backend.asgi:application' if asgi else 'portfolio_backend.wsgi:application',
+        # Recycle workers to bound slow memory growth; jitter keeps them from restarting together
+        'max_requests': max_requests,
+        'max_requests_jitter': config('SERVER_MAX_REQUESTS_JITTER', default=max_requests // 10, cast=int),
+        'preload_app': config('SERVER_PRELOAD', default=True, cast=bool),
+        'timeout': config('SERVER_TIMEOUT', default=30, cast=int),
+        'graceful_timeout': config('SERVER_GRACEFUL_TIMEOUT', default=25, cast=int),
+        # Longer than nginx's upstream keepalive_timeout (60s), so nginx always closes idle connections first
+        'keepalive': config('SERVER_KEEPALIVE', default=75, cast=int),
+    }
@@ -0,0 +1,28 @@
+"""
+Production settings: the development settings minus what only helps
+during development. Dropping these also shortens worker boot, which
+matters when autoscaling and when gunicorn recycles workers
+(measure with ``python manage.py startup_profile``).
+
+Use with ``DJANGO_SETTINGS_MODULE=portfolio_backend.settings_production``
+(the Docker image does).
+"""
+from decouple import Csv, config
+
+from .settings import *  # noqa: F401,F403
+from .settings import ALLOWED_HOSTS, INSTALLED_APPS, REST_FRAMEWORK
+
+DEBUG = config('DEBUG', default=False, cast=bool)
+
+ALLOWED_HOSTS = config('ALLOWED_HOSTS', default=','.join(ALLOWED_HOSTS), cast=Csv())
+
+# Development-only apps (shell_plus, runserver_plus, graph_models, ...)
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app != 'django_extensions']
+
+# The browsable API pulls in templates and forms on every HTML request
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': ['portfolio_backend.renderers.FastJSONRenderer'],
+}
+
+CORS_ALLOW_ALL_ORIGINS = DEBUG
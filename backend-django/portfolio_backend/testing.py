@@ -0,0 +1,72 @@
+"""
+Sample data and request helpers shared by the tests and the fast path benchmark.
+"""
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+from rest_framework.test import APIRequestFactory
+
+from portfolio.models import Project, Thought, WorkExperience
+from portfolio.views import ProjectViewSet, ThoughtViewSet, WorkExperienceViewSet
+from shop.models import Product
+from shop.views import ProductViewSet
+
+# (viewset, query strings checked for parity)
+ENDPOINTS = [
+    (ProjectViewSet, [
+        '', 'featured=true', 'fields=id,title,long_description,featured_image', 'omit=images', 'search=Project',
+        'search=Project&page=2&fields=id,title',
+    ]),
+    (ThoughtViewSet, ['', 'featured=true', 'fields=id,title,snippet,featured_image_url', 'omit=tags', 'ordering=created_at']),
+    (WorkExperienceViewSet, ['', 'fields=company,company_logo_url,start_date,end_date']),
+    (ProductViewSet, ['', 'featured=true', 'fields=id,price,featured_image', 'page=2', 'page=3&fields=id,price']),
+]
+
+
+def render_list(viewset, query, fast):
+    """Rendered list response of ``viewset`` for ``query``, on the fast path or the serializers"""
+    request = APIRequestFactory().get(f'/?{query}', HTTP_HOST='localhost:8000')
+    response = viewset.as_view({'get': 'list'}, fast_list=fast)(request)
+    response.render()
+    return response
+
+
+def render_detail(viewset, pk, query='', fast=True):
+    """Rendered detail response of ``viewset`` for the row ``pk``"""
+    request = APIRequestFactory().get(f'/?{query}', HTTP_HOST='localhost:8000')
+    response = viewset.as_view({'get': 'retrieve'}, fast_list=fast)(request, pk=pk)
+    response.render()
+    return response
+
+
+def create_sample_rows(count):
+    """``count`` rows of every model behind ENDPOINTS, covering empty and set media fields"""
+    rng = random.Random(0)
+    today = date.today()
+    Project.objects.bulk_create([
+        Project(title=f'Project {i}', description='A project description. ' * 5, long_description='Details. ' * 200,
+                featured_image=f'projects/{i}/cover.jpg' if i % 2 else '', technologies=['React', 'Django'],
+                github_url='https://github.com/example/project', featured=i % 3 == 0)
+        for i in range(count)
+    ])
+    Thought.objects.bulk_create([
+        Thought(title=f'Thought {i}', snippet='Snippet text. ' * 10, content='Long form content. ' * 500,
+                featured_image=f'thoughts/{i}/cover image.jpg' if i % 2 else '', date=today - timedelta(days=i),
+                featured=i % 4 == 0, tags=['python', 'web'])
+        for i in range(count)
+    ])
+    WorkExperience.objects.bulk_create([
+        WorkExperience(company=f'Company {i}', position='Engineer', description='Built things. ' * 20,
+                       company_logo=f'work/{i}/logo.png' if i % 2 else '', start_date=today - timedelta(days=400 + i),
+                       end_date=None if i == 0 else today - timedelta(days=i), current=i == 0,
+                       technologies=['Python'], display_order=i)
+        for i in range(count)
+    ])
+    Product.objects.bulk_create([
+        Product(title=f'Product {i}', description='A product. ' * 10, price=Decimal(rng.randint(100, 99999)) / 100,
+                featured_image=f'products/{i}/photo.jpg' if i % 2 else None, category='digital',
+                stock=rng.randint(0, 50), featured=i % 5 == 0)
+        for i in range(count)
+    ])
+
@@ -0,0 +1,47 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from portfolio.models import Project, Thought, WorkExperience
+from shop.models import Product
+
+
+class HomeTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        today = date.today()
+        Project.objects.bulk_create([
+            Project(title=f'Project {i}', description='A project.', featured=True) for i in range(10)
+        ])
+        Thought.objects.bulk_create([
+            Thought(title=f'Thought {i}', snippet='Snippet.', content='Long form content. ' * 100,
+                    date=today - timedelta(days=i), featured=True)
+            for i in range(10)
+        ])
+        WorkExperience.objects.bulk_create([
+            WorkExperience(company=f'Company {i}', position='Engineer', description='Built things.',
+                           start_date=today - timedelta(days=400), display_order=i)
+            for i in range(3)
+        ])
+        Product.objects.bulk_create([
+            Product(title=f'Product {i}', description='A product.', price=Decimal('9.99'), featured=True)
+            for i in range(10)
+        ])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_uncached_build_runs_one_query_per_section(self):
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/home/')
+        self.assertEqual(response.status_code, 200)
+        thoughts = response.json()['thoughts']
+        self.assertEqual(len(thoughts), 7)
+        self.assertNotIn('content', thoughts[0])
+
+    def test_cached_body_runs_no_queries(self):
+        self.client.get('/api/home/')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get('/api/home/').status_code, 200)
@@ -0,0 +1,162 @@
+"""
+Rate limits for sensitive endpoints, kept in a Django cache.
+
+Views list their limits in a ``rate_limits`` attribute and add
+``RateLimitThrottle`` to ``throttle_classes``::
+
+    throttle_classes = [RateLimitThrottle]
+    rate_limits = [
+        RateLimit('login-ip', key=KEY_IP),
+        RateLimit('login-email', key=KEY_EMAIL, algorithm=TOKEN_BUCKET),
+    ]
+
+Rates come from ``settings.RATE_LIMITS[scope]`` as ``"<requests>/<period>"``
+(e.g. ``"5/15min"``). A rejected request gets DRF's 429 with
+``Retry-After``. Both algorithms keep O(1) state per key, and every cache
+entry expires on its own:
+
+- sliding window: counters for the current and previous fixed window,
+  with the previous one weighted by how much of it still overlaps
+- token bucket: one timestamp per key (GCRA), allowing bursts up to the
+  limit and refilling evenly over the period
+
+Limits are only as shared as ``RATE_LIMIT_CACHE``: the default local
+memory cache counts per worker process, Redis (``REDIS_URL``) across all
+of them. Token bucket updates are read-then-write, so concurrent requests
+can overshoot a limit by a request or two.
+"""
+import hashlib
+import math
+import re
+import time
+
+import jwt
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+from authentication.tokens import decode_token
+
+SLIDING_WINDOW = 'sliding_window'
+TOKEN_BUCKET = 'token_bucket'
+
+KEY_IP = 'ip'
+KEY_EMAIL = 'email'  # From a request body field; hashed before it becomes part of a cache key
+KEY_USER = 'user'  # Authenticated user, or the owner of a valid refresh token
+
+KEY_PREFIX = 'ratelimit'
+UNITS = {'s': 1, 'sec': 1, 'm': 60, 'min': 60, 'h': 3600, 'hour': 3600, 'd': 86400, 'day': 86400}
+RATE_PATTERN = re.compile(r'^(\d+)/(\d*)([a-z]+)$')
+
+
+def parse_rate(rate):
+    """``"5/15min"`` -> (5, 900.0)"""
+    match = RATE_PATTERN.match(rate.replace(' ', ''))
+    if not match or match.group(3) not in UNITS:
+        raise ValueError(f'Invalid rate {rate!r}, expected e.g. "10/min" or "5/15min"')
+    count, multiplier, unit = match.groups()
+    return int(count), float(int(multiplier or 1) * UNITS[unit])
+
+
+def sliding_window(cache, key, limit, period, now):
+    """Seconds to wait, or None after counting the request"""
+    window = int(now // period)
+    current_key, previous_key = f'{key}:{window}', f'{key}:{window - 1}'
+    counts = cache.get_many([current_key, previous_key])
+    current, previous = counts.get(current_key, 0), counts.get(previous_key, 0)
+    elapsed = now - window * period
+    weight = 1 - elapsed / period
+    if previous * weight + current >= limit:
+        if current >= limit or not previous:
+            return period - elapsed
+        # The previous window's share shrinks linearly; wait until it leaves room for one more
+        return max(0.0, (1 - (limit - current) / previous) * period - elapsed)
+    if not cache.add(current_key, 1, math.ceil(2 * period)):
+        try:
+            cache.incr(current_key)
+        except ValueError:  # Expired between add() and incr()
+            cache.add(current_key, 1, math.ceil(2 * period))
+    return None
+
+
+def token_bucket(cache, key, limit, period, now):
+    """Seconds to wait, or None after taking a token"""
+    interval = period / limit
+    # Theoretical arrival time: when the bucket would be full again
+    tat = max(cache.get(key, now), now)
+    if tat + interval - period > now:
+        return tat + interval - period - now
+    cache.set(key, tat + interval, math.ceil(tat + interval - now))
+    return None
+
+
+ALGORITHMS = {SLIDING_WINDOW: sliding_window, TOKEN_BUCKET: token_bucket}
+
+
+def _hash(value):
+    return hashlib.sha256(value.encode()).hexdigest()[:32]
+
+
+def refresh_token_user(request):
+    """User id of a validly signed refresh token in the body, so forged tokens can't exhaust someone else's limit"""
+    token = request.data.get('refresh_token') if hasattr(request.data, 'get') else None
+    if not isinstance(token, str):
+        return None
+    try:
+        return decode_token(token).get('user_id')
+    except jwt.InvalidTokenError:
+        return None
+
+
+class RateLimit:
+    """One limit of a view: a settings scope, what it is keyed on and the algorithm"""
+
+    def __init__(self, scope, key=KEY_IP, algorithm=SLIDING_WINDOW, field='email'):
+        if key not in (KEY_IP, KEY_EMAIL, KEY_USER):
+            raise ValueError(f'Unknown rate limit key {key!r}')
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f'Unknown rate limit algorithm {algorithm!r}')
+        self.scope = scope
+        self.key = key
+        self.algorithm = algorithm
+        self.field = field
+
+    def identify(self, throttle, request):
+        """The value this limit counts, or None when the request has none (e.g. no email given)"""
+        if self.key == KEY_IP:
+            return throttle.get_ident(request)
+        if self.key == KEY_EMAIL:
+            email = request.data.get(self.field) if hasattr(request.data, 'get') else None
+            return _hash(email.strip().lower()) if isinstance(email, str) and email.strip() else None
+        if request.user and request.user.is_authenticated:
+            return str(request.user.pk)
+        user_id = refresh_token_user(request)
+        return None if user_id is None else str(user_id)
+
+    def hit(self, ident, now=None):
+        """Count one request for ``ident``; seconds to wait when over the limit, else None"""
+        limit, period = parse_rate(settings.RATE_LIMITS[self.scope])
+        key = f'{KEY_PREFIX}:{self.scope}:{ident}'
+        now = time.time() if now is None else now
+        return ALGORITHMS[self.algorithm](caches[settings.RATE_LIMIT_CACHE], key, limit, period, now)
+
+
+class RateLimitThrottle(BaseThrottle):
+    """Applies the view's ``rate_limits``; the first one exceeded rejects the request"""
+
+    def allow_request(self, request, view):
+        self.retry_after = None
+        if not settings.RATE_LIMIT_ENABLED:
+            return True
+        for rate_limit in getattr(view, 'rate_limits', ()):
+            ident = rate_limit.identify(self, request)
+            if ident is None:
+                continue
+            wait = rate_limit.hit(ident)
+            if wait is not None:
+                self.retry_after = wait
+                return False
+        return True
+
+    def wait(self):
+        return self.retry_after
@@ -4,8 +4,10 @@ URL configuration for portfolio_backend project.
 from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
-from django.conf.urls.static import static
-from .views import HealthCheckView
+from .views import (
+    BatchView, HealthCheckView, HomeView, LivenessView, MetricsView, ProfileDetailView, ProfileListView,
+    ReadinessView, ResponseCacheStatsView,
+)
 
 # Customize admin site
 admin.site.site_header = settings.ADMIN_SITE_HEADER
@@ -15,6 +17,14 @@ admin.site.index_title = settings.ADMIN_INDEX_TITLE
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/health/', HealthCheckView.as_view(), name='health-check'),
+    path('api/health/live/', LivenessView.as_view(), name='health-live'),
+    path('api/health/ready/', ReadinessView.as_view(), name='health-ready'),
+    path('api/home/', HomeView.as_view(), name='home'),
+    path('api/batch/', BatchView.as_view(), name='batch'),
+    path('api/cache/stats/', ResponseCacheStatsView.as_view(), name='cache-stats'),
+    path('api/metrics/', MetricsView.as_view(), name='metrics'),
+    path('api/profiling/', ProfileListView.as_view(), name='profile-list'),
+    path('api/profiling/<int:profile_id>/', ProfileDetailView.as_view(), name='profile-detail'),
     path('api/auth/', include('authentication.urls')),
     path('api/portfolio/', include('portfolio.urls')),
     path('api/shop/', include('shop.urls')),
@@ -23,5 +33,7 @@ urlpatterns = [
 
 # Serve media files in development
 if settings.DEBUG:
+    from django.conf.urls.static import static
+
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
\ No newline at end of file
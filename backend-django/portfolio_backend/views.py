@@ -1,13 +1,24 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.permissions import IsAdminUser
 from django.conf import settings
+from django.http import HttpResponse
+import hmac
+import time
+from .batch import dispatch
+from .health import check_readiness
+from .home import get_home
+from .metrics import render as render_metrics
+from .profiling import buffer as profile_buffer
+from .response_cache import CachePolicy, get_stats, reset_stats
 
 class HealthCheckView(APIView):
     """
     Health check endpoint for monitoring API status
     """
     permission_classes = []
+    cache_policy = CachePolicy(ttl=10)
     
     def get(self, request):
         return Response({
@@ -15,4 +26,147 @@ class HealthCheckView(APIView):
             'message': 'Portfolio Backend API is running',
             'version': getattr(settings, 'VERSION', '1.0.0'),
             'debug': settings.DEBUG
-        }, status=status.HTTP_200_OK)
\ No newline at end of file
+        }, status=status.HTTP_200_OK)
+
+
+class LivenessView(APIView):
+    """
+    The process is up and serving requests; checks no dependencies
+    """
+    authentication_classes = []
+    permission_classes = []
+    
+    def get(self, request):
+        return Response({'status': 'alive'})
+
+
+class ReadinessView(APIView):
+    """
+    Database, cache, media storage and backlog probes; 503 when this worker should get no traffic
+    """
+    authentication_classes = []
+    permission_classes = []
+    
+    def get(self, request):
+        result, cached = check_readiness()
+        response_status = status.HTTP_503_SERVICE_UNAVAILABLE if result['status'] == 'unavailable' else status.HTTP_200_OK
+        response = Response({**result, 'cached': cached}, status=response_status)
+        response['Cache-Control'] = 'no-store'
+        return response
+
+
+class HomeView(APIView):
+    """
+    Everything the landing page shows in one response, served from cache
+    """
+    authentication_classes = []
+    permission_classes = []
+    
+    def get(self, request):
+        return HttpResponse(get_home(request), content_type='application/json')
+
+
+class BatchView(APIView):
+    """
+    Run several GET requests in one round trip.
+    
+    POST {"requests": ["/api/learn/courses/1/", {"path": "/api/learn/lessons/?course_id=1"}]}
+    returns the status, body and timing of each, in order. The caller's
+    credentials apply to every sub-request.
+    """
+    permission_classes = []  # Each sub-request checks its own permissions
+    
+    def post(self, request):
+        items = request.data.get('requests') if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            return Response({'error': 'requests must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if len(items) > settings.BATCH_MAX_REQUESTS:
+            return Response(
+                {'error': f'At most {settings.BATCH_MAX_REQUESTS} requests per batch'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        urls = []
+        for item in items:
+            if isinstance(item, dict):
+                if item.get('method', 'GET').upper() != 'GET':
+                    return Response({'error': 'Only GET requests can be batched'}, status=status.HTTP_400_BAD_REQUEST)
+                item = item.get('path')
+            if not isinstance(item, str) or not item.startswith('/'):
+                return Response({'error': 'Each request needs an absolute path'}, status=status.HTTP_400_BAD_REQUEST)
+            urls.append(item)
+        
+        started = time.perf_counter()
+        request.user  # Authenticate once, before fanning out
+        results = [dispatch(request, url) for url in urls]
+        
+        return Response({
+            'results': results,
+            'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+        })
+
+
+class ResponseCacheStatsView(APIView):
+    """
+    Response cache hit ratio and bytes served from cache (admin only)
+    """
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request):
+        return Response({
+            'backend': settings.CACHES['default']['BACKEND'],
+            'enabled': settings.RESPONSE_CACHE_ENABLED,
+            **get_stats(),
+        })
+    
+    def delete(self, request):
+        reset_stats()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ProfileListView(APIView):
+    """
+    Slowest sampled request profiles of the worker process serving this request (admin only)
+    """
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request):
+        return Response({
+            'sample_rate': settings.PROFILING_SAMPLE_RATE,
+            'results': [
+                {key: value for key, value in entry.items() if key not in ('top', 'tree')}
+                for entry in profile_buffer.entries()
+            ],
+        })
+    
+    def delete(self, request):
+        profile_buffer.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ProfileDetailView(APIView):
+    """
+    Top functions and call tree of one buffered profile (admin only)
+    """
+    permission_classes = [IsAdminUser]
+    
+    def get(self, request, profile_id):
+        entry = profile_buffer.get(profile_id)
+        if entry is None:
+            return Response({'error': 'Profile not found in this worker'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(entry)
+
+
+class MetricsView(APIView):
+    """
+    Prometheus metrics for all worker processes, in the text exposition format
+    """
+    authentication_classes = []
+    permission_classes = []
+    
+    def get(self, request):
+        token = settings.METRICS_TOKEN
+        if token and not hmac.compare_digest(request.META.get('HTTP_AUTHORIZATION', ''), f'Bearer {token}'):
+            return Response({'error': 'Invalid metrics token'}, status=status.HTTP_401_UNAUTHORIZED)
+        return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Product, Cart, Order
+from .models import Product, Cart, Order, PaymentEvent
 
 @admin.register(Product)
 class ProductAdmin(admin.ModelAdmin):
@@ -55,4 +55,18 @@ class OrderAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'updated_at'),
             'classes': ('collapse',)
         }),
-    )
\ No newline at end of file
+    )
+
+@admin.register(PaymentEvent)
+class PaymentEventAdmin(admin.ModelAdmin):
+    list_display = ['event', 'reference', 'received_at', 'processed_at']
+    list_filter = ['event', 'received_at']
+    search_fields = ['reference', 'event_id']
+    readonly_fields = ['event_id', 'event', 'reference', 'payload', 'received_at', 'processed_at']
+    ordering = ['-received_at']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
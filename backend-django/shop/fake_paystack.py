@@ -0,0 +1,114 @@
+"""
+Minimal in-memory stand-in for the Paystack API, for local development and
+load testing. Point ``PAYSTACK_BASE_URL`` at it (see ``run_fake_paystack``).
+
+Supported endpoints:
+    POST /transaction/initialize
+    GET  /transaction/verify/<reference>
+    POST /_fake/transactions/<reference>   body: {"status": "failed"}  (change outcome)
+"""
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakePaystackServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.0, outcome='success', fail_rate=0.0):
+        super().__init__(address, FakePaystackHandler)
+        self.latency = latency
+        self.outcome = outcome
+        self.fail_rate = fail_rate
+        self.transactions = {}
+        self.requests_served = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+
+class FakePaystackHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real gateway
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def _handle(self, method):
+        server = self.server
+        # Always consume the body so the keep-alive connection stays usable
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length) or b'{}') if length else {}
+
+        with server.lock:
+            server.requests_served += 1
+            count = server.requests_served
+        if server.latency:
+            time.sleep(server.latency)
+        # Deterministically fail roughly ``fail_rate`` of requests so runs are reproducible
+        if server.fail_rate and (count * server.fail_rate) % 1 < server.fail_rate:
+            return self._send(503, {'status': False, 'message': 'Service unavailable'})
+
+        if method == 'POST' and self.path == '/transaction/initialize':
+            return self._initialize(body)
+        if method == 'GET' and self.path.startswith('/transaction/verify/'):
+            return self._verify(self.path.rsplit('/', 1)[-1])
+        if method == 'POST' and self.path.startswith('/_fake/transactions/'):
+            return self._set_outcome(self.path.rsplit('/', 1)[-1], body)
+        self._send(404, {'status': False, 'message': 'Not found'})
+
+    def _initialize(self, body):
+        reference = body.get('reference') or uuid.uuid4().hex
+        if not body.get('email') or not body.get('amount'):
+            return self._send(400, {'status': False, 'message': 'email and amount are required'})
+        access_code = uuid.uuid4().hex[:15]
+        with self.server.lock:
+            self.server.transactions[reference] = {
+                'id': len(self.server.transactions) + 1,
+                'reference': reference,
+                'amount': body['amount'],
+                'currency': body.get('currency', 'GHS'),
+                'status': self.server.outcome,
+                'customer': {'email': body['email']},
+                'metadata': body.get('metadata'),
+            }
+        self._send(200, {
+            'status': True,
+            'message': 'Authorization URL created',
+            'data': {
+                'authorization_url': f'{self.server.base_url}/checkout/{access_code}',
+                'access_code': access_code,
+                'reference': reference,
+            },
+        })
+
+    def _verify(self, reference):
+        transaction = self.server.transactions.get(reference)
+        if transaction is None:
+            return self._send(400, {'status': False, 'message': 'Transaction reference not found'})
+        self._send(200, {'status': True, 'message': 'Verification successful', 'data': transaction})
+
+    def _set_outcome(self, reference, body):
+        transaction = self.server.transactions.get(reference)
+        if transaction is None:
+            return self._send(404, {'status': False, 'message': 'Transaction reference not found'})
+        transaction['status'] = body.get('status', 'success')
+        self._send(200, {'status': True, 'data': transaction})
+
+    def _send(self, code, payload):
+        content = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from shop.fake_paystack import FakePaystackServer
+
+
+class Command(BaseCommand):
+    help = 'Run a local fake Paystack API for development and load testing'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--latency', type=float, default=0.0, help='Seconds to delay every response')
+        parser.add_argument('--outcome', default='success', help='Status given to new transactions')
+        parser.add_argument('--fail-rate', type=float, default=0.0, help='Fraction of requests answered with 503')
+
+    def handle(self, *args, **options):
+        server = FakePaystackServer(
+            (options['host'], options['port']),
+            latency=options['latency'],
+            outcome=options['outcome'],
+            fail_rate=options['fail_rate'],
+        )
+        self.stdout.write(f'Fake Paystack listening on {server.base_url}')
+        self.stdout.write(f'Run Django with PAYSTACK_BASE_URL={server.base_url}')
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -75,4 +75,25 @@ class Order(models.Model):
         verbose_name_plural = 'Orders'
     
     def __str__(self):
-        return f"Order #{self.id} - {self.user.email}"
\ No newline at end of file
+        return f"Order #{self.id} - {self.user.email}"
+
+class PaymentEvent(models.Model):
+    """Raw Paystack webhook event, stored once per event id"""
+    event_id = models.CharField(max_length=255, unique=True)
+    event = models.CharField(max_length=100)
+    reference = models.CharField(max_length=255, blank=True, db_index=True)
+    payload = models.JSONField()
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(blank=True, null=True)
+    
+    class Meta:
+        db_table = 'payment_events'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['processed_at', 'id'], name='payment_events_pending'),
+        ]
+        verbose_name = 'Payment Event'
+        verbose_name_plural = 'Payment Events'
+    
+    def __str__(self):
+        return f"{self.event} - {self.reference}"
@@ -0,0 +1,34 @@
+"""
+Order status transitions driven by Paystack transaction results.
+
+Shared by ``PaymentVerifyView`` (client-driven) and the webhook batch task
+(gateway-driven) so both paths apply identical rules.
+"""
+from .paystack import amount_in_subunits
+
+# Paystack event -> (order statuses it may move from, status it moves to)
+EVENT_TRANSITIONS = {
+    'charge.success': ({'pending'}, 'processing'),
+    'refund.processed': ({'pending', 'processing', 'shipped'}, 'cancelled'),
+}
+
+
+def is_paid(order, transaction):
+    """A transaction pays an order only if it succeeded for the full amount"""
+    return (
+        transaction.get('status') == 'success'
+        and transaction.get('amount') == amount_in_subunits(order.total)
+    )
+
+
+def next_status(order, event, transaction):
+    """Return the status ``event`` moves ``order`` to, or None if it doesn't apply"""
+    transition = EVENT_TRANSITIONS.get(event)
+    if transition is None:
+        return None
+    from_statuses, to_status = transition
+    if order.status not in from_statuses:
+        return None
+    if event == 'charge.success' and not is_paid(order, transaction):
+        return None
+    return to_status
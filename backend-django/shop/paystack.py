@@ -0,0 +1,149 @@
+"""
+Paystack API client.
+
+A single pooled ``requests.Session`` is shared per process so gateway calls
+reuse TLS connections instead of handshaking on every request. Every call
+has strict connect/read timeouts; only idempotent calls (verification) are
+retried, with exponential backoff and full jitter. Verification results are
+cached by reference so repeated verify calls don't re-hit the gateway.
+
+``requests`` is imported when the first client is created: it (with
+urllib3 and certifi) is the slowest import of a worker's boot, and most
+workers never talk to Paystack.
+"""
+import random
+import threading
+import time
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+
+# Transaction statuses that never change once reached
+FINAL_STATUSES = {'success', 'failed', 'reversed'}
+
+VERIFY_CACHE_KEY = 'paystack:verify:{reference}'
+
+
+class PaystackError(Exception):
+    """Raised when Paystack can't be reached or rejects a request"""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def amount_in_subunits(amount):
+    """Paystack expects amounts in the currency's smallest unit (pesewas/kobo)"""
+    return int((Decimal(amount) * 100).quantize(Decimal('1')))
+
+
+class PaystackClient:
+    def __init__(self, secret_key, base_url, connect_timeout=3.05, read_timeout=10,
+                 max_retries=2, backoff=0.25, pool_size=10):
+        self.secret_key = secret_key
+        self.base_url = base_url.rstrip('/')
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self._errors = (requests.ConnectionError, requests.Timeout)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'Authorization': f'Bearer {secret_key}',
+            'Content-Type': 'application/json',
+        })
+
+    def initialize_transaction(self, email, amount, reference, currency=None, callback_url=None, metadata=None):
+        """Start a transaction; ``amount`` is in the currency's main unit"""
+        payload = {
+            'email': email,
+            'amount': amount_in_subunits(amount),
+            'reference': reference,
+            'currency': currency or settings.PAYSTACK_CURRENCY,
+        }
+        if callback_url:
+            payload['callback_url'] = callback_url
+        if metadata:
+            payload['metadata'] = metadata
+        return self._request('POST', '/transaction/initialize', json=payload)
+
+    def verify_transaction(self, reference, use_cache=True):
+        """Fetch a transaction's status, served from cache when already known"""
+        key = VERIFY_CACHE_KEY.format(reference=reference)
+        if use_cache:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        data = self._request('GET', f'/transaction/verify/{reference}', idempotent=True)
+        self.cache_verification(reference, data)
+        return data
+
+    @staticmethod
+    def cache_verification(reference, data):
+        # Final results are cached for a long time; pending ones only briefly,
+        # which still absorbs bursts of polling from the frontend
+        if data.get('status') in FINAL_STATUSES:
+            timeout = settings.PAYSTACK_VERIFY_CACHE_TTL
+        else:
+            timeout = settings.PAYSTACK_PENDING_CACHE_TTL
+        cache.set(VERIFY_CACHE_KEY.format(reference=reference), data, timeout)
+
+    def _request(self, method, path, idempotent=False, **kwargs):
+        url = f'{self.base_url}{path}'
+        attempts = self.max_retries + 1 if idempotent else 1
+
+        for attempt in range(attempts):
+            last_attempt = attempt == attempts - 1
+            try:
+                response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            except self._errors as e:
+                if last_attempt:
+                    raise PaystackError(f'Paystack unreachable: {e}')
+                self._sleep(attempt)
+                continue
+
+            if (response.status_code >= 500 or response.status_code == 429) and not last_attempt:
+                self._sleep(attempt)
+                continue
+
+            try:
+                body = response.json()
+            except ValueError:
+                raise PaystackError('Invalid response from Paystack', response.status_code)
+
+            if response.status_code >= 400 or not body.get('status'):
+                raise PaystackError(body.get('message', 'Paystack request failed'), response.status_code)
+            return body.get('data', {})
+
+    def _sleep(self, attempt):
+        # Full jitter keeps concurrent retries from hitting the gateway in lockstep
+        time.sleep(random.uniform(0, self.backoff * (2 ** attempt)))
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the process-wide client, creating it on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = PaystackClient(
+                    secret_key=settings.PAYSTACK_SECRET_KEY,
+                    base_url=settings.PAYSTACK_BASE_URL,
+                    connect_timeout=settings.PAYSTACK_CONNECT_TIMEOUT,
+                    read_timeout=settings.PAYSTACK_READ_TIMEOUT,
+                    max_retries=settings.PAYSTACK_MAX_RETRIES,
+                    pool_size=settings.PAYSTACK_POOL_SIZE,
+                )
+    return _client
@@ -1,20 +1,21 @@
 from rest_framework import serializers
+from portfolio_backend.fields import MediaURLField
+from portfolio_backend.fieldsets import SparseFieldsMixin
 from .models import Product, Cart, Order
 
-class ProductSerializer(serializers.ModelSerializer):
-    featured_image_url = serializers.SerializerMethodField()
+class ProductSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    featured_image_url = MediaURLField(source='featured_image')
     
     class Meta:
         model = Product
         fields = '__all__'
+
+class ProductListSerializer(ProductSerializer):
+    """Compact representation for product cards"""
     
-    def get_featured_image_url(self, obj):
-        if obj.featured_image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.featured_image.url)
-            return obj.featured_image.url
-        return None
+    class Meta(ProductSerializer.Meta):
+        fields = ['id', 'title', 'description', 'price', 'currency', 'featured_image_url', 'images',
+                  'category', 'stock', 'featured', 'created_at']
 
 class CartSerializer(serializers.ModelSerializer):
     items_count = serializers.SerializerMethodField()
@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from taskqueue.registry import task
+from .models import Order, PaymentEvent
+from .payments import next_status
+from .paystack import PaystackClient
+
+
+def event_order_id(event):
+    """Order id from the metadata sent when the transaction was initialized"""
+    metadata = (event.payload.get('data') or {}).get('metadata')
+    order_id = metadata.get('order_id') if isinstance(metadata, dict) else None
+    return order_id if isinstance(order_id, int) else None
+
+
+@task(max_attempts=5)
+def process_payment_events(batch_size=None):
+    """Apply pending webhook events to orders, one batch at a time"""
+    batch_size = batch_size or settings.PAYSTACK_WEBHOOK_BATCH_SIZE
+    while process_payment_event_batch(batch_size) == batch_size:
+        pass
+
+
+def process_payment_event_batch(batch_size):
+    """Process up to ``batch_size`` unprocessed events; returns how many were handled"""
+    with transaction.atomic():
+        pending = PaymentEvent.objects.filter(processed_at__isnull=True).order_by('id')
+        if connection.features.has_select_for_update_skip_locked:
+            # Lets several workers drain the backlog without double-processing
+            pending = pending.select_for_update(skip_locked=True)
+        events = list(pending[:batch_size])
+        if not events:
+            return 0
+
+        references = {event.reference for event in events if event.reference}
+        orders = {
+            order.payment_reference: order
+            for order in Order.objects.filter(payment_reference__in=references)
+        }
+        # Each payment attempt gets a new reference; an earlier attempt that still completes is matched by order id
+        orders_by_id = {order.id: order for order in orders.values()}
+        missing = {event_order_id(event) for event in events if event.reference not in orders} - {None}
+        orders_by_id.update(Order.objects.in_bulk(missing - orders_by_id.keys()))
+
+        now = timezone.now()
+        changed = {}
+        for event in events:
+            data = event.payload.get('data') or {}
+            if event.event == 'charge.success' and event.reference:
+                # Later verify calls for this reference are served from cache
+                PaystackClient.cache_verification(event.reference, data)
+
+            order = orders.get(event.reference) or orders_by_id.get(event_order_id(event))
+            if order is None:
+                continue
+            status = next_status(order, event.event, data)
+            if status:
+                order.status = status
+                order.updated_at = now
+                changed[order.id] = order
+
+        if changed:
+            Order.objects.bulk_update(changed.values(), ['status', 'updated_at'])
+        PaymentEvent.objects.filter(id__in=[event.id for event in events]).update(processed_at=now)
+        return len(events)
@@ -11,4 +11,5 @@ urlpatterns = [
     path('cart/', views.CartView.as_view(), name='cart'),
     path('payment/initialize/', views.PaymentInitializeView.as_view(), name='payment-initialize'),
     path('payment/verify/', views.PaymentVerifyView.as_view(), name='payment-verify'),
+    path('payment/webhook/', views.PaystackWebhookView.as_view(), name='payment-webhook'),
 ]
\ No newline at end of file
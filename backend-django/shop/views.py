@@ -1,18 +1,33 @@
+import hashlib
+import hmac
+import json
+import uuid
+from urllib.parse import urlsplit
+
 from rest_framework import viewsets, status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.conf import settings
 from django.shortcuts import get_object_or_404
 from .models import Product, Order, Cart
-from .serializers import ProductSerializer, OrderSerializer, CartSerializer
+from portfolio_backend.fastpath import FastListMixin
+from portfolio_backend.fieldsets import SparseFieldsViewSetMixin
+from .serializers import ProductSerializer, ProductListSerializer, OrderSerializer, CartSerializer
+from .models import PaymentEvent
+from .payments import is_paid
+from .paystack import PaystackError, get_client
+from .tasks import process_payment_events
 
 
-class ProductViewSet(viewsets.ReadOnlyModelViewSet):
+class ProductViewSet(FastListMixin, SparseFieldsViewSetMixin, viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for viewing products
     """
     queryset = Product.objects.all()
     serializer_class = ProductSerializer
+    list_serializer_class = ProductListSerializer
+    fast_list = True
     permission_classes = []  # Allow anyone to read products
     
     def get_queryset(self):
@@ -120,6 +135,12 @@ class OrderViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
+def allowed_callback_url(url):
+    """Paystack redirects the buyer to callback_url, so only our own frontends may be named"""
+    parts = urlsplit(url)
+    return parts.scheme in ('http', 'https') and f'{parts.scheme}://{parts.netloc}' in settings.PAYSTACK_CALLBACK_ORIGINS
+
+
 class PaymentInitializeView(APIView):
     """
     Initialize Paystack payment
@@ -127,10 +148,34 @@ class PaymentInitializeView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request):
-        # TODO: Implement Paystack payment initialization
+        order = get_object_or_404(Order, id=request.data.get('order_id'), user=request.user)
+        if order.status != 'pending':
+            return Response({'error': 'Order has already been paid'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        callback_url = request.data.get('callback_url') or None
+        if callback_url and not allowed_callback_url(callback_url):
+            return Response({'error': 'callback_url is not an allowed origin'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        # Paystack rejects a reused reference, so every attempt (e.g. after an abandoned one) gets a new one
+        reference = f"ORD-{order.id}-{uuid.uuid4().hex[:12]}"
+        try:
+            data = get_client().initialize_transaction(
+                email=request.user.email,
+                amount=order.total,
+                reference=reference,
+                callback_url=callback_url,
+                metadata={'order_id': order.id},
+            )
+        except PaystackError as e:
+            return Response({'error': 'Payment gateway error', 'details': str(e)}, status=status.HTTP_502_BAD_GATEWAY)
+        
+        order.payment_reference = reference
+        order.save(update_fields=['payment_reference', 'updated_at'])
+        
         return Response({
-            'message': 'Payment initialization not implemented yet',
-            'status': 'coming_soon'
+            'authorization_url': data.get('authorization_url'),
+            'access_code': data.get('access_code'),
+            'reference': reference
         })
 
 
@@ -141,8 +186,66 @@ class PaymentVerifyView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request):
-        # TODO: Implement Paystack payment verification
+        reference = request.data.get('reference')
+        if not reference:
+            return Response({'error': 'Payment reference is required'}, status=status.HTTP_400_BAD_REQUEST)
+        order = get_object_or_404(Order, payment_reference=reference, user=request.user)
+        
+        try:
+            data = get_client().verify_transaction(reference)
+        except PaystackError as e:
+            return Response({'error': 'Payment gateway error', 'details': str(e)}, status=status.HTTP_502_BAD_GATEWAY)
+        
+        paid = is_paid(order, data)
+        if paid and order.status == 'pending':
+            order.status = 'processing'
+            order.save(update_fields=['status', 'updated_at'])
+        
         return Response({
-            'message': 'Payment verification not implemented yet',
-            'status': 'coming_soon'
-        })
\ No newline at end of file
+            'status': data.get('status'),
+            'paid': paid,
+            'order': OrderSerializer(order).data
+        })
+
+
+class PaystackWebhookView(APIView):
+    """
+    Receive Paystack webhook events.
+    
+    Events are verified, stored and acknowledged immediately; order updates
+    are applied in batches by the background worker.
+    """
+    authentication_classes = []
+    permission_classes = []
+    
+    def post(self, request):
+        body = request.body
+        expected = hmac.new(settings.PAYSTACK_SECRET_KEY.encode(), body, hashlib.sha512).hexdigest()
+        signature = request.META.get('HTTP_X_PAYSTACK_SIGNATURE', '')
+        if not settings.PAYSTACK_SECRET_KEY or not hmac.compare_digest(expected, signature):
+            return Response({'error': 'Invalid signature'}, status=status.HTTP_401_UNAUTHORIZED)
+        
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return Response({'error': 'Invalid payload'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        event = payload.get('event', '')
+        data = payload.get('data') or {}
+        # Paystack has no event id; the transaction id plus event type is unique per delivery
+        if data.get('id') is not None:
+            event_id = f"{event}:{data['id']}"
+        else:
+            event_id = hashlib.sha256(body).hexdigest()
+        
+        # ignore_conflicts turns redelivered events into a no-op instead of an IntegrityError
+        PaymentEvent.objects.bulk_create([PaymentEvent(
+            event_id=event_id,
+            event=event,
+            # Refund events name the refunded charge in transaction_reference
+            reference=data.get('reference') or data.get('transaction_reference') or '',
+            payload=payload,
+        )], ignore_conflicts=True)
+        process_payment_events.enqueue(countdown=settings.PAYSTACK_WEBHOOK_BATCH_DELAY, unique=True)
+        
+        return Response({'status': 'received'})
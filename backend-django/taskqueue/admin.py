@@ -0,0 +1,17 @@
+from django.contrib import admin
+from django.utils import timezone
+from .models import Task
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ['name', 'status', 'attempts', 'max_attempts', 'run_at', 'duration_ms', 'created_at']
+    list_filter = ['status', 'name', 'created_at']
+    search_fields = ['name', 'last_error']
+    readonly_fields = ['locked_until', 'locked_by', 'started_at', 'finished_at', 'duration_ms', 'created_at']
+    ordering = ['-created_at']
+    actions = ['requeue']
+
+    def requeue(self, request, queryset):
+        updated = queryset.update(status=Task.STATUS_QUEUED, attempts=0, run_at=timezone.now(), locked_until=None)
+        self.message_user(request, f"{updated} task(s) requeued.")
+    requeue.short_description = 'Requeue selected tasks'
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class TaskQueueConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'taskqueue'
+    verbose_name = 'Background Tasks'
+
+    def ready(self):
+        # Import every app's tasks.py so the worker knows all registered tasks
+        autodiscover_modules('tasks')
@@ -0,0 +1,97 @@
+import multiprocessing
+import signal
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from taskqueue.models import Task
+from taskqueue.worker import claim_tasks, default_worker_id, run_task
+
+
+def _init_process():
+    # Forked children must not reuse the parent's database connections. Closing them here would
+    # end the parent's session on the shared socket, so only drop the inherited handles.
+    django.setup()
+    for conn in connections.all(initialized_only=True):
+        conn.connection = None
+
+
+class Command(BaseCommand):
+    help = 'Run background task worker'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=4, help='Number of tasks to run in parallel')
+        parser.add_argument('--pool', choices=['thread', 'process'], default='thread', help='Executor type')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to sleep when the queue is empty')
+        parser.add_argument('--once', action='store_true', help='Drain currently due tasks and exit')
+        parser.add_argument('--stats', action='store_true', help='Print per-task timing stats and exit')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            return self.print_stats()
+
+        concurrency = max(1, options['concurrency'])
+        worker_id = default_worker_id()
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        if options['pool'] == 'process':
+            connections.close_all()
+            executor = ProcessPoolExecutor(
+                max_workers=concurrency,
+                mp_context=multiprocessing.get_context('fork'),
+                initializer=_init_process,
+            )
+        else:
+            executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='task-worker')
+
+        self.stdout.write(f"Worker {worker_id} started ({options['pool']} pool, concurrency {concurrency})")
+        running = set()
+        processed = 0
+        with executor:
+            while not self.stopping:
+                free = concurrency - len(running)
+                claimed = claim_tasks(worker_id, free) if free else []
+                for task_id in claimed:
+                    running.add(executor.submit(run_task, task_id, worker_id))
+
+                if not running:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                done, running = wait(running, timeout=options['poll_interval'], return_when=FIRST_COMPLETED)
+                for future in done:
+                    processed += 1
+                    try:
+                        future.result()
+                    except Exception as e:
+                        self.stderr.write(f"Task crashed outside handler: {e}")
+
+            # Finish in-flight tasks before exiting so they are not left locked
+            for future in running:
+                future.result()
+                processed += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Worker {worker_id} stopped after {processed} task(s)"))
+
+    def stop(self, signum, frame):
+        self.stdout.write('Shutting down after in-flight tasks complete...')
+        self.stopping = True
+
+    def print_stats(self):
+        rows = list(Task.objects.stats())
+        if not rows:
+            self.stdout.write('No tasks recorded yet.')
+            return
+        self.stdout.write(f"{'task':<50} {'total':>7} {'queued':>7} {'ok':>7} {'failed':>7} {'avg ms':>9} {'max ms':>9}")
+        for row in rows:
+            self.stdout.write(
+                f"{row['name']:<50} {row['total']:>7} {row['queued']:>7} {row['succeeded']:>7} {row['failed']:>7} "
+                f"{row['avg_duration_ms'] or 0:>9.1f} {row['max_duration_ms'] or 0:>9.1f}"
+            )
@@ -0,0 +1,69 @@
+from django.db import models
+from django.db.models import Avg, Count, Max, Q
+from django.utils import timezone
+
+
+class TaskQuerySet(models.QuerySet):
+    def due(self, now=None):
+        """Tasks that are ready to run, including ones whose visibility timeout expired"""
+        now = now or timezone.now()
+        return self.filter(
+            Q(status=Task.STATUS_QUEUED, run_at__lte=now) |
+            Q(status=Task.STATUS_RUNNING, locked_until__lt=now)
+        )
+
+    def stats(self):
+        """Per-task counts and timing aggregated over finished runs"""
+        return self.values('name').annotate(
+            total=Count('id'),
+            queued=Count('id', filter=Q(status=Task.STATUS_QUEUED)),
+            succeeded=Count('id', filter=Q(status=Task.STATUS_SUCCEEDED)),
+            failed=Count('id', filter=Q(status=Task.STATUS_FAILED)),
+            avg_duration_ms=Avg('duration_ms'),
+            max_duration_ms=Max('duration_ms'),
+        ).order_by('name')
+
+
+class Task(models.Model):
+    """Background task queued in the database"""
+
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_SUCCEEDED = 'succeeded'
+    STATUS_FAILED = 'failed'
+
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, 'Queued'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_SUCCEEDED, 'Succeeded'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    name = models.CharField(max_length=200, db_index=True)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(blank=True, null=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    last_error = models.TextField(blank=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    duration_ms = models.FloatField(blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        db_table = 'task_queue'
+        ordering = ['run_at']
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='task_queue_status_run_at'),
+        ]
+        verbose_name = 'Task'
+        verbose_name_plural = 'Tasks'
+
+    def __str__(self):
+        return f"{self.name} #{self.id} ({self.status})"
@@ -0,0 +1,102 @@
+"""
+Task registration and enqueueing.
+
+Decorate a function with ``@task`` to make it runnable by ``run_worker``::
+
+    @task(max_attempts=5)
+    def send_welcome_email(user_id):
+        ...
+
+    send_welcome_email.delay(user.id)
+    send_welcome_email.enqueue(args=[user.id], countdown=60)
+    rebuild_search_index.enqueue(countdown=5, unique=True)
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+_registry = {}
+
+
+class TaskFunction:
+    """Wrapper returned by ``@task``; calling it still runs the function inline"""
+
+    def __init__(self, func, name, max_attempts, visibility_timeout, retry_backoff):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.visibility_timeout = visibility_timeout
+        self.retry_backoff = retry_backoff
+        self.__doc__ = func.__doc__
+        self.__wrapped__ = func
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<task {self.name}>"
+
+    def delay(self, *args, **kwargs):
+        return self.enqueue(args=args, kwargs=kwargs)
+
+    def enqueue(self, args=(), kwargs=None, countdown=None, eta=None, unique=False):
+        """
+        Queue the task; ``countdown`` (seconds) or ``eta`` delay its first run.
+        With ``unique`` nothing is queued while another run of this task is
+        still waiting, which lets bursts of triggers collapse into one batch.
+        """
+        from .models import Task
+
+        if unique and Task.objects.filter(name=self.name, status=Task.STATUS_QUEUED).exists():
+            return None
+
+        run_at = eta or timezone.now()
+        if countdown:
+            run_at += timedelta(seconds=countdown)
+
+        queued = Task.objects.create(
+            name=self.name,
+            args=list(args),
+            kwargs=kwargs or {},
+            max_attempts=self.max_attempts,
+            run_at=run_at,
+        )
+
+        if getattr(settings, 'TASKS_EAGER', False):
+            from .worker import run_eager
+            transaction.on_commit(lambda: run_eager(queued))
+
+        return queued
+
+
+def task(func=None, *, name=None, max_attempts=3, visibility_timeout=None, retry_backoff=None):
+    """Register ``func`` as a background task"""
+
+    def decorator(fn):
+        task_name = name or f"{fn.__module__}.{fn.__qualname__}"
+        wrapped = TaskFunction(
+            fn,
+            name=task_name,
+            max_attempts=max_attempts,
+            visibility_timeout=(
+                getattr(settings, 'TASKS_VISIBILITY_TIMEOUT', 300) if visibility_timeout is None else visibility_timeout
+            ),
+            # 0 is a valid backoff (retry immediately)
+            retry_backoff=getattr(settings, 'TASKS_RETRY_BACKOFF', 10) if retry_backoff is None else retry_backoff,
+        )
+        _registry[task_name] = wrapped
+        return wrapped
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def get_task(name):
+    return _registry.get(name)
+
+
+def registered_tasks():
+    return dict(_registry)
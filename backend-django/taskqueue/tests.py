@@ -0,0 +1,79 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import Task
+from .registry import task
+from .worker import claim_tasks, run_task
+
+calls = []
+
+
+@task(name='taskqueue.tests.record', retry_backoff=10)
+def record(value):
+    calls.append(value)
+
+
+@task(name='taskqueue.tests.fail', max_attempts=3, retry_backoff=10)
+def fail():
+    raise RuntimeError('boom')
+
+
+@override_settings(TASKS_EAGER=True)
+class EagerTaskTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_eager_run_claims_the_task(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            queued = record.delay('a')
+        queued.refresh_from_db()
+        self.assertEqual(calls, ['a'])
+        self.assertEqual(queued.status, Task.STATUS_SUCCEEDED)
+        self.assertEqual(queued.attempts, 1)
+        self.assertTrue(queued.locked_by.startswith('eager:'))
+
+    def test_eager_run_ignores_the_countdown(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            record.enqueue(args=['b'], countdown=60)
+        self.assertEqual(calls, ['b'])
+
+    def test_failed_eager_run_backs_off_from_the_first_attempt(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            queued = fail.delay()
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Task.STATUS_QUEUED)
+        self.assertEqual(queued.attempts, 1)
+        delay = (queued.run_at - timezone.now()).total_seconds()
+        self.assertTrue(8 < delay <= 10, delay)
+
+    def test_task_claimed_by_a_worker_is_not_run_again(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            queued = record.delay('c')
+        self.assertEqual(claim_tasks('worker-1', 10), [queued.id])
+        for callback in callbacks:
+            callback()
+        self.assertEqual(calls, [])
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.locked_by, queued.attempts), (Task.STATUS_RUNNING, 'worker-1', 1))
+
+
+class RunTaskTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_result_of_a_reclaimed_task_is_dropped(self):
+        queued = Task.objects.create(name=record.name, args=['d'])
+        self.assertEqual(claim_tasks('worker-1', 1), [queued.id])
+        # worker-1 stalls past its visibility timeout and worker-2 takes over
+        Task.objects.filter(id=queued.id).update(locked_until=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(claim_tasks('worker-2', 1), [queued.id])
+        Task.objects.filter(id=queued.id).update(locked_until=timezone.now() + timedelta(minutes=5))
+
+        self.assertIsNone(run_task(queued.id, 'worker-1'))
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.locked_by, queued.attempts), (Task.STATUS_RUNNING, 'worker-2', 2))
+
+        self.assertEqual(run_task(queued.id, 'worker-2'), Task.STATUS_SUCCEEDED)
+        self.assertEqual(calls, ['d', 'd'])
@@ -0,0 +1,117 @@
+"""
+Claiming and executing queued tasks.
+
+Tasks are claimed with a conditional UPDATE, so any number of worker
+processes can poll the same table without a broker or row locks. A claim
+sets ``locked_until``; if the worker dies, the task becomes visible again
+once that visibility timeout passes and another worker picks it up.
+"""
+import logging
+import os
+import socket
+import time
+import traceback
+from datetime import timedelta
+
+from django.db import close_old_connections
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Task
+from .registry import get_task
+
+logger = logging.getLogger(__name__)
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _claim(claimable, task_id, name, worker_id, now):
+    """Take ``task_id`` for ``worker_id`` if it is still in ``claimable``; True when this call won it"""
+    registered = get_task(name)
+    timeout = registered.visibility_timeout if registered else 300
+    updated = claimable.filter(id=task_id).update(
+        status=Task.STATUS_RUNNING,
+        attempts=F('attempts') + 1,
+        locked_by=worker_id,
+        locked_until=now + timedelta(seconds=timeout),
+        started_at=now,
+    )
+    return bool(updated)
+
+
+def claim_tasks(worker_id, limit):
+    """Claim up to ``limit`` due tasks for ``worker_id`` and return their ids"""
+    now = timezone.now()
+    candidates = Task.objects.due(now).values_list('id', 'name')[:limit * 2]
+
+    claimed = []
+    for task_id, name in candidates:
+        if len(claimed) >= limit:
+            break
+        if _claim(Task.objects.due(now), task_id, name, worker_id, now):
+            claimed.append(task_id)
+    return claimed
+
+
+def run_eager(queued):
+    """
+    Claim and run a just-queued task inline (``TASKS_EAGER``), ignoring any
+    countdown. Returns the final status, or None if a worker claimed it first.
+    """
+    worker_id = f"eager:{default_worker_id()}"
+    if not _claim(Task.objects.filter(status=Task.STATUS_QUEUED), queued.id, queued.name, worker_id, timezone.now()):
+        return None
+    return run_task(queued.id, worker_id)
+
+
+def run_task(task_id, worker_id):
+    """Execute a task claimed by ``worker_id``; returns the final status, or None if the claim was lost"""
+    close_old_connections()
+    try:
+        queued = Task.objects.get(id=task_id)
+        registered = get_task(queued.name)
+
+        if registered is None:
+            return _finish(queued, worker_id, Task.STATUS_FAILED, error=f"Unknown task '{queued.name}'")
+        if queued.attempts > queued.max_attempts:
+            return _finish(queued, worker_id, Task.STATUS_FAILED, error='Visibility timeout exceeded on final attempt')
+
+        started = time.perf_counter()
+        try:
+            registered.func(*queued.args, **queued.kwargs)
+        except Exception:
+            duration_ms = (time.perf_counter() - started) * 1000
+            error = traceback.format_exc()
+            logger.warning("Task %s #%s failed (attempt %s/%s)",
+                           queued.name, queued.id, queued.attempts, queued.max_attempts)
+            if queued.attempts < queued.max_attempts:
+                delay = registered.retry_backoff * (2 ** (queued.attempts - 1))
+                return _finish(queued, worker_id, Task.STATUS_QUEUED, error=error, duration_ms=duration_ms,
+                               run_at=timezone.now() + timedelta(seconds=delay))
+            return _finish(queued, worker_id, Task.STATUS_FAILED, error=error, duration_ms=duration_ms)
+
+        duration_ms = (time.perf_counter() - started) * 1000
+        return _finish(queued, worker_id, Task.STATUS_SUCCEEDED, duration_ms=duration_ms)
+    finally:
+        close_old_connections()
+
+
+def _finish(queued, worker_id, status, error='', duration_ms=None, run_at=None):
+    fields = {
+        'status': status,
+        'locked_until': None,
+        'last_error': error,
+        'duration_ms': duration_ms,
+    }
+    if status == Task.STATUS_QUEUED:
+        fields['run_at'] = run_at
+    else:
+        fields['finished_at'] = timezone.now()
+    # Only while the claim is still ours: after a visibility timeout another worker may own the row
+    if not Task.objects.filter(id=queued.id, locked_by=worker_id).update(**fields):
+        logger.warning("Task %s #%s was reclaimed by another worker; dropping the %s result of %s",
+                       queued.name, queued.id, status, worker_id)
+        return None
+    return status
@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from "react";
 import useThoughts from "../hooks/useThoughts";
+import { portfolioAPI } from "../utils/djangoApi";
 import SkeletonLoader from "../components/SkeletonLoader";
 import OptimizedImage from "../components/OptimizedImage";
 import MetaTags from "../components/MetaTags";
@@ -26,6 +27,18 @@ const ThoughtsPage = ({ setCurrentPage }) => {
       window.scrollTo(0, 0);
   }, []);
 
+  // List cards carry the snippet only; the full post comes from the detail endpoint
+  const openPost = (post) => {
+    setSelectedPost(post);
+    portfolioAPI.getThought(post.id)
+      .then((response) => {
+        setSelectedPost((current) => (current?.id === post.id ? { ...current, ...response.data } : current));
+      })
+      .catch((err) => {
+        console.error('Error fetching thought from Django API:', err);
+      });
+  };
+
   const handleNextPage = () => {
     if (pagination?.hasNext) {
       setPage((prev) => prev + 1);
@@ -114,7 +127,7 @@ const ThoughtsPage = ({ setCurrentPage }) => {
                   <div
                     key={post.id}
                     className="bg-gray-50 border border-gray-200 rounded-xl shadow-sm thought-card cursor-pointer"
-                    onClick={() => setSelectedPost(post)}
+                    onClick={() => openPost(post)}
                   >
                     {(post.featured_image_url || post.featured_image || post.images || post.image) && (
                       <div className="w-full h-48">
@@ -199,7 +212,7 @@ const ThoughtsPage = ({ setCurrentPage }) => {
                   <div
                     key={post.id}
                     className="border-b border-gray-200 pb-4 last:border-0 cursor-pointer hover:bg-gray-50 p-2 rounded transition-colors duration-200"
-                    onClick={() => setSelectedPost(post)}
+                    onClick={() => openPost(post)}
                   >
                     <h4 className="text-lg font-medium">{post.title}</h4>
                     <p className="text-sm text-gray-500">
@@ -235,7 +248,7 @@ const ThoughtsPage = ({ setCurrentPage }) => {
                 })}
               </p>
               <div className="text-gray-700 leading-relaxed whitespace-pre-wrap">
-                {selectedPost.content || selectedPost.body || selectedPost.text}
+                {selectedPost.content || selectedPost.body || selectedPost.text || selectedPost.snippet}
               </div>
               {(selectedPost.tags || selectedPost.categories) && 
                (Array.isArray(selectedPost.tags) ? selectedPost.tags : selectedPost.categories)?.length > 0 && (